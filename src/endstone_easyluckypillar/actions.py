@@ -0,0 +1,173 @@
+"""
+幸运之柱的玩家动作执行层
+"""
+import time
+from typing import List, Optional
+
+from endstone import Player
+from endstone.level import Location
+
+
+def _has_native_health() -> bool:
+    """检查当前 Endstone 版本是否支持直接设置生命值"""
+    prop = getattr(Player, "health", None)
+    return getattr(prop, "fset", None) is not None
+
+
+def _has_native_clear() -> bool:
+    """检查当前 Endstone 版本是否支持直接清空背包"""
+    try:
+        from endstone.inventory import PlayerInventory
+    except ImportError:
+        return False
+    return hasattr(PlayerInventory, "clear")
+
+
+class PlayerActions:
+    """玩家动作执行层
+
+    清空背包、播放音效优先调用 Endstone 原生接口，
+    当前服务端版本不支持或关闭了原生接口时回退为命令，并尽量合并为一条目标选择器命令。
+    扣血默认使用 /damage 命令走游戏的伤害流程（不死图腾、受伤反馈、死亡原因都依赖它），
+    直接写生命值需要在配置中显式开启。
+    效果、移动权限、召唤等没有原生接口的操作始终使用命令。
+    """
+
+    ARMOR_SLOTS = ("helmet", "chestplate", "leggings", "boots", "item_in_off_hand")
+
+    def __init__(self, server, command_batch, prefer_native: bool = True):
+        self.server = server
+        self.command_batch = command_batch
+        self.native_clear = prefer_native and _has_native_clear()
+        self.native_health = False  # 直接写生命值会绕过伤害流程，只在配置开启时使用
+        self.native_sound = prefer_native and hasattr(Player, "play_sound")
+
+    def configure(self, config: dict):
+        """
+        从配置加载动作参数
+
+        Args:
+            config: {"native_damage": 是否直接写生命值扣血（绕过不死图腾与伤害事件）}
+        """
+        self.native_health = bool(config.get("native_damage", False)) and _has_native_health()
+
+    def clear_inventory(self, players: list, tag: Optional[str] = None):
+        """
+        清空玩家背包（含盔甲与副手，与 /clear 一致）
+
+        Args:
+            players: 在线玩家列表
+            tag: 这些玩家共有的场次标签，回退为命令时用于合并
+        """
+        if self.native_clear:
+            for p in players:
+                if not (self.native_clear and self._clear_native(p)):
+                    self.command_batch.queue(f"clear \"{p.name}\"")
+        elif tag is not None:
+            self.command_batch.for_tag(tag, "clear {target}")
+        else:
+            for p in players:
+                self.command_batch.queue(f"clear \"{p.name}\"")
+
+    def _clear_native(self, player) -> bool:
+        """
+        通过背包接口清空，接口不接受清空盔甲或副手槽位时之后改用命令
+
+        Returns:
+            是否清空成功
+        """
+        try:
+            inventory = player.inventory
+            inventory.clear()
+            for slot in self.ARMOR_SLOTS:
+                setattr(inventory, slot, None)
+        except Exception:
+            self.native_clear = False
+            return False
+        return True
+
+    def damage(self, players: list, amount: int, tag: Optional[str] = None):
+        """
+        对玩家造成魔法伤害（无视盔甲）
+
+        Args:
+            players: 在线玩家列表
+            amount: 伤害值
+            tag: 这些玩家共有的场次标签，回退为命令时用于合并
+        """
+        if self.native_health:
+            for p in players:
+                self._damage_native(p, amount)
+        elif tag is not None:
+            self.command_batch.for_tag(tag, f"damage {{target}} {amount} magic")
+        else:
+            for p in players:
+                self.command_batch.queue(f"damage \"{p.name}\" {amount} magic")
+
+    @staticmethod
+    def _damage_native(player, amount: int):
+        player.health = max(0, player.health - amount)
+
+    def play_sound(self, players: list, sound: str, x: float, y: float, z: float,
+                   volume: float = 1.0, pitch: float = 1.0, tag: Optional[str] = None):
+        """
+        在指定坐标向玩家播放音效
+
+        Args:
+            players: 在线玩家列表
+            sound: 音效名
+            x, y, z: 播放位置
+            volume: 音量
+            pitch: 音调
+            tag: 这些玩家共有的场次标签，回退为命令时用于合并
+        """
+        if self.native_sound:
+            for p in players:
+                p.play_sound(Location(p.dimension, x, y, z), sound, volume=volume, pitch=pitch)
+        elif tag is not None:
+            self.command_batch.for_tag(tag, f"playsound {sound} {{target}} {x} {y} {z} {volume} {pitch}")
+        else:
+            for p in players:
+                self.command_batch.queue(f"playsound {sound} \"{p.name}\" {x} {y} {z} {volume} {pitch}")
+
+    def benchmark(self, player, iterations: int = 100) -> List[tuple]:
+        """
+        测量原生接口与命令两种方式的单次调用耗时
+
+        只测量不改变玩家状态的动作：音量为 0 的音效、伤害为 0 的扣血。
+        清空背包会销毁玩家物品，因此不参与测量。
+
+        Returns:
+            [(动作名, 原生接口平均耗时μs 或 None, 命令平均耗时μs), ...]
+        """
+        x, y, z = player.location.x, player.location.y, player.location.z
+        location = Location(player.dimension, x, y, z)
+        sender = self.server.command_sender
+        dispatch = self.server.dispatch_command
+        cases = [
+            (
+                "sound",
+                (lambda: player.play_sound(location, "random.orb", volume=0.0, pitch=1.0)) if hasattr(Player, "play_sound") else None,
+                f"playsound random.orb \"{player.name}\" {x} {y} {z} 0",
+            ),
+            (
+                "damage",
+                (lambda: self._damage_native(player, 0)) if _has_native_health() else None,
+                f"damage \"{player.name}\" 0 magic",
+            ),
+        ]
+
+        results = []
+        for name, native, command in cases:
+            native_us = None
+            if native is not None:
+                start = time.perf_counter_ns()
+                for _ in range(iterations):
+                    native()
+                native_us = (time.perf_counter_ns() - start) / iterations / 1000
+            start = time.perf_counter_ns()
+            for _ in range(iterations):
+                dispatch(sender, command)
+            command_us = (time.perf_counter_ns() - start) / iterations / 1000
+            results.append((name, native_us, command_us))
+        return results
@@ -0,0 +1,60 @@
+"""
+幸运之柱的 Boss 栏差量视图模块
+"""
+from typing import Dict
+
+
+class BossBarView:
+    """Boss 栏差量视图
+
+    记录 Boss 栏当前的观看者与最近一次写入的标题、颜色、进度，
+    只对进入或离开可见范围的玩家、以及确实发生变化的属性调用服务器接口。
+    """
+
+    def __init__(self, bar):
+        self.bar = bar
+        self.viewers: Dict[object, object] = {}  # 玩家UUID -> Player
+        self._title = None
+        self._color = None
+        self._progress = None
+
+    def set(self, title: str, color, progress: float):
+        """设置 Boss 栏属性，未变化的属性不会写入"""
+        if title != self._title:
+            self.bar.title = title
+            self._title = title
+        if color != self._color:
+            self.bar.color = color
+            self._color = color
+        if progress != self._progress:
+            self.bar.progress = progress
+            self._progress = progress
+
+    def sync_viewers(self, wanted: Dict[object, object]):
+        """
+        同步观看者
+
+        Args:
+            wanted: 应当看到 Boss 栏的玩家 (玩家UUID -> Player)
+        """
+        viewers = self.viewers
+        for uuid in [uuid for uuid in viewers if uuid not in wanted]:
+            self.bar.remove_player(viewers.pop(uuid))
+        for uuid, player in wanted.items():
+            if uuid not in viewers:
+                self.bar.add_player(player)
+                viewers[uuid] = player
+
+    def remove_viewer(self, player):
+        """将玩家移出观看者"""
+        if self.viewers.pop(player.unique_id, None) is not None:
+            self.bar.remove_player(player)
+
+    def forget(self, player):
+        """玩家已下线，只清除记录而不调用服务器接口"""
+        self.viewers.pop(player.unique_id, None)
+
+    def remove_all(self):
+        """移除全部观看者"""
+        self.bar.remove_all()
+        self.viewers = {}
@@ -1,17 +1,22 @@
 
 """
 Easy系列插件的 BStats 遥测模块
+
+requests 与 psutil 只在遥测线程中导入，导入本模块和创建 BStats 都不会访问磁盘或网络。
+数据经 gzip 压缩后先写入磁盘上的离线队列再发送，网络故障时按带抖动的指数退避重试，
+服务器重启后也会继续补发。
 """
+import gzip
 import json
+import os
 import platform
+import random
 import uuid
 import threading
 import time
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable
-import psutil
-import requests
+from typing import Dict, Any, List, Optional, Callable
 
 # 创建bStats专用的logger
 bstats_logger = logging.getLogger(f"EasyLuckyPillarBStats")
@@ -112,37 +117,92 @@ class DrilldownPie:
         }
 
 
+class TelemetrySpool:
+    """遥测数据的磁盘离线队列
+
+    每条数据是一个压缩后的文件，文件名为写入时间，按时间先后发送；
+    超过 max_items 条时丢弃最旧的数据。
+    """
+
+    def __init__(self, directory: Path, max_items: int = 48):
+        self.directory = directory
+        self.max_items = max_items
+        self._items: List[Path] = []
+
+    def load(self):
+        """读取上次运行遗留的数据"""
+        if self.directory.exists():
+            self._items = sorted(self.directory.glob("*.json.gz"))
+            self._trim()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def push(self, body: bytes):
+        """写入一条数据，先写临时文件再替换，写到一半中断不会留下损坏的数据"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{time.time_ns()}.json.gz"
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, path)
+        self._items.append(path)
+        self._trim()
+
+    def peek(self) -> Optional[bytes]:
+        """读取最旧的一条数据，无法读取的文件会被跳过并删除"""
+        while self._items:
+            try:
+                return self._items[0].read_bytes()
+            except OSError:
+                self._items.pop(0)
+        return None
+
+    def pop(self):
+        """删除最旧的一条数据"""
+        if self._items:
+            path = self._items.pop(0)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _trim(self):
+        while len(self._items) > self.max_items:
+            self.pop()
+
+
 class BStats:
     """bStats 遥测主类"""
 
-    def __init__(self, plugin, service_id: int):
+    SENT, DROP, RETRY = "sent", "drop", "retry"  # 单次发送的结果
+    BACKOFF_BASE = 30  # 首次重试的基础等待时间（秒）
+
+    def __init__(self, plugin, service_id: int, base_url: Optional[str] = None,
+                 initial_delay: float = 30, interval: float = 30 * 60, timeout: float = 10):
         """
         初始化 bStats
 
         Args:
             plugin: 插件实例
             service_id: bStats 服务ID
+            base_url: 数据提交地址，默认为 bStats 官方地址，可指向本地测试服务器
+            initial_delay: 启动后首次提交前的等待时间（秒）
+            interval: 两次采集数据的间隔（秒）
+            timeout: 单次请求超时时间（秒）
         """
         self.plugin = plugin
         self.service_id = service_id
         self.plugin_name = getattr(plugin, 'name', 'Unknown')
         self.plugin_version = getattr(plugin, 'version', 'Unknown')
 
-        # 初始化配置
-        try:
-            data_folder = getattr(plugin, 'data_folder', None)
-            if data_folder is None:
-                # 如果没有data_folder属性,使用默认路径
-                data_folder = Path("./plugins") / self.plugin_name
-
-            bstats_folder = Path(data_folder) / "bstats"
-            # bstats_logger.info(f"配置文件路径: {bstats_folder / 'config.json'}")
-            self.config = BStatsConfig(bstats_folder / "config.json")
-        except Exception as e:
-            bstats_logger.error(f"初始化配置失败: {e}")
-            import traceback
-            bstats_logger.error(f"异常堆栈: {traceback.format_exc()}")
-            raise
+        # 配置文件路径，配置在遥测线程中加载
+        data_folder = getattr(plugin, 'data_folder', None)
+        if data_folder is None:
+            # 如果没有data_folder属性,使用默认路径
+            data_folder = Path("./plugins") / self.plugin_name
+        self.config_file = Path(data_folder) / "bstats" / "config.json"
+        self.config: Optional[BStatsConfig] = None
 
         # 自定义图表
         self.custom_charts = []
@@ -153,19 +213,41 @@ class BStats:
         self.cached_os_version = "Unknown"
         self.cached_core_count = 0
 
-        # 探测系统信息
-        self._probe_system_info()
-
         # 提交线程
         self._submit_thread = None
         self._running = False
+        self._stop = threading.Event()  # 关闭时立即唤醒提交线程，每次启动使用新的事件
+        self.initial_delay = initial_delay
+        self.interval = interval
+        self.timeout = timeout
+
+        # 离线队列与重试
+        self.spool = TelemetrySpool(self.config_file.parent / "spool")
+        self._session = None  # requests.Session，在提交线程中创建并复用连接
+        self._failures = 0  # 连续失败次数
 
         # bStats API
         self.platform = "bukkit"
-        self.base_url = f"https://bstats.org/api/v2/data/{self.platform}"
+        self.base_url = base_url or f"https://bstats.org/api/v2/data/{self.platform}"
 
         # bstats_logger.info(f"bStats 初始化完成")
 
+    def _initialize(self) -> bool:
+        """在遥测线程中加载配置并探测系统信息，返回是否成功"""
+        try:
+            self.config = BStatsConfig(self.config_file)
+        except Exception as e:
+            bstats_logger.error(f"初始化配置失败: {e}")
+            import traceback
+            bstats_logger.error(f"异常堆栈: {traceback.format_exc()}")
+            return False
+        self._probe_system_info()
+        try:
+            self.spool.load()
+        except OSError as e:
+            bstats_logger.warning(f"读取离线数据失败: {e}")
+        return True
+
     def _probe_system_info(self):
         """探测系统信息"""
         try:
@@ -182,6 +264,7 @@ class BStats:
             self.cached_os_arch = platform.machine().lower()
 
             # CPU 核心数
+            import psutil
             self.cached_core_count = psutil.cpu_count(logical=False) or 0
 
         except Exception as e:
@@ -243,64 +326,122 @@ class BStats:
             }
         }
 
-    def _submit_data(self):
-        """提交数据到 bStats 服务器"""
+    def _enqueue_data(self):
+        """采集一次数据，压缩后写入离线队列"""
         if not self.config.enabled:
             bstats_logger.info("遥测模块已禁用，跳过上报。")
             return
 
+        payload = self._collect_data()
+        if self.config.log_sent_data_enabled:
+            bstats_logger.info(f"准备上报数据包内容:")
+            bstats_logger.info(json.dumps(payload, indent=2))
         try:
-            payload = self._collect_data()
-
-            if self.config.log_sent_data_enabled:
-                bstats_logger.info(f"准备上报数据包内容:")
-                bstats_logger.info(json.dumps(payload, indent=2))
-
-            bstats_logger.info(f"正在提交遥测数据到 bStats 服务器...")
-            response = requests.post(
-                self.base_url,
-                json=payload,
-                headers={'Content-Type': 'application/json'},
-                timeout=10
-            )
-
-            if response.status_code == 200:
-                bstats_logger.info("遥测数据上报成功！")
-                if self.config.log_sent_data_enabled:
-                    bstats_logger.info(f"响应内容: {response.text if response.text else '(空)'}")
-            else:
-                bstats_logger.warning(f"上报失败，状态码: {response.status_code}")
-                if self.config.log_sent_data_enabled:
-                    bstats_logger.warning(f"返回结果: {response.text if response.text else '(空)'}")
+            self.spool.push(gzip.compress(json.dumps(payload).encode("utf-8")))
+        except OSError as e:
+            bstats_logger.error(f"写入离线数据失败: {e}")
+
+    def _get_session(self):
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers.update({
+                'Content-Type': 'application/json',
+                'Content-Encoding': 'gzip',
+                'Accept': 'application/json',
+            })
+        return self._session
+
+    def _post(self, body: bytes) -> str:
+        """
+        发送一条压缩后的数据
 
+        Returns:
+            SENT 发送成功；DROP 被服务器拒绝，不再重试；RETRY 网络故障或服务器暂时不可用
+        """
+        try:
+            response = self._get_session().post(self.base_url, data=body, timeout=self.timeout)
         except Exception as e:
             bstats_logger.error(f"网络请求异常: {e}")
             if self.config.log_errors_enabled:
                 import traceback
                 bstats_logger.error(f"异常堆栈: {traceback.format_exc()}")
+            return self.RETRY
+
+        status = response.status_code
+        if self.config.log_response_status_text_enabled:
+            bstats_logger.info(f"返回结果: {response.text if response.text else '(空)'}")
+        if 200 <= status < 300:
+            bstats_logger.info("遥测数据上报成功！")
+            return self.SENT
+        if status == 429 or status >= 500:
+            bstats_logger.warning(f"上报失败，状态码: {status}，稍后重试")
+            return self.RETRY
+        bstats_logger.warning(f"上报被拒绝，状态码: {status}，已丢弃该数据")
+        return self.DROP
+
+    def _submit_data(self, stop: threading.Event) -> bool:
+        """按时间先后发送离线队列中的数据，遇到可重试的失败时停止，返回队列是否已发送完"""
+        if not self.config.enabled:
+            return True
+        if len(self.spool):
+            bstats_logger.info(f"正在提交遥测数据到 bStats 服务器... (待发送 {len(self.spool)} 条)")
+        while not stop.is_set():
+            body = self.spool.peek()
+            if body is None:
+                return True
+            if self._post(body) == self.RETRY:
+                return False
+            self.spool.pop()
+        return False
+
+    def _backoff_delay(self) -> float:
+        """连续失败后的重试等待时间：指数增长并封顶于采集间隔，取上限的一半到全部之间的随机值"""
+        cap = min(self.interval, self.BACKOFF_BASE * 2 ** min(self._failures - 1, 16))
+        return random.uniform(cap / 2, cap)
+
+    def _submit_loop(self, stop: threading.Event, previous: Optional[threading.Thread]):
+        """
+        数据提交循环
 
-    def _submit_loop(self):
-        """数据提交循环"""
-        # 首次等待 30 秒
-        for _ in range(30):
-            if not self._running:
-                return
-            time.sleep(1)
-
-        while self._running:
-            try:
-                self._submit_data()
-            except Exception as e:
-                bstats_logger.error(f"提交数据时发生错误: {e}")
-                if self.config.log_errors_enabled:
-                    import traceback
-                    bstats_logger.error(f"异常堆栈: {traceback.format_exc()}")
+        Args:
+            stop: 本次启动的停止事件
+            previous: 上一次启动的提交线程，关闭后可能仍在等待请求结束
+        """
+        if previous is not None:
+            # 等上一个线程退出后再使用离线队列和连接，同一时刻只有一个线程在提交
+            previous.join()
+        if stop.is_set() or not self._initialize():
+            return
+        self._log_started()
 
-            # 等待 30 分钟
-            for _ in range(30 * 60):
-                if not self._running:
-                    break
-                time.sleep(1)
+        next_collect = time.monotonic() + self.initial_delay
+        delay = self.initial_delay
+        try:
+            while not stop.wait(delay):
+                try:
+                    if time.monotonic() >= next_collect:
+                        next_collect = time.monotonic() + self.interval
+                        self._enqueue_data()
+                    delivered = self._submit_data(stop)
+                except Exception as e:
+                    bstats_logger.error(f"提交数据时发生错误: {e}")
+                    if self.config.log_errors_enabled:
+                        import traceback
+                        bstats_logger.error(f"异常堆栈: {traceback.format_exc()}")
+                    delivered = False
+
+                until_collect = max(0.0, next_collect - time.monotonic())
+                if delivered:
+                    self._failures = 0
+                    delay = until_collect
+                else:
+                    self._failures += 1
+                    delay = min(self._backoff_delay(), until_collect)
+        finally:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
 
     def start(self):
         """启动 bStats 遥测"""
@@ -308,22 +449,34 @@ class BStats:
             return
 
         self._running = True
-        self._submit_thread = threading.Thread(target=self._submit_loop, daemon=True)
+        previous = self._submit_thread
+        if previous is not None and not previous.is_alive():
+            previous = None
+        self._stop = threading.Event()
+        self._submit_thread = threading.Thread(
+            target=self._submit_loop, args=(self._stop, previous), name="EasyLuckyPillar-BStats", daemon=True
+        )
         self._submit_thread.start()
 
-        # 输出启动日志
+    def _log_started(self):
+        """输出启动日志"""
         bstats_logger.info(f"{self.plugin_name} 遥测模块已启动。")
-        bstats_logger.info(f"首次数据将在 30 秒后发送,之后每 30 分钟发送一次。")
+        bstats_logger.info(f"首次数据将在 {self.initial_delay:g} 秒后发送,之后每 {self.interval / 60:g} 分钟发送一次。")
+        if len(self.spool):
+            bstats_logger.info(f"离线队列中有 {len(self.spool)} 条上次未发送的数据。")
         if self.config.log_sent_data_enabled:
             bstats_logger.info(f"插件ID: {self.service_id}, 插件版本: {self.plugin_version}")
             bstats_logger.info(f"遥测状态: {'已启用' if self.config.enabled else '已禁用'}")
             bstats_logger.info(f"调试模式: {'已启用' if self.config.log_sent_data_enabled else '已禁用'}")
 
     def shutdown(self):
-        """关闭 bStats 遥测"""
+        """
+        关闭 bStats 遥测，不等待提交线程：线程在当前请求结束后自行退出，未发送的数据留在离线队列中
+
+        线程引用会保留，之后再次 start() 时新线程会先等待它退出。
+        """
         self._running = False
-        if self._submit_thread and self._submit_thread.is_alive():
-            self._submit_thread.join(timeout=5)
+        self._stop.set()
 
-        if self.config.log_sent_data_enabled:
+        if self.config is not None and self.config.log_sent_data_enabled:
             bstats_logger.info(f"{self.plugin_name} 遥测模块已关闭。")
@@ -0,0 +1,46 @@
+"""
+幸运之柱的命令批处理模块
+"""
+from typing import Dict
+
+
+class CommandBatcher:
+    """按 tick 合并的控制台命令批处理器
+
+    同一 tick 内排队的相同命令只执行一次，配合场次实体标签，
+    原本对每个玩家各执行一次的命令可以合并为一条目标选择器命令。
+    队列在每 tick 结束时由统一调度器清空，也可以手动 flush。
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self._pending: Dict[str, None] = {}  # 有序去重
+        self.dispatched = 0  # 实际执行的命令数
+        self.merged = 0  # 因重复而被合并掉的命令数
+
+    def queue(self, command: str):
+        """排队一条命令"""
+        if command in self._pending:
+            self.merged += 1
+        else:
+            self._pending[command] = None
+
+    def for_tag(self, tag: str, template: str):
+        """
+        对带有指定标签的所有玩家排队一条命令
+
+        Args:
+            tag: 实体标签
+            template: 命令模板，其中的 {target} 会被替换为目标选择器
+        """
+        self.queue(template.format(target=f"@a[tag={tag}]"))
+
+    def flush(self):
+        """立即执行所有排队的命令"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        sender = self.server.command_sender
+        for command in pending:
+            self.server.dispatch_command(sender, command)
+        self.dispatched += len(pending)
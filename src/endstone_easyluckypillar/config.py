@@ -0,0 +1,217 @@
+"""
+幸运之柱的配置编译与差异比较模块
+
+配置文件在加载时编译为带 __slots__ 的配置对象，热路径直接读取属性，
+默认值只在这里定义一次；类型错误或取值越界会在编译时收集起来统一报告，然后使用默认值。
+"""
+from typing import Dict, List, Optional, Set
+
+
+class _Reader:
+    """按字段类型读取配置并收集错误"""
+
+    def __init__(self, data, path: str, errors: List[str]):
+        if data is None:
+            data = {}
+        elif not isinstance(data, dict):
+            errors.append(f"{path}: 应为对象，实际为 {type(data).__name__}")
+            data = {}
+        self.data = data
+        self.path = path
+        self.errors = errors
+
+    def _error(self, key: str, message: str):
+        self.errors.append(f"{self.path}.{key}: {message}")
+
+    def number(self, key: str, default, minimum=None, integer: bool = False):
+        value = self.data.get(key, default)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            self._error(key, f"应为数字，实际为 {type(value).__name__}，已使用默认值 {default}")
+            return default
+        if integer and not float(value).is_integer():
+            self._error(key, f"应为整数，实际为 {value}，已使用默认值 {default}")
+            return default
+        if minimum is not None and value < minimum:
+            self._error(key, f"不能小于 {minimum}，实际为 {value}，已使用默认值 {default}")
+            return default
+        return int(value) if integer else float(value)
+
+    def boolean(self, key: str, default: bool) -> bool:
+        value = self.data.get(key, default)
+        if not isinstance(value, bool):
+            self._error(key, f"应为 true 或 false，实际为 {value!r}，已使用默认值 {default}")
+            return default
+        return value
+
+    def string(self, key: str, default: str) -> str:
+        value = self.data.get(key, default)
+        if not isinstance(value, str) or not value:
+            self._error(key, f"应为非空字符串，实际为 {value!r}，已使用默认值 {default}")
+            return default
+        return value
+
+    def section(self, key: str) -> "_Reader":
+        return _Reader(self.data.get(key), f"{self.path}.{key}", self.errors)
+
+
+class BorderConfig:
+    """边界配置"""
+
+    __slots__ = ("initial_radius", "min_radius", "shrink_interval", "shrink_amount", "damage_per_second")
+
+    def __init__(self, r: _Reader):
+        self.initial_radius = r.number("initial_radius", 20, minimum=1, integer=True)  # 初始边界半径
+        self.min_radius = r.number("min_radius", 4, minimum=0, integer=True)  # 最小边界半径
+        self.shrink_interval = r.number("shrink_interval", 300, minimum=1, integer=True)  # 边界缩小间隔（秒）
+        self.shrink_amount = r.number("shrink_amount", 4, minimum=0, integer=True)  # 每次缩小的格数
+        self.damage_per_second = r.number("damage_per_second", 5, minimum=0, integer=True)  # 每秒扣血量
+        if self.min_radius > self.initial_radius:
+            r.errors.append(f"{r.path}.min_radius: 不能大于 initial_radius ({self.initial_radius})，已改为 {self.initial_radius}")
+            self.min_radius = self.initial_radius
+
+
+class ParticleConfig:
+    """边界粒子配置"""
+
+    __slots__ = ("enabled", "particle_type", "particle_height", "particle_y_offset",
+                 "horizontal_step", "vertical_step", "view_distance")
+
+    def __init__(self, r: _Reader):
+        self.enabled = r.boolean("enabled", True)
+        self.particle_type = r.string("particle_type", "minecraft:falling_border_dust_particle")
+        self.particle_height = r.number("particle_height", 10, integer=True)
+        self.particle_y_offset = r.number("particle_y_offset", -48, integer=True)
+        self.horizontal_step = r.number("horizontal_step", 2, minimum=1, integer=True)
+        self.vertical_step = r.number("vertical_step", 1, minimum=1, integer=True)
+        self.view_distance = r.number("view_distance", 4, minimum=0)
+
+
+class SoundConfig:
+    """音效配置"""
+
+    __slots__ = ("enabled", "countdown_sound", "countdown_volume",
+                 "border_shrink_sound", "border_shrink_volume", "border_shrink_pitch",
+                 "victory_sound", "victory_volume", "victory_pitch",
+                 "game_end_sound", "game_end_volume", "game_end_pitch")
+
+    def __init__(self, r: _Reader):
+        self.enabled = r.boolean("enabled", True)
+        self.countdown_sound = r.string("countdown_sound", "random.orb")
+        self.countdown_volume = r.number("countdown_volume", 10.0, minimum=0)
+        self.border_shrink_sound = r.string("border_shrink_sound", "mob.wither.ambient")
+        self.border_shrink_volume = r.number("border_shrink_volume", 10.0, minimum=0)
+        self.border_shrink_pitch = r.number("border_shrink_pitch", 1.0, minimum=0)
+        self.victory_sound = r.string("victory_sound", "mob.enderdragon.death")
+        self.victory_volume = r.number("victory_volume", 10.0, minimum=0)
+        self.victory_pitch = r.number("victory_pitch", 1.0, minimum=0)
+        self.game_end_sound = r.string("game_end_sound", "mob.wither.death")
+        self.game_end_volume = r.number("game_end_volume", 10.0, minimum=0)
+        self.game_end_pitch = r.number("game_end_pitch", 1.0, minimum=0)
+
+
+class TaskConfig:
+    """定时任务间隔配置（tick）"""
+
+    __slots__ = ("item_interval", "event_interval", "border_check_interval",
+                 "particle_interval", "scoreboard_update_interval")
+
+    def __init__(self, r: _Reader):
+        self.item_interval = r.number("item_interval", 100, minimum=1, integer=True)
+        self.event_interval = r.number("event_interval", 1200, minimum=1, integer=True)
+        self.border_check_interval = r.number("border_check_interval", 20, minimum=1, integer=True)
+        self.particle_interval = r.number("particle_interval", 20, minimum=1, integer=True)
+        self.scoreboard_update_interval = r.number("scoreboard_update_interval", 20, minimum=1, integer=True)
+
+
+class EventConfig:
+    """随机事件配置"""
+
+    __slots__ = ("tnt_spawn_interval", "tnt_max_entities")
+
+    def __init__(self, r: _Reader):
+        self.tnt_spawn_interval = r.number("tnt_spawn_interval", 5, minimum=1, integer=True)  # TNT雨生成间隔（tick）
+        self.tnt_max_entities = r.number("tnt_max_entities", 20, minimum=0, integer=True)  # 场上最多同时存在的 TNT 数
+
+
+class SessionConfig:
+    """单个场次编译后的配置"""
+
+    __slots__ = ("session_id", "name", "min_players", "max_players",
+                 "border", "particles", "sounds", "tasks", "events")
+
+    def __init__(self, session_id: str, data: dict, errors: List[str]):
+        r = _Reader(data, f"sessions.{session_id}", errors)
+        self.session_id = session_id
+        self.name = r.string("name", f"场次{session_id}")
+        self.min_players = r.number("min_players", 2, minimum=1, integer=True)
+        pillars = r.data.get("pillars", {})
+        if not isinstance(pillars, dict):
+            errors.append(f"sessions.{session_id}.pillars: 应为对象，实际为 {type(pillars).__name__}")
+            pillars = {}
+        self.max_players = len(pillars)
+        self.border = BorderConfig(r.section("border"))
+        self.particles = ParticleConfig(r.section("particles"))
+        self.sounds = SoundConfig(r.section("sounds"))
+        self.tasks = TaskConfig(r.section("tasks"))
+        self.events = EventConfig(r.section("events"))
+
+
+# 游戏进行中也可以立即生效的场次配置段，其余配置段（边界、任务间隔、幸运柱、中心点、准备区域等）
+# 会推迟到场次空闲后再生效
+LIVE_SESSION_SECTIONS = frozenset({"name", "particles", "sounds", "events"})
+
+
+class ConfigDiff:
+    """两份配置之间的结构化差异"""
+
+    __slots__ = ("added", "removed", "changed", "top_level")
+
+    def __init__(self):
+        self.added: List[str] = []  # 新增的场次
+        self.removed: List[str] = []  # 删除的场次
+        self.changed: Dict[str, Set[str]] = {}  # 场次ID -> 发生变化的配置段
+        self.top_level: Set[str] = set()  # 发生变化的顶层配置项（sessions 除外）
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed or self.top_level)
+
+
+def diff_config(old: dict, new: dict) -> ConfigDiff:
+    """比较两份原始配置"""
+    diff = ConfigDiff()
+    old_sessions = old.get("sessions", {}) or {}
+    new_sessions = new.get("sessions", {}) or {}
+    for sid, data in new_sessions.items():
+        if sid not in old_sessions:
+            diff.added.append(sid)
+            continue
+        before = old_sessions[sid]
+        if not isinstance(before, dict) or not isinstance(data, dict):
+            if before != data:
+                diff.changed[sid] = {"*"}
+            continue
+        sections = {key for key in before.keys() | data.keys() if before.get(key) != data.get(key)}
+        if sections:
+            diff.changed[sid] = sections
+    diff.removed = [sid for sid in old_sessions if sid not in new_sessions]
+    diff.top_level = {
+        key for key in old.keys() | new.keys()
+        if key != "sessions" and old.get(key) != new.get(key)
+    }
+    return diff
+
+
+def split_live_sections(before: Optional[dict], after: dict, sections: Set[str]) -> dict:
+    """
+    只把可以立即生效的配置段从新配置合并到旧配置上
+
+    Returns:
+        合并后的场次配置
+    """
+    merged = dict(before or {})
+    for key in sections & LIVE_SESSION_SECTIONS:
+        if key in after:
+            merged[key] = after[key]
+        else:
+            merged.pop(key, None)
+    return merged
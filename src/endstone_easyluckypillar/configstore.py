@@ -0,0 +1,200 @@
+"""
+幸运之柱的配置文件读写模块
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+
+class ConfigWriter:
+    """配置文件后台写入器
+
+    save() 只把配置标记为已修改并立即返回。主线程的调度器每 tick 调用一次 poll()，
+    在最后一次修改后安静 debounce 秒时把配置序列化为一份快照交给后台线程写入，
+    同一个防抖窗口内的多次修改只序列化、写盘一次。
+    写入时先写临时文件再原子替换，写到一半崩溃也不会留下被截断的配置文件。
+    """
+
+    def __init__(self, path: Path, debounce: float = 0.5,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self.path = Path(path)
+        self.debounce = debounce
+        self._on_error = on_error
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._data: Optional[dict] = None  # 最近一次 save() 传入的配置，只在主线程序列化
+        self._generation = 0  # 每次 save() 加一
+        self._snapshot_generation = 0  # 已序列化的版本
+        self._queued: Optional[Tuple[str, int]] = None  # 等待后台线程写入的 (快照, 版本)
+        self._written = 0  # 已写入磁盘的版本
+        self._last_change = 0.0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.writes = 0  # 实际写盘次数
+        self.last_mtime_ns = None  # 本写入器最近一次写出的文件修改时间
+
+    @property
+    def pending(self) -> bool:
+        """是否还有尚未写入磁盘的修改"""
+        with self._cond:
+            return self._generation != self._written
+
+    def open(self):
+        """重新启用已关闭的写入器（插件重新启用时调用），后台线程在下次交出快照时启动"""
+        with self._cond:
+            self._closed = False
+
+    def save(self, data: dict):
+        """标记配置已修改，序列化与写入在防抖窗口结束后进行"""
+        with self._cond:
+            self._data = data
+            self._generation += 1
+            self._last_change = time.monotonic()
+            closed = self._closed
+        if closed:
+            self.flush()
+
+    def poll(self):
+        """防抖窗口结束时序列化一份快照并交给后台线程写入（由主线程的调度器调用）"""
+        if self._generation == self._snapshot_generation or self._closed:
+            return
+        if time.monotonic() - self._last_change < self.debounce:
+            return
+        # 在主线程序列化，后台线程只写入快照，不会读到修改到一半的配置
+        text = json.dumps(self._data, indent=4, ensure_ascii=False)
+        with self._cond:
+            generation = self._snapshot_generation = self._generation
+            self._queued = (text, generation)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="EasyLuckyPillar-ConfigWriter", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and self._queued is None:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                (text, generation), self._queued = self._queued, None
+            self._write(text, generation)
+
+    def _write(self, text: str, generation: int):
+        with self._write_lock:
+            if generation <= self._written:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_name(self.path.name + ".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+                self.last_mtime_ns = os.stat(self.path).st_mtime_ns
+            except Exception as e:
+                if self._on_error:
+                    self._on_error(e)
+                return
+            with self._cond:
+                self._written = generation
+            self.writes += 1
+
+    def flush(self):
+        """在当前线程序列化并同步写入尚未保存的修改"""
+        with self._cond:
+            data, generation = self._data, self._generation
+            if data is None or generation == self._written:
+                return
+            self._snapshot_generation = generation
+        self._write(json.dumps(data, indent=4, ensure_ascii=False), generation)
+
+    def close(self):
+        """停止后台线程并同步写入尚未保存的修改"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+
+class ConfigWatcher:
+    """配置文件修改监视器
+
+    后台线程每隔 interval 秒检查一次配置文件的修改时间，发现外部修改后
+    在后台线程中读取并解析，结果由主线程通过 poll() 取走并应用。
+    本插件自己写出的修改和写入器仍有未保存修改时的变化都会被忽略，以内存中的配置为准。
+    """
+
+    def __init__(self, path: Path, writer: ConfigWriter, interval: float = 2.0):
+        self.path = Path(path)
+        self.writer = writer
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._latest: Optional[Tuple[int, object]] = None  # (修改时间, 解析结果或异常)
+        self._seen_mtime_ns = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """记录当前修改时间并启动后台线程"""
+        self._seen_mtime_ns = self._mtime()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="EasyLuckyPillar-ConfigWatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """停止后台线程"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            # 持有写入锁检查，避免把本插件正在写出的文件当作外部修改
+            with self.writer._write_lock:
+                if self.writer.pending:
+                    continue
+                mtime = self._mtime()
+                if mtime is None or mtime == self._seen_mtime_ns:
+                    continue
+                self._seen_mtime_ns = mtime
+                if mtime == self.writer.last_mtime_ns:
+                    continue
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    result = json.load(f)
+            except Exception as e:
+                result = e
+            with self._lock:
+                self._latest = (mtime, result)
+
+    def poll(self):
+        """
+        取走最近一次检测到的外部修改（主线程调用）
+
+        Returns:
+            解析后的配置字典；解析失败时为异常对象；没有外部修改时为 None
+        """
+        with self._lock:
+            latest, self._latest = self._latest, None
+        if latest is None:
+            return None
+        if self.writer.pending:
+            # 检测到修改之后内存中又有新的修改，以内存为准
+            return None
+        return latest[1]
@@ -1,9 +1,8 @@
 # python 库
-import os, math, logging, random, json
-from datetime import datetime
+import time
+_import_started = time.perf_counter()  # 用于统计插件模块的导入耗时
+import os, sys, logging, random, json
 from pathlib import Path
-from threading import Lock
-from enum import Enum
 
 # endstone 库
 from endstone import Player, GameMode
@@ -12,21 +11,39 @@ from endstone.plugin import Plugin
 from endstone.command import Command, CommandSender
 from endstone.form import ActionForm
 from endstone.boss import BarColor, BarStyle
-from endstone.event import event_handler, PlayerDeathEvent, PlayerQuitEvent
+from endstone.event import event_handler, PlayerDeathEvent, PlayerJoinEvent, PlayerQuitEvent
 from endstone.inventory import ItemStack
 from endstone.scoreboard import Criteria, DisplaySlot
 
-# Easy系列插件的 BStats 遥测模块
-from .bstats import BStats
-
-# 游戏状态枚举
-class GameState(Enum):
-    IDLE = "idle"  # 空闲状态
-    WAITING = "waiting"  # 等待玩家加入
-    READY = "ready"  # 人数已满，等待管理员开始
-    COUNTDOWN = "countdown"  # 传送后倒计时中
-    RUNNING = "running"  # 游戏进行中
-    ENDED = "ended"  # 游戏已结束
+# 异步日志与渐变色渲染
+from .logs import ConsoleFormatter, GradientRenderer, LogPipeline, RotatingLogHandler
+# 空间索引与几何计算
+from .geometry import SessionGeometry, WaitAreaIndex, outside_radius
+# 玩家位置快照
+from .snapshot import PositionSnapshot
+# 场次成员登记
+from .membership import TAG_PREFIX, SessionMembership, alive_tag, member_tag
+# 命令批处理与玩家动作执行层
+from .commands import CommandBatcher
+from .actions import PlayerActions
+# Boss 栏差量视图
+from .bossbar import BossBarView
+# 侧边栏差量渲染
+from .sidebar import SIDEBAR_COUNTDOWN, SIDEBAR_RUNNING, SIDEBAR_WAITING, SidebarRenderer
+# 统一调度
+from .ticker import TickDriver
+# 边界粒子几何
+from .particles import BorderWallGeometry, ParticleBudget
+# 配置文件后台写入与修改监视
+from .configstore import ConfigWatcher, ConfigWriter
+# 配置编译与差异比较
+from .config import LIVE_SESSION_SECTIONS, SessionConfig, diff_config, split_live_sections
+# 物品池
+from .items import AliasTable, ItemDistributor, compile_item_pool
+# 随机事件引擎
+from .events import EventContext, EventRegistry
+# 场次运行时状态
+from .runtime import GameState, SessionRuntime
 
 # 插件全局常量
 plugin_name = "EasyLuckyPillar"
@@ -40,108 +57,108 @@ plugin_minebbs_link = "https://www.minebbs.com/resources/easyluckypillar-elp-end
 plugin_website = "https://www.minebbs.com/resources/easyluckypillar-elp-endstone.15496/"
 plugin_update_url = "https://raw.githubusercontent.com/MengHanLOVE1027/endstone-easyluckypillar/refs/heads/main/update_versions.json"
 
+TNT_FUSE_TICKS = 80  # TNT 从生成到爆炸的 tick 数，用于估算场上仍存在的 TNT
+
+# 配置文件中没有 item_pool 时使用的加权物品池 (物品名: 权重)
+DEFAULT_ITEM_POOL = {
+    # 原列表中的物品
+    "cobblestone": 100, "dirt": 100, "sand": 80, "gravel": 80, "planks": 100, "log": 80,
+    "glass": 60, "wool": 60, "stone": 80, "andesite": 70, "diorite": 70, "granite": 70,
+    "deepslate": 70, "tuff": 60, "moss_block": 50, "mud": 60,
+    "iron_ingot": 50, "gold_ingot": 40, "coal": 60, "copper_ingot": 50, "redstone": 40,
+    "lapis_lazuli": 30, "emerald": 20, "diamond": 10, "netherite_ingot": 2,
+    "bread": 60, "cooked_beef": 50, "apple": 60, "carrot": 60, "potato": 60,
+    "golden_apple": 10, "enchanted_golden_apple": 1,
+    "bow": 30, "arrow": 50, "crossbow": 20, "iron_sword": 30, "diamond_sword": 5,
+    "iron_pickaxe": 30, "diamond_pickaxe": 5, "shield": 20, "totem_of_undying": 2,
+    "trident": 3, "spyglass": 10, "fishing_rod": 20, "snowball": 40, "egg": 40,
+    "iron_helmet": 15, "iron_chestplate": 10, "iron_leggings": 15, "iron_boots": 15,
+    "diamond_helmet": 3, "diamond_chestplate": 2, "diamond_leggings": 3, "diamond_boots": 3,
+    "tnt": 25, "ender_pearl": 15, "bucket": 30, "water_bucket": 20, "lava_bucket": 15,
+    "firework_rocket": 20, "slime_ball": 20, "magma_cream": 15, "obsidian": 10,
+
+    # 补充：各色羊毛（类似 wool 权重60）
+    "white_wool": 60, "orange_wool": 60, "magenta_wool": 60, "light_blue_wool": 60,
+    "yellow_wool": 60, "lime_wool": 60, "pink_wool": 60, "gray_wool": 60,
+    "light_gray_wool": 60, "cyan_wool": 60, "purple_wool": 60, "blue_wool": 60,
+    "brown_wool": 60, "green_wool": 60, "red_wool": 60, "black_wool": 60,
+
+    # 补充：各色混凝土（权重70）
+    "white_concrete": 70, "orange_concrete": 70, "magenta_concrete": 70, "light_blue_concrete": 70,
+    "yellow_concrete": 70, "lime_concrete": 70, "pink_concrete": 70, "gray_concrete": 70,
+    "light_gray_concrete": 70, "cyan_concrete": 70, "purple_concrete": 70, "blue_concrete": 70,
+    "brown_concrete": 70, "green_concrete": 70, "red_concrete": 70, "black_concrete": 70,
+
+    # 补充：各色玻璃（类似 glass 权重60）
+    "white_stained_glass": 60, "orange_stained_glass": 60, "magenta_stained_glass": 60,
+    "light_blue_stained_glass": 60, "yellow_stained_glass": 60, "lime_stained_glass": 60,
+    "pink_stained_glass": 60, "gray_stained_glass": 60, "light_gray_stained_glass": 60,
+    "cyan_stained_glass": 60, "purple_stained_glass": 60, "blue_stained_glass": 60,
+    "brown_stained_glass": 60, "green_stained_glass": 60, "red_stained_glass": 60,
+    "black_stained_glass": 60,
+
+    # 补充：其他木头种类（类似 log 权重80）
+    "spruce_log": 80, "birch_log": 80, "jungle_log": 80, "acacia_log": 80,
+    "dark_oak_log": 80, "mangrove_log": 80, "cherry_log": 80,
+
+    # 补充：石质建材
+    "end_stone": 60, "prismarine": 60, "purpur_block": 60,
+    "bookshelf": 50, "clay": 60, "honeycomb_block": 40, "hay_block": 50,
+
+    # 补充：更多工具/武器/盔甲（按材质分级）
+    "wooden_sword": 20, "stone_sword": 30, "golden_sword": 25,
+    "wooden_pickaxe": 20, "stone_pickaxe": 30, "golden_pickaxe": 25,
+    "wooden_axe": 20, "stone_axe": 30, "golden_axe": 25,
+    "wooden_shovel": 20, "stone_shovel": 30, "golden_shovel": 25,
+    "wooden_hoe": 20, "stone_hoe": 30, "golden_hoe": 25,
+    "leather_helmet": 15, "leather_chestplate": 10, "leather_leggings": 15, "leather_boots": 15,
+    "golden_helmet": 12, "golden_chestplate": 8, "golden_leggings": 12, "golden_boots": 12,
+    "chainmail_helmet": 10, "chainmail_chestplate": 8, "chainmail_leggings": 10, "chainmail_boots": 10,
+
+    # 补充：特殊工具与杂项
+    "flint_and_steel": 25, "compass": 20, "clock": 20, "map": 15,
+    "shears": 25, "lead": 15, "name_tag": 10,
+    "splash_potion": 15, "lingering_potion": 10,
+
+    # 补充：更多食物
+    "cake": 30, "cookie": 40, "pumpkin_pie": 40, "cooked_cod": 50,
+    "cooked_salmon": 50, "golden_carrot": 15,
+
+    # 补充：稀有掉落与材料
+    "blaze_rod": 15, "ghast_tear": 8, "turtle_helmet": 5,
+    "netherite_upgrade_smithing_template": 1,
+    "music_disc_13": 2, "music_disc_cat": 2
+}
+
 plugin_path = Path(f"./plugins/{plugin_name}")
 plugin_config_path = plugin_path / "config" / f"{plugin_name}.json"
 
-print_lock = Lock()  # 用于线程安全的日志输出
-
 # --- 随机颜色系统 ---
-GLOBAL_C1 = None
-GLOBAL_C2 = None
-
-def randomVividColor():
-    """生成一个鲜艳的随机颜色"""
-    rand = random.random() * 260
-    if rand < 90:
-        h = rand
-    elif rand < 200:
-        h = rand + 60
-    else:
-        h = rand + 100
-    s = 0.90 + random.random() * 0.10
-    l = 0.65 + random.random() * 0.15
-    a = s * min(l, 1 - l)
-    def f(n):
-        k = (n + h / 30) % 12
-        return round((l - a * max(-1, min(k - 3, 9 - k, 1))) * 255)
-    return [f(0), f(8), f(4)]
-
-def generateColorPair():
-    """生成一对颜色"""
-    c1 = randomVividColor()
-    c2, attempts = 0, 0
-    while True:
-        c2 = randomVividColor()
-        diff = abs(c1[0] - c2[0]) + abs(c1[1] - c2[1]) + abs(c1[2] - c2[2])
-        if diff > 150 or attempts > 20:
-            break
-        attempts += 1
-    return [c1, c2]
-
-GLOBAL_C1, GLOBAL_C2 = generateColorPair()
-
-def globalLerpColor(t):
-    """在全局颜色对之间进行线性插值"""
-    return [
-        round(GLOBAL_C1[0] + (GLOBAL_C2[0] - GLOBAL_C1[0]) * t),
-        round(GLOBAL_C1[1] + (GLOBAL_C2[1] - GLOBAL_C1[1]) * t),
-        round(GLOBAL_C1[2] + (GLOBAL_C2[2] - GLOBAL_C1[2]) * t)
-    ]
-
-def randomGradientColor(text):
-    """生成随机渐变色文本"""
-    lenth = len(text)
-    out = ''
-    for i in range(lenth):
-        t = 0 if lenth <= 1 else i / (lenth - 1)
-        r, g, b = globalLerpColor(t)
-        out += f"\x1b[38;2;{r};{g};{b}m{text[i]}"
-    return out + "\x1b[0m"
+gradient = GradientRenderer()  # 本次启动使用的渐变色，颜色对在第一次渲染时生成
 
 class RandomColor:
     """随机颜色类，用于生成随机渐变色文本"""
     def __init__(self, text):
         self.text = text
     def __str__(self):
-        return randomGradientColor(self.text)
+        return gradient.render(self.text)
 
 # TAG: 日志系统设置
+log_pipeline = LogPipeline(plugin_name)
+console_handler = logging.StreamHandler(sys.stdout)
+console_handler.setFormatter(ConsoleFormatter(plugin_name, gradient))
+log_pipeline.add_handler(console_handler)
+
+# 按天和大小轮转、旧分段后台压缩的日志文件，目录在写入第一条日志时创建
 log_dir = Path(f"./logs/{plugin_name}")
-if not log_dir.exists():
-    try:
-        log_dir.mkdir(parents=True, exist_ok=True)
-    except Exception as e:
-        print(f"[{plugin_name}] 创建日志目录失败: {e}")
-
-log_file = log_dir / f"{plugin_name_smallest}_{datetime.now().strftime('%Y%m%d')}.log"
-logger = logging.getLogger(plugin_name)
-logger.setLevel(logging.DEBUG)
-
-try:
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
-except Exception as e:
-    print(f"[{plugin_name}] 配置日志文件处理器失败: {e}")
+file_handler = RotatingLogHandler(log_dir, plugin_name_smallest)
+file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+file_handler.setFormatter(file_formatter)
+log_pipeline.add_handler(file_handler)
 
 def plugin_print(text, level="INFO") -> bool:
-    level_colors = {
-        "DEBUG": "\x1b[36m", "INFO": "\x1b[37m", "WARNING": "\x1b[33m",
-        "ERROR": "\x1b[31m", "SUCCESS": "\x1b[32m"
-    }
-    level_color = level_colors.get(level, "\x1b[37m")
-    logger_head = f"[\x1b[96m{plugin_name}\x1b[0m] [{level_color}{level}\x1b[0m] "
-    with print_lock:
-        print(logger_head + str(RandomColor(text)))
-    log_level_map = {
-        "DEBUG": logging.DEBUG, "INFO": logging.INFO, "WARNING": logging.WARNING,
-        "ERROR": logging.ERROR, "SUCCESS": logging.INFO
-    }
-    log_level = log_level_map.get(level, logging.INFO)
-    logger.log(log_level, str(text))
-    return True
+    # 优化: 低于日志级别时直接返回，渲染与写入都在日志线程中完成
+    return log_pipeline.log(text, level)
 
 # TAG: 插件入口点
 class EasyLuckyPillarPlugin(Plugin):
@@ -167,7 +184,8 @@ class EasyLuckyPillarPlugin(Plugin):
                 "/lpadmin removepillar <SessionID: int> <PillarID: int>",
                 "/lpadmin setpillar <SessionID: int> <PillarID: int>",
                 "/lpadmin setwaitarea <SessionID: int>",
-                "/lpadmin start <SessionID: int>", "/lpadmin stop <SessionID: int>"
+                "/lpadmin start <SessionID: int>", "/lpadmin stop <SessionID: int>",
+                "/lpadmin timings", "/lpadmin bench"
             ],
             "permissions": ["easyluckypillar.opcommand.use"],
         }
@@ -181,81 +199,41 @@ class EasyLuckyPillarPlugin(Plugin):
     def __init__(self):
         super().__init__()
         self.plugin_config = {"sessions": {}}
+        self._metrics = None  # bStats 遥测，启用插件后创建
+        self.enable_time_ms = 0.0  # 最近一次启用插件的耗时（毫秒）
+        self.config_writer = ConfigWriter(plugin_config_path, on_error=lambda e: plugin_print(
+            f"保存配置文件失败: {e}", "ERROR"
+        ))  # 配置文件后台写入器，合并短时间内的多次保存
+        self.config_watcher = ConfigWatcher(plugin_config_path, self.config_writer)  # 配置文件外部修改监视器
+        self.session_configs = {}  # 场次编译后的配置 (场次ID -> SessionConfig)
+        self.pending_session_configs = {}  # 等场次空闲后才应用的配置 (场次ID -> 新配置，None 表示删除)
         self.game_sessions = {}  # 运行时场次数据
-        self.player_session = {} # 玩家当前所在场次
+        self.members = SessionMembership(on_tag=self.sync_player_tag)  # 场次成员登记（所在场次、成员、存活者）
+        self.wait_area_occupants = {}  # 场次ID -> {玩家UUID: Player}，每秒由位置检查刷新
+        self.wait_area_index = WaitAreaIndex()  # 准备区域空间索引
+        self.session_geometry = {}  # 场次预编译几何数据
+        self.positions = PositionSnapshot()  # 每 tick 的玩家位置快照
+        self.particle_budget = ParticleBudget()  # 插件级每 tick 粒子预算
+        self.online_players = {}  # 在线玩家缓存 (UUID -> Player)，由加入/退出事件维护
+        self.driver = TickDriver(on_error=lambda action, e: plugin_print(
+            f"定时动作 {action.name} (场次 {action.session_id}) 执行出错: {e}", "ERROR"
+        ))  # 插件级统一调度器
+        self.events = EventRegistry(on_error=lambda name, e: plugin_print(
+            f"加载第三方事件 {name} 失败: {e}", "ERROR"
+        ))  # 随机事件注册表，第三方事件在第一次使用时才加载
+        self._online_reconcile_counter = 0
         
         # 加权物品池 (物品名: 权重)
-        self.weighted_item_pool = {
-            # 原列表中的物品
-            "cobblestone": 100, "dirt": 100, "sand": 80, "gravel": 80, "planks": 100, "log": 80,
-            "glass": 60, "wool": 60, "stone": 80, "andesite": 70, "diorite": 70, "granite": 70,
-            "deepslate": 70, "tuff": 60, "moss_block": 50, "mud": 60,
-            "iron_ingot": 50, "gold_ingot": 40, "coal": 60, "copper_ingot": 50, "redstone": 40,
-            "lapis_lazuli": 30, "emerald": 20, "diamond": 10, "netherite_ingot": 2,
-            "bread": 60, "cooked_beef": 50, "apple": 60, "carrot": 60, "potato": 60,
-            "golden_apple": 10, "enchanted_golden_apple": 1,
-            "bow": 30, "arrow": 50, "crossbow": 20, "iron_sword": 30, "diamond_sword": 5,
-            "iron_pickaxe": 30, "diamond_pickaxe": 5, "shield": 20, "totem_of_undying": 2,
-            "trident": 3, "spyglass": 10, "fishing_rod": 20, "snowball": 40, "egg": 40,
-            "iron_helmet": 15, "iron_chestplate": 10, "iron_leggings": 15, "iron_boots": 15,
-            "diamond_helmet": 3, "diamond_chestplate": 2, "diamond_leggings": 3, "diamond_boots": 3,
-            "tnt": 25, "ender_pearl": 15, "bucket": 30, "water_bucket": 20, "lava_bucket": 15,
-            "firework_rocket": 20, "slime_ball": 20, "magma_cream": 15, "obsidian": 10,
-
-            # 补充：各色羊毛（类似 wool 权重60）
-            "white_wool": 60, "orange_wool": 60, "magenta_wool": 60, "light_blue_wool": 60,
-            "yellow_wool": 60, "lime_wool": 60, "pink_wool": 60, "gray_wool": 60,
-            "light_gray_wool": 60, "cyan_wool": 60, "purple_wool": 60, "blue_wool": 60,
-            "brown_wool": 60, "green_wool": 60, "red_wool": 60, "black_wool": 60,
-
-            # 补充：各色混凝土（权重70）
-            "white_concrete": 70, "orange_concrete": 70, "magenta_concrete": 70, "light_blue_concrete": 70,
-            "yellow_concrete": 70, "lime_concrete": 70, "pink_concrete": 70, "gray_concrete": 70,
-            "light_gray_concrete": 70, "cyan_concrete": 70, "purple_concrete": 70, "blue_concrete": 70,
-            "brown_concrete": 70, "green_concrete": 70, "red_concrete": 70, "black_concrete": 70,
-
-            # 补充：各色玻璃（类似 glass 权重60）
-            "white_stained_glass": 60, "orange_stained_glass": 60, "magenta_stained_glass": 60,
-            "light_blue_stained_glass": 60, "yellow_stained_glass": 60, "lime_stained_glass": 60,
-            "pink_stained_glass": 60, "gray_stained_glass": 60, "light_gray_stained_glass": 60,
-            "cyan_stained_glass": 60, "purple_stained_glass": 60, "blue_stained_glass": 60,
-            "brown_stained_glass": 60, "green_stained_glass": 60, "red_stained_glass": 60,
-            "black_stained_glass": 60,
-
-            # 补充：其他木头种类（类似 log 权重80）
-            "spruce_log": 80, "birch_log": 80, "jungle_log": 80, "acacia_log": 80,
-            "dark_oak_log": 80, "mangrove_log": 80, "cherry_log": 80,
-
-            # 补充：石质建材
-            "end_stone": 60, "prismarine": 60, "purpur_block": 60,
-            "bookshelf": 50, "clay": 60, "honeycomb_block": 40, "hay_block": 50,
-
-            # 补充：更多工具/武器/盔甲（按材质分级）
-            "wooden_sword": 20, "stone_sword": 30, "golden_sword": 25,
-            "wooden_pickaxe": 20, "stone_pickaxe": 30, "golden_pickaxe": 25,
-            "wooden_axe": 20, "stone_axe": 30, "golden_axe": 25,
-            "wooden_shovel": 20, "stone_shovel": 30, "golden_shovel": 25,
-            "wooden_hoe": 20, "stone_hoe": 30, "golden_hoe": 25,
-            "leather_helmet": 15, "leather_chestplate": 10, "leather_leggings": 15, "leather_boots": 15,
-            "golden_helmet": 12, "golden_chestplate": 8, "golden_leggings": 12, "golden_boots": 12,
-            "chainmail_helmet": 10, "chainmail_chestplate": 8, "chainmail_leggings": 10, "chainmail_boots": 10,
-
-            # 补充：特殊工具与杂项
-            "flint_and_steel": 25, "compass": 20, "clock": 20, "map": 15,
-            "shears": 25, "lead": 15, "name_tag": 10,
-            "splash_potion": 15, "lingering_potion": 10,
-
-            # 补充：更多食物
-            "cake": 30, "cookie": 40, "pumpkin_pie": 40, "cooked_cod": 50,
-            "cooked_salmon": 50, "golden_carrot": 15,
-
-            # 补充：稀有掉落与材料
-            "blaze_rod": 15, "ghast_tear": 8, "turtle_helmet": 5,
-            "netherite_upgrade_smithing_template": 1,
-            "music_disc_13": 2, "music_disc_cat": 2
-        }
+        self.weighted_item_pool = DEFAULT_ITEM_POOL
+        self.item_table = AliasTable(self.weighted_item_pool)  # 物品池别名表，加载配置时重建
+        self.item_distributor = ItemDistributor(
+            make_stack=lambda item_type: ItemStack(item_type, 1),
+            can_receive=self.can_receive_item,
+            on_error=lambda item_type, e: plugin_print(f"无法发放物品 {item_type}: {e}", "ERROR"),
+        )  # 物品发放流水线
 
     def on_load(self):
+        log_pipeline.start()  # 日志线程在插件加载时才启动，导入插件模块不会创建线程
         print(RandomColor("███████╗ █████╗ ███████╗██╗   ██╗██╗     ██╗   ██╗ ██████╗██╗  ██╗██╗   ██╗██████╗ ██╗██╗     ██╗      █████╗ ██████╗ "))
         print(RandomColor("██╔════╝██╔══██╗██╔════╝╚██╗ ██╔╝██║     ██║   ██║██╔════╝██║ ██╔╝╚██╗ ██╔╝██╔══██╗██║██║     ██║     ██╔══██╗██╔══██╗"))
         print(RandomColor("█████╗  ███████║███████╗ ╚████╔╝ ██║     ██║   ██║██║     █████╔╝  ╚████╔╝ ██████╔╝██║██║     ██║     ███████║██████╔╝"))
@@ -276,11 +254,9 @@ class EasyLuckyPillarPlugin(Plugin):
         plugin_print(f"{plugin_name} 已加载", "INFO")
 
     def on_enable(self):
-        # bStats统计功能
-        plugin_id = 29829
-        self._metrics = BStats(self, plugin_id)
-        self._metrics.start()  # 启动定时提交任务
-        
+        enable_started = time.perf_counter()
+        log_pipeline.start()  # 重新启用插件时日志线程已在禁用时停止
+        self.config_writer.open()  # 同上，禁用插件时写入器已关闭
         self.load_config()
         self.register_events(self)
         # 确保 sessions 键存在
@@ -290,47 +266,121 @@ class EasyLuckyPillarPlugin(Plugin):
             
         for sid in self.plugin_config.get("sessions", {}):
             self.init_session_runtime(sid)
+
+        # 插件启用时服务器上可能已有玩家在线，清除他们身上上次运行残留的场次标签
+        self.reconcile_online_players()
+        for player in self.online_players.values():
+            self.strip_session_tags(player)
             
         # 自动设置游戏规则：立即重生
         self.server.dispatch_command(self.server.command_sender, "gamerule doimmediaterespawn true")
         
-        # 启动定时任务，每秒检查一次玩家位置
-        self.server.scheduler.run_task(self, self.check_players_position, delay=20, period=20)
-
-        plugin_print(f"{plugin_name} 已启用", "INFO")
+        # 插件只向服务器注册这一个每 tick 执行的任务，其余定时动作都由统一调度器驱动
+        self.driver.add_tick_hook(self.positions.advance)  # 每 tick 推进一次位置快照
+        self.command_batch = CommandBatcher(self.server)
+        self.driver.add_tick_hook(self.command_batch.flush, after=True)  # 每 tick 结束时执行合并后的命令
+        self.actions = PlayerActions(self.server, self.command_batch)
+        self.actions.configure(self.plugin_config.get("player_actions", {}))
+        self.server.scheduler.run_task(self, self.driver.run_tick, delay=0, period=1)
+        # 每秒检查一次玩家位置
+        self.driver.schedule(self.check_players_position, delay=20, period=20, name="position_check")
+        # 后台监视配置文件的外部修改，每秒在主线程应用一次
+        self.config_watcher.start()
+        self.driver.schedule(self.poll_config_changes, delay=20, period=20, name="config_watch")
+        # 配置修改的防抖窗口结束时在主线程序列化一次，再交给写入器的后台线程写盘
+        self.driver.schedule(self.config_writer.poll, delay=1, period=1, name="config_save")
+        # 每 tick 发放一部分排队中的物品
+        self.driver.schedule(self.item_distributor.run_tick, delay=1, period=1, name="item_delivery")
+
+        # bStats统计功能：在插件自身启用完成后再启动，配置读取、系统探测与网络依赖的导入都在遥测线程中进行
+        self.start_metrics()
+
+        self.enable_time_ms = (time.perf_counter() - enable_started) * 1000
+        plugin_print(f"{plugin_name} 已启用 (导入 {import_time_ms:.1f}ms, 启用 {self.enable_time_ms:.1f}ms)", "INFO")
+
+    def start_metrics(self):
+        """创建并启动 bStats 遥测"""
+        if self._metrics is None:
+            from .bstats import BStats  # 只在启用时导入遥测模块
+            plugin_id = 29829
+            self._metrics = BStats(self, plugin_id)
+        # 重新启用插件时复用同一个实例，新的提交线程会等上一个线程退出，不会有两个线程同时使用离线队列
+        self._metrics.start()  # 启动定时提交任务
         
     def on_disable(self) -> None: 
-        self._metrics.shutdown() # 关闭bStats统计
+        self.config_watcher.stop() # 停止监视配置文件
+        self.config_writer.close() # 同步写入尚未保存的配置
+        if self._metrics is not None:
+            self._metrics.shutdown() # 关闭bStats统计
         plugin_print(f"{plugin_name} 已禁用", "INFO")
+        log_pipeline.stop() # 输出剩余日志并停止日志线程
+
+    def is_online(self, player: Player) -> bool:
+        """通过在线玩家缓存判断玩家是否在线"""
+        return player.unique_id in self.online_players
+
+    def reconcile_online_players(self):
+        """用服务器的在线列表校正在线玩家缓存，防止遗漏事件导致缓存偏差"""
+        self.online_players = {p.unique_id: p for p in self.server.online_players}
+
+    def sync_player_tag(self, player: Player, tag: str, add: bool):
+        """成员登记表变化时同步玩家身上的场次标签"""
+        # 已下线的玩家无法修改标签，残留的标签会在其重新加入时清除
+        if not self.is_online(player):
+            return
+        if add:
+            player.add_scoreboard_tag(tag)
+        else:
+            player.remove_scoreboard_tag(tag)
+
+    def strip_session_tags(self, player: Player):
+        """清除玩家身上残留的场次标签（插件重载或玩家中途下线后）"""
+        for tag in list(player.scoreboard_tags):
+            if tag.startswith(TAG_PREFIX):
+                player.remove_scoreboard_tag(tag)
 
     def check_players_position(self):
         """定期检查所有在线玩家的位置，自动加入或离开场次"""
-        for player in self.server.online_players:
+        # 每 30 秒校正一次在线玩家缓存
+        self._online_reconcile_counter += 1
+        if self._online_reconcile_counter >= 30:
+            self._online_reconcile_counter = 0
+            self.reconcile_online_players()
+
+        occupants = {}
+        for player in list(self.online_players.values()):
+            # 通过空间索引查找玩家所在的准备区域，并记录各准备区域内的玩家
+            x, y, z, dimension = self.positions.get(player)
+            in_areas = self.wait_area_index.query(dimension, x, y, z)
+            for sid in in_areas:
+                occupants.setdefault(sid, {})[player.unique_id] = player
+
             # 检查玩家是否已经在某个场次中
-            if player.name in self.player_session:
-                current_session = self.player_session[player.name]
-                runtime = self.game_sessions.get(current_session, {"state": GameState.IDLE})
+            current_session = self.members.session_of(player)
+            if current_session is not None:
+                runtime = self.game_sessions.get(current_session)
 
                 # 如果游戏正在进行中、倒计时中，不检查玩家位置
-                if runtime["state"] in [GameState.RUNNING, GameState.COUNTDOWN]:
+                if runtime is not None and runtime.state in [GameState.RUNNING, GameState.COUNTDOWN]:
                     continue
 
                 # 检查玩家是否还在当前场次的准备区域内
-                in_wait_area = self.is_player_in_wait_area(player, current_session)
-                if not in_wait_area:
+                if current_session not in in_areas:
                     # 玩家离开了准备区域，自动离开游戏
                     player.send_message("§c你离开了准备区域，已自动退出游戏！")
                     self.leave_game(player, silent=True)
             else:
                 # 玩家不在任何场次中，检查是否进入了某个场次的准备区域
-                for sid in self.plugin_config.get("sessions", {}):
-                    runtime = self.game_sessions.get(sid, {"state": GameState.IDLE})
+                for sid in in_areas:
+                    runtime = self.game_sessions.get(sid)
                     # 在空闲状态、等待状态或准备就绪状态下允许玩家自动加入
-                    if runtime["state"] in [GameState.IDLE, GameState.WAITING, GameState.READY] and self.is_player_in_wait_area(player, sid):
+                    if runtime is None or runtime.in_lobby:
                         # 玩家进入了准备区域，自动加入游戏
                         self.join_game(player, sid)
                         break
 
+        self.wait_area_occupants = occupants
+
         # 检查是否有场次的所有玩家都在准备区域内，如果是，则播放胜利音效
         self.check_all_players_in_wait_area()
 
@@ -339,24 +389,11 @@ class EasyLuckyPillarPlugin(Plugin):
 
     def remove_offline_players(self):
         """检查是否有离线玩家还在场次中，如果有则移除"""
-        for session_id, runtime in self.game_sessions.items():
-            players_to_remove = []
-
-            for player in runtime["players"]:
-                # 检查玩家是否在线
-                if player not in self.server.online_players:
-                    # 玩家离线，记录需要移除的玩家
-                    if player.name in self.player_session and self.player_session[player.name] == session_id:
-                        players_to_remove.append(player)
-
-            # 移除离线玩家
+        for session_id in self.game_sessions:
+            # 记录并移除离线玩家
+            players_to_remove = [p for p in self.members.members(session_id) if not self.is_online(p)]
             for player in players_to_remove:
-                if player in runtime["players"]:
-                    runtime["players"].remove(player)
-                if player.name in runtime["alive_players"]:
-                    runtime["alive_players"].remove(player.name)
-                if player.name in self.player_session:
-                    del self.player_session[player.name]
+                self.members.leave(player)
 
             # 如果有玩家被移除，更新bossbar和scoreboard
             if players_to_remove:
@@ -367,11 +404,12 @@ class EasyLuckyPillarPlugin(Plugin):
         """检查是否有场次的所有玩家都在准备区域内，如果是，则播放胜利音效"""
         for sid, runtime in self.game_sessions.items():
             # 只检查空闲状态、等待状态和准备就绪状态的场次
-            if runtime["state"] not in [GameState.IDLE, GameState.WAITING, GameState.READY]:
+            if not runtime.in_lobby:
                 continue
 
             # 检查是否有玩家在该场次中
-            if not runtime["players"]:
+            members = self.members.members(sid)
+            if not members:
                 continue
 
             # 检查所有玩家是否都在准备区域内
@@ -379,12 +417,11 @@ class EasyLuckyPillarPlugin(Plugin):
             online_players = 0
             players_to_remove = []
 
-            for player in runtime["players"]:
+            for player in members:
                 # 检查玩家是否在线
-                if player not in self.server.online_players:
+                if not self.is_online(player):
                     # 玩家离线，记录需要移除的玩家
-                    if player.name in self.player_session and self.player_session[player.name] == sid:
-                        players_to_remove.append(player)
+                    players_to_remove.append(player)
                     continue
 
                 online_players += 1
@@ -394,53 +431,38 @@ class EasyLuckyPillarPlugin(Plugin):
 
             # 移除离线玩家
             for player in players_to_remove:
-                if player in runtime["players"]:
-                    runtime["players"].remove(player)
-                if player.name in runtime["alive_players"]:
-                    runtime["alive_players"].remove(player.name)
-                if player.name in self.player_session:
-                    del self.player_session[player.name]
+                self.members.leave(player)
 
             # 如果所有玩家都在准备区域内，播放胜利音效
             if all_in_wait_area and online_players > 0:
                 # 检查是否已经播放过音效，避免重复播放
-                if "_victory_sound_played" not in runtime:
-                    runtime["_victory_sound_played"] = False
-
-                if not runtime["_victory_sound_played"] and runtime["state"] not in [GameState.IDLE, GameState.WAITING, GameState.READY]:
-                    for player in runtime["players"]:
-                        # 在玩家位置播放胜利音效
-                        loc = player.location
-                        self.server.dispatch_command(self.server.command_sender, f"playsound mob.enderdragon.death \"{player.name}\" {loc.x} {loc.y} {loc.z} 10")
+                if not runtime.victory_sound_played and not runtime.in_lobby:
+                    # 在每个玩家的位置播放胜利音效
+                    sounds = self.session_configs[sid].sounds
+                    if sounds.enabled:
+                        self.command_batch.for_tag(
+                            member_tag(sid),
+                            f"execute as {{target}} at @s run playsound {sounds.victory_sound} @s ~ ~ ~ {sounds.victory_volume} {sounds.victory_pitch}"
+                        )
+                    for player in self.members.members(sid):
                         player.send_message("§a所有玩家已回到准备区域，准备开始下一局游戏！")
-                    runtime["_victory_sound_played"] = True
+                    runtime.victory_sound_played = True
             else:
                 # 如果有玩家不在准备区域内，重置音效播放标志
-                if "_victory_sound_played" in runtime:
-                    runtime["_victory_sound_played"] = False
+                runtime.victory_sound_played = False
 
     def init_session_runtime(self, session_id):
         if session_id not in self.game_sessions:
-            # 从配置文件中读取边界相关的参数
-            session_data = self.plugin_config.get("sessions", {}).get(session_id, {})
-            border_config = session_data.get("border", {})
-
-            self.game_sessions[session_id] = {
-                "players": [],
-                "state": GameState.IDLE,
-                "bossbar": None,
-                "scoreboard": None,
-                "tasks": [],
-                "countdown": 0,
-                "game_time": 0,
-                "alive_players": [],
-                "border_radius": border_config.get("initial_radius", 20),  # 初始边界半径
-                "min_border_radius": border_config.get("min_radius", 4),  # 最小边界半径
-                "border_shrink_interval": border_config.get("shrink_interval", 300),  # 边界缩小间隔（秒）
-                "border_shrink_amount": border_config.get("shrink_amount", 4),  # 每次缩小的格数
-                "border_damage_per_second": border_config.get("damage_per_second", 5),  # 每秒扣血量
-                "last_shrink_time": 0  # 上次缩小边界的时间
-            }
+            self.game_sessions[session_id] = SessionRuntime(session_id)
+            self.apply_border_config(session_id)
+
+    def apply_border_config(self, session_id):
+        """把场次的边界配置复制到运行时数据（场次空闲时调用）"""
+        runtime = self.game_sessions.get(session_id)
+        config = self.session_configs.get(session_id)
+        if runtime is None or config is None:
+            return
+        runtime.apply_border(config.border)
 
     def load_config(self):
         if plugin_config_path.exists():
@@ -448,16 +470,215 @@ class EasyLuckyPillarPlugin(Plugin):
                 with open(plugin_config_path, "r", encoding="utf-8") as f:
                     self.plugin_config = json.load(f)
                 # 再次确保 sessions 键存在
-                if "sessions" not in self.plugin_config:
+                if not isinstance(self.plugin_config.get("sessions"), dict):
                     self.plugin_config["sessions"] = {}
-                # 加载物品池
-                if "item_pool" in self.plugin_config:
-                    self.weighted_item_pool = self.plugin_config["item_pool"]
+                # 加载物品池，配置中没有时使用默认物品池
+                self.weighted_item_pool = self.plugin_config.get("item_pool", DEFAULT_ITEM_POOL)
             except Exception as e:
                 plugin_print(f"加载配置文件失败: {e}", "ERROR")
                 self.init_default_config()
         else:
             self.init_default_config()
+        self.configure_logging()
+        self.compile_sessions()
+        self.particle_budget.configure(self.plugin_config.get("particle_budget", {}))
+        self.compile_item_pool()
+        self.item_distributor.configure(self.plugin_config.get("item_distribution", {}))
+
+    def configure_logging(self):
+        """按配置设置日志级别与日志文件的轮转参数，低于该级别的日志不会输出到控制台和日志文件"""
+        try:
+            file_handler.configure(self.plugin_config.get("log_storage", {}))
+        except (TypeError, ValueError) as e:
+            plugin_print(f"log_storage: 配置无效，已使用默认值: {e}", "WARNING")
+            file_handler.configure({})
+        level = self.plugin_config.get("log_level", "INFO")
+        if not log_pipeline.set_level(level):
+            log_pipeline.set_level("INFO")
+            plugin_print(f"log_level: 无效的日志级别 {level!r}，已使用 INFO", "WARNING")
+
+    def reload_config(self) -> bool:
+        """重新读取配置文件并增量应用，返回是否成功"""
+        try:
+            with open(plugin_config_path, "r", encoding="utf-8") as f:
+                new_config = json.load(f)
+        except Exception as e:
+            plugin_print(f"加载配置文件失败: {e}", "ERROR")
+            return False
+        self.apply_config(new_config)
+        return True
+
+    def poll_config_changes(self):
+        """应用监视器在后台检测并解析好的配置文件外部修改"""
+        result = self.config_watcher.poll()
+        if result is None:
+            return
+        if isinstance(result, Exception):
+            plugin_print(f"配置文件已被修改，但解析失败: {result}", "ERROR")
+            return
+        plugin_print("检测到配置文件被修改，正在重新加载", "INFO")
+        self.apply_config(result)
+
+    def is_session_active(self, session_id) -> bool:
+        """场次是否处于倒计时或游戏中"""
+        runtime = self.game_sessions.get(session_id)
+        return runtime is not None and runtime.active
+
+    def apply_config(self, new_config: dict):
+        """
+        按差异增量应用新配置
+
+        只有发生变化的场次会重新编译。正在进行游戏的场次只立即应用粒子、音效等可以安全热更新的配置段，
+        其余变化（以及删除场次）推迟到场次空闲后再应用。
+        """
+        if not isinstance(new_config, dict):
+            plugin_print("配置文件格式错误：顶层应为对象", "ERROR")
+            return
+        if not isinstance(new_config.get("sessions"), dict):
+            new_config["sessions"] = {}
+        diff = diff_config(self.plugin_config, new_config)
+
+        # 顶层配置
+        for key in diff.top_level:
+            if key in new_config:
+                self.plugin_config[key] = new_config[key]
+            else:
+                self.plugin_config.pop(key, None)
+        if "item_pool" in diff.top_level:
+            # 删除 item_pool 时恢复默认物品池，与重新启动时一致
+            self.weighted_item_pool = self.plugin_config.get("item_pool", DEFAULT_ITEM_POOL)
+            self.compile_item_pool()
+        if "log_level" in diff.top_level or "log_storage" in diff.top_level:
+            self.configure_logging()
+        if "particle_budget" in diff.top_level:
+            self.particle_budget.configure(self.plugin_config.get("particle_budget", {}))
+        if "item_distribution" in diff.top_level:
+            self.item_distributor.configure(self.plugin_config.get("item_distribution", {}))
+        if "player_actions" in diff.top_level:
+            self.actions.configure(self.plugin_config.get("player_actions", {}))
+
+        sessions = self.plugin_config.setdefault("sessions", {})
+        new_sessions = new_config["sessions"]
+        # 本次修改会覆盖之前推迟的修改，仍未应用的部分会在下面重新推迟
+        for sid in list(self.pending_session_configs):
+            if sid in new_sessions or sid in diff.removed:
+                del self.pending_session_configs[sid]
+
+        deferred = []
+        for sid in diff.added:
+            sessions[sid] = new_sessions[sid]
+            self.compile_sessions(sid)
+            self.init_session_runtime(sid)
+        for sid, sections in diff.changed.items():
+            if not self.is_session_active(sid):
+                self.apply_session_config(sid, new_sessions[sid])
+                continue
+            # 游戏进行中只应用可以热更新的配置段
+            self.apply_session_config(sid, split_live_sections(sessions.get(sid), new_sessions[sid], sections))
+            if not sections <= LIVE_SESSION_SECTIONS:
+                self.pending_session_configs[sid] = new_sessions[sid]
+                deferred.append(sid)
+        for sid in diff.removed:
+            if self.is_session_active(sid):
+                self.pending_session_configs[sid] = None
+                deferred.append(sid)
+            else:
+                self.apply_session_config(sid, None)
+
+        if diff:
+            changed = len(diff.added) + len(diff.changed) + len(diff.removed)
+            message = f"配置已重新加载，{changed} 个场次发生变化"
+            if deferred:
+                message += f"，场次 {', '.join(deferred)} 正在游戏中，部分修改将在本局结束后生效"
+            plugin_print(message, "INFO")
+
+    def apply_session_config(self, session_id, data):
+        """
+        应用单个场次的新配置并只重新编译该场次
+
+        Args:
+            session_id: 场次ID
+            data: 新的场次配置，None 表示删除场次
+        """
+        sessions = self.plugin_config.setdefault("sessions", {})
+        if data is None:
+            sessions.pop(session_id, None)
+            self.members.clear_session(session_id)
+            runtime = self.game_sessions.pop(session_id, None)
+            if runtime and runtime.bossbar:
+                runtime.bossbar.remove_all()
+            if runtime and runtime.scoreboard:
+                runtime.scoreboard.clear()
+            self.compile_sessions(session_id)
+            return
+
+        sessions[session_id] = data
+        self.compile_sessions(session_id)
+        self.init_session_runtime(session_id)
+        runtime = self.game_sessions[session_id]
+        if self.is_session_active(session_id):
+            # 粒子配置可能变化，重新计算边界粒子点
+            runtime.border_wall = None
+        else:
+            self.apply_border_config(session_id)
+
+    def apply_pending_config(self, session_id):
+        """场次空闲后应用之前推迟的配置修改"""
+        if session_id not in self.pending_session_configs:
+            return
+        data = self.pending_session_configs.pop(session_id)
+        self.apply_session_config(session_id, data)
+        plugin_print(f"场次 {session_id} 已结束，推迟的配置修改已生效", "INFO")
+
+    def compile_item_pool(self):
+        """校验物品池，构建抽样别名表与 ItemStack 原型表"""
+        if not isinstance(self.weighted_item_pool, dict):
+            plugin_print(f"item_pool: 应为对象，实际为 {type(self.weighted_item_pool).__name__}，已使用默认物品池", "WARNING")
+            self.weighted_item_pool = DEFAULT_ITEM_POOL
+        weights, prototypes, remapped, rejected = compile_item_pool(
+            self.weighted_item_pool, lambda item_type: ItemStack(item_type, 1)
+        )
+        if remapped or rejected:
+            details = []
+            if remapped:
+                details.append("已替换旧版ID: " + ", ".join(f"{old} -> {new}" for old, new in remapped))
+            if rejected:
+                details.append("已忽略无效条目: " + ", ".join(rejected))
+            plugin_print(f"物品池中存在无效物品，{'；'.join(details)}", "WARNING")
+        self.item_table = AliasTable(weights)
+        self.item_distributor.load_prototypes(prototypes)
+
+    def compile_sessions(self, session_id=None):
+        """编译场次几何数据并重建准备区域空间索引
+
+        Args:
+            session_id: 只重新编译指定场次，为 None 时编译全部场次
+        """
+        sessions = self.plugin_config.get("sessions", {})
+        errors = []
+        if session_id is None:
+            self.session_geometry = {sid: SessionGeometry(sid, data) for sid, data in sessions.items()}
+            self.session_configs = {sid: SessionConfig(sid, data, errors) for sid, data in sessions.items()}
+        elif session_id in sessions:
+            self.session_geometry[session_id] = SessionGeometry(session_id, sessions[session_id])
+            self.session_configs[session_id] = SessionConfig(session_id, sessions[session_id], errors)
+        else:
+            self.session_geometry.pop(session_id, None)
+            self.session_configs.pop(session_id, None)
+
+        # 配置中的错误只在编译时报告一次
+        if errors:
+            plugin_print(f"配置文件中有 {len(errors)} 处错误，已使用默认值：", "WARNING")
+            for error in errors:
+                plugin_print(f"  {error}", "WARNING")
+
+        # 按配置中的场次顺序重建索引
+        areas = []
+        for sid in sessions:
+            geometry = self.session_geometry.get(sid)
+            if geometry is not None and geometry.wait_area is not None:
+                areas.append((sid, geometry.wait_dimension, geometry.wait_area))
+        self.wait_area_index.rebuild(areas)
 
     def init_default_config(self):
         """初始化默认配置文件"""
@@ -512,6 +733,10 @@ class EasyLuckyPillarPlugin(Plugin):
                         "game_end_volume": 10.0,
                         "game_end_pitch": 1.0
                     },
+                    "events": {
+                        "tnt_spawn_interval": 5,
+                        "tnt_max_entities": 20
+                    },
                     "tasks": {
                         "item_interval": 100,
                         "event_interval": 1200,
@@ -544,15 +769,41 @@ class EasyLuckyPillarPlugin(Plugin):
                 "yellow_concrete": 70, "lime_concrete": 70, "pink_concrete": 70, "gray_concrete": 70,
                 "light_gray_concrete": 70, "cyan_concrete": 70, "purple_concrete": 70, "blue_concrete": 70,
                 "brown_concrete": 70, "green_concrete": 70, "red_concrete": 70, "black_concrete": 70
+            },
+            "particle_budget": {
+                "per_tick": ParticleBudget.DEFAULT_PER_TICK,
+                "lod": [list(tier) for tier in ParticleBudget.DEFAULT_LOD]
+            },
+            "item_distribution": {
+                "per_tick": ItemDistributor.DEFAULT_PER_TICK
+            },
+            "player_actions": {
+                "native_damage": False
+            },
+            "log_level": "INFO",
+            "log_storage": {
+                "max_size_mb": RotatingLogHandler.DEFAULT_MAX_BYTES // 1024 // 1024,
+                "retention_days": RotatingLogHandler.DEFAULT_RETENTION_DAYS,
+                "flush_interval": RotatingLogHandler.DEFAULT_FLUSH_INTERVAL
             }
         }
         self.save_config()
+        self.compile_sessions()
         plugin_print("已初始化默认配置文件", "SUCCESS")
 
     def save_config(self):
-        plugin_config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(plugin_config_path, "w", encoding="utf-8") as f:
-            json.dump(self.plugin_config, f, indent=4, ensure_ascii=False)
+        # 只标记配置已修改，防抖窗口结束后由调度器序列化一次并在后台原子写入，插件禁用时同步写入剩余的修改
+        config = self.plugin_config
+        if self.pending_session_configs:
+            # 推迟应用的场次修改也要写入文件，否则会被内存中正在使用的旧场次配置覆盖
+            sessions = dict(config.get("sessions", {}))
+            for sid, data in self.pending_session_configs.items():
+                if data is None:
+                    sessions.pop(sid, None)
+                else:
+                    sessions[sid] = data
+            config = {**config, "sessions": sessions}
+        self.config_writer.save(config)
 
     # --- 命令处理 ---
     def on_command(self, sender: CommandSender, command: Command, args: list[str]) -> bool:
@@ -570,8 +821,10 @@ class EasyLuckyPillarPlugin(Plugin):
         if command.name == "lpadmin":
             if not args: return False
             if args[0] == "reload":
-                self.load_config()
-                sender.send_message("§a配置已重载")
+                if self.reload_config():
+                    sender.send_message("§a配置已重载")
+                else:
+                    sender.send_message("§c配置文件读取失败，请查看控制台")
             elif args[0] == "init" and len(args) > 1:
                 self.init_default_config()
             elif args[0] == "add" and len(args) > 1:
@@ -588,9 +841,42 @@ class EasyLuckyPillarPlugin(Plugin):
                 self.start_game_process(sender, args[1])
             elif args[0] == "stop" and len(args) > 1:
                 self.stop_game(args[1], "管理员停止了游戏")
+            elif args[0] == "timings":
+                self.show_timings(sender)
+            elif args[0] == "bench":
+                self.show_action_bench(sender)
             return True
         return False
 
+    def show_timings(self, sender: CommandSender):
+        """显示统一调度器中各定时动作的耗时统计"""
+        sender.send_message(f"§e===== 幸运之柱 - 定时动作耗时 (tick {self.driver.tick}, 待执行 {self.driver.pending()}) =====")
+        sender.send_message(f"§6启动: §f导入 {import_time_ms:.1f}ms §7| §f启用 {self.enable_time_ms:.1f}ms")
+        report = self.driver.timing_report()
+        if not report:
+            sender.send_message("§7暂无数据")
+        for name, count, avg_ms, max_ms in report:
+            sender.send_message(f"§6{name}: §f{count}次 §7| §f平均 {avg_ms:.3f}ms §7| §f最大 {max_ms:.3f}ms")
+        budget = self.particle_budget
+        sender.send_message(
+            f"§6粒子: §f已发送 {budget.emitted} §7| §f预算抽稀 {budget.thinned} §7| §f超出预算截断 {budget.dropped}"
+            f" §7| §f每tick预算 {budget.per_tick}"
+        )
+
+    def show_action_bench(self, sender: CommandSender):
+        """测量玩家动作通过原生接口与命令执行的单次耗时"""
+        if not isinstance(sender, Player):
+            sender.send_message("§c该命令只能由玩家执行！")
+            return
+        actions = self.actions
+        sender.send_message(
+            f"§e===== 幸运之柱 - 动作耗时 (原生接口: 清空背包 {actions.native_clear}"
+            f" | 扣血 {actions.native_health} | 音效 {actions.native_sound}) ====="
+        )
+        for name, native_us, command_us in actions.benchmark(sender):
+            native_text = f"{native_us:.1f}μs" if native_us is not None else "不支持"
+            sender.send_message(f"§6{name}: §f原生 {native_text} §7| §f命令 {command_us:.1f}μs")
+
     # --- 菜单系统 ---
     def show_player_menu(self, sender: CommandSender):
         if not isinstance(sender, Player): return
@@ -601,14 +887,14 @@ class EasyLuckyPillarPlugin(Plugin):
             form.content = "§c当前没有可用的场次。"
         else:
             for sid, data in sessions.items():
-                runtime = self.game_sessions.get(sid, {"state": GameState.IDLE, "players": []})
+                runtime = self.game_sessions.get(sid)
                 state_text = {
                     GameState.IDLE: "§7空闲", GameState.WAITING: "§a等待中",
                     GameState.READY: "§b准备就绪", GameState.COUNTDOWN: "§e倒计时", 
                     GameState.RUNNING: "§c进行中", GameState.ENDED: "§8已结束"
-                }.get(runtime["state"], "§7未知")
+                }.get(runtime.state if runtime else GameState.IDLE, "§7未知")
                 
-                btn_text = f"{data['name']}\n{state_text} §r| §b{len(runtime['players'])}人"
+                btn_text = f"{data['name']}\n{state_text} §r| §b{self.members.member_count(sid)}人"
                 form.add_button(btn_text, on_click=lambda p, s=sid: self.teleport_to_center(p, s))
         
         sender.send_form(form)
@@ -623,18 +909,18 @@ class EasyLuckyPillarPlugin(Plugin):
 
         sender.send_message("§e===== 幸运之柱 - 场次列表 =====")
         for sid, data in sessions.items():
-            runtime = self.game_sessions.get(sid, {"state": GameState.IDLE, "players": []})
+            runtime = self.game_sessions.get(sid)
             state_text = {
                 GameState.IDLE: "§7空闲", GameState.WAITING: "§a等待中",
                 GameState.READY: "§b准备就绪", GameState.COUNTDOWN: "§e倒计时",
                 GameState.RUNNING: "§c进行中", GameState.ENDED: "§8已结束"
-            }.get(runtime["state"], "§7未知")
+            }.get(runtime.state if runtime else GameState.IDLE, "§7未知")
 
             center = data.get("center_pos", {"x": 0, "y": 100, "z": 0})
             wait_area = data.get("wait_area", None)
 
             sender.send_message(f"§6场次 {sid}: §f{data['name']}")
-            sender.send_message(f"  状态: {state_text} §r| §b{len(runtime['players'])}人")
+            sender.send_message(f"  状态: {state_text} §r| §b{self.members.member_count(sid)}人")
             sender.send_message(f"  中心位置: §e({center['x']}, {center['y']}, {center['z']})")
             if wait_area:
                 pos1 = wait_area.get("pos1", {"x": 0, "y": 100, "z": 0})
@@ -651,48 +937,24 @@ class EasyLuckyPillarPlugin(Plugin):
             player.send_message("§c场次不存在！")
             return
 
-        session_data = self.plugin_config["sessions"][session_id]
-        center = session_data.get("center_pos", {"x": 0, "y": 100, "z": 0})
-
-        player.teleport(Location(player.dimension, center["x"] - 0.5, center["y"] + 1, center["z"] + 0.5))
+        geometry = self.session_geometry[session_id]
+        player.teleport(geometry.center_location(player.dimension))
         player.send_message(f"§a已传送到场次 {session_id} 的中心位置！")
 
     def is_player_in_wait_area(self, player: Player, session_id: str) -> bool:
         """检查玩家是否在指定场次的准备区域内"""
-        if session_id not in self.plugin_config.get("sessions", {}):
-            return False
-
-        session_data = self.plugin_config["sessions"][session_id]
-        wait_area = session_data.get("wait_area", None)
-        if not wait_area:
+        geometry = self.session_geometry.get(session_id)
+        if geometry is None or geometry.wait_area is None:
             return False
 
-        pos1 = wait_area.get("pos1", {"x": 0, "y": 100, "z": 0})
-        pos2 = wait_area.get("pos2", {"x": 0, "y": 100, "z": 0})
-
-        # 获取准备区域的边界
-        min_x = min(pos1["x"], pos2["x"])
-        max_x = max(pos1["x"], pos2["x"])
-        min_y = min(pos1["y"], pos2["y"])
-        max_y = max(pos1["y"], pos2["y"])
-        min_z = min(pos1["z"], pos2["z"])
-        max_z = max(pos1["z"], pos2["z"])
-
-        # 检查玩家位置是否在准备区域内
-        player_x = player.location.x
-        player_y = player.location.y
-        player_z = player.location.z
-        in_area = (min_x <= player_x <= max_x and
-                min_y <= player_y <= max_y and
-                min_z <= player_z <= max_z)
-
-        return in_area
+        x, y, z, dimension = self.positions.get(player)
+        return geometry.contains_wait_area(dimension, x, y, z)
 
     # --- 游戏逻辑 ---
     def join_game(self, player: Player, session_id: str):
-        if player.name in self.player_session:
+        current_session = self.members.session_of(player)
+        if current_session is not None:
             # 玩家已经在游戏中，检查是否还在准备区域内
-            current_session = self.player_session[player.name]
             if current_session == session_id:
                 # 还在同一个场次，不需要做任何操作
                 return
@@ -703,43 +965,34 @@ class EasyLuckyPillarPlugin(Plugin):
         if session_id not in self.plugin_config.get("sessions", {}):
             return
 
-        session_data = self.plugin_config["sessions"][session_id]
+        config = self.session_configs[session_id]
         self.init_session_runtime(session_id)
         runtime = self.game_sessions[session_id]
 
-        if runtime["state"] not in [GameState.IDLE, GameState.WAITING, GameState.READY]:
+        if not runtime.in_lobby:
             return
 
-        runtime["players"].append(player)
-        self.player_session[player.name] = session_id
-        player.send_message(f"§a你已进入场次 {session_data['name']} 的准备区域！")
+        self.members.join(player, session_id)
+        player.send_message(f"§a你已进入场次 {config.name} 的准备区域！")
         
         self.update_bossbar(session_id)
         self.update_scoreboard(session_id)
 
     def leave_game(self, player: Player, silent=False):
-        if player.name not in self.player_session:
+        session_id = self.members.leave(player)
+        if session_id is None:
             if not silent:
                 player.send_message("§c你不在任何场次中！")
             return
-        
-        session_id = self.player_session[player.name]
+
         runtime = self.game_sessions[session_id]
-        
-        if player in runtime["players"]:
-            runtime["players"].remove(player)
-        
-        if player.name in runtime["alive_players"]:
-            runtime["alive_players"].remove(player.name)
-        
-        if runtime["bossbar"]:
-            runtime["bossbar"].remove_player(player)
-            
-        del self.player_session[player.name]
+        if runtime.bossbar:
+            runtime.bossbar.remove_viewer(player)
+
         if not silent:
             player.send_message("§e你离开了游戏。")
         
-        if runtime["state"] == GameState.RUNNING:
+        if runtime.state == GameState.RUNNING:
             self.check_winner(session_id)
         else:
             self.update_bossbar(session_id)
@@ -747,233 +1000,149 @@ class EasyLuckyPillarPlugin(Plugin):
 
     def update_bossbar(self, session_id):
         runtime = self.game_sessions[session_id]
-        session_data = self.plugin_config.get("sessions", {}).get(session_id, {})
-        if not session_data: return
+        config = self.session_configs.get(session_id)
+        if config is None: return
         
-        min_players = session_data.get("min_players", 2)
-        pillars = session_data.get("pillars", {})
-        max_players = len(pillars)
+        min_players = config.min_players
+        max_players = config.max_players
         # 只计算在线玩家
-        current_players = len([p for p in runtime["players"] if p in self.server.online_players])
+        current_players = len([p for p in self.members.members(session_id) if self.is_online(p)])
         
-        if not runtime["bossbar"]:
-            runtime["bossbar"] = self.server.create_boss_bar(
+        if not runtime.bossbar:
+            runtime.bossbar = BossBarView(self.server.create_boss_bar(
                 "幸运之柱", BarColor.YELLOW, BarStyle.SOLID
-            )
+            ))
+        bossbar = runtime.bossbar
         
-        if runtime["state"] == GameState.RUNNING:
-            m, s = divmod(runtime["game_time"], 60)
-            runtime["bossbar"].title = f"§c游戏进行中 §f| §e时间: {m:02d}:{s:02d} §f| §e存活: {len(runtime['alive_players'])}/{max_players}"
-            runtime["bossbar"].color = BarColor.RED
-            runtime["bossbar"].progress = 1.0
-        elif runtime["state"] == GameState.COUNTDOWN:
+        if runtime.state == GameState.RUNNING:
+            m, s = divmod(runtime.game_time, 60)
+            bossbar.set(f"§c游戏进行中 §f| §e时间: {m:02d}:{s:02d} §f| §e存活: {self.members.alive_count(session_id)}/{max_players}", BarColor.RED, 1.0)
+        elif runtime.state == GameState.COUNTDOWN:
             # 倒计时状态，进度条从少到多
-            countdown = runtime.get("countdown", 10)
+            countdown = runtime.countdown
             # 进度条从 0（倒计时开始）到 1（倒计时结束）
             progress = 1.0 - (countdown / 10.0)
             # 确保进度在 0-1 之间
             progress = max(0.0, min(1.0, progress))
-            runtime["bossbar"].title = f"§e游戏即将开始 §f| §e倒计时: §c{countdown} §e秒"
-            runtime["bossbar"].color = BarColor.YELLOW
-            runtime["bossbar"].progress = progress
+            bossbar.set(f"§e游戏即将开始 §f| §e倒计时: §c{countdown} §e秒", BarColor.YELLOW, progress)
         elif current_players < min_players:
-            runtime["bossbar"].title = f"§e等待玩家: §f{current_players}/{min_players} §7(还需{min_players - current_players}人) §f| §e最大: {max_players}人"
-            runtime["bossbar"].progress = min(1.0, current_players / min_players)
-            runtime["bossbar"].color = BarColor.YELLOW
-            runtime["state"] = GameState.WAITING
+            bossbar.set(
+                f"§e等待玩家: §f{current_players}/{min_players} §7(还需{min_players - current_players}人) §f| §e最大: {max_players}人",
+                BarColor.YELLOW, min(1.0, current_players / min_players)
+            )
+            runtime.update_lobby(False)
         elif current_players == min_players:
-            runtime["bossbar"].title = f"§a可以开始游戏了 §f{current_players}/{min_players} §f| §e最少: {min_players}人 最多: {max_players}人"
-            runtime["bossbar"].progress = 1.0
-            runtime["bossbar"].color = BarColor.GREEN
-            if runtime["state"] == GameState.WAITING:
-                runtime["state"] = GameState.READY
+            bossbar.set(f"§a可以开始游戏了 §f{current_players}/{min_players} §f| §e最少: {min_players}人 最多: {max_players}人", BarColor.GREEN, 1.0)
+            runtime.update_lobby(True)
         elif current_players > min_players:
-            runtime["bossbar"].title = f"§a可以开始游戏了 §f{current_players}/{max_players} §f| §e最少: {min_players}人 最多: {max_players}人"
-            runtime["bossbar"].progress = min(1.0, current_players / max_players)
-            runtime["bossbar"].color = BarColor.WHITE
-            if runtime["state"] == GameState.WAITING:
-                runtime["state"] = GameState.READY
+            bossbar.set(
+                f"§a可以开始游戏了 §f{current_players}/{max_players} §f| §e最少: {min_players}人 最多: {max_players}人",
+                BarColor.WHITE, min(1.0, current_players / max_players)
+            )
+            runtime.update_lobby(True)
         
-        # 只为准备区域和参与游戏的玩家显示bossbar
-        # 遍历所有在线玩家，检查是否应该显示bossbar
-        all_online_players = self.server.online_players
-        for player in all_online_players:
-            # 检查玩家是否在游戏中或在准备区域内
-            if player.name in self.player_session and self.player_session[player.name] == session_id:
-                # 玩家在游戏中，显示bossbar
-                runtime["bossbar"].add_player(player)
-            elif self.is_player_in_wait_area(player, session_id):
-                # 玩家在准备区域内，显示bossbar
-                runtime["bossbar"].add_player(player)
-            else:
-                # 玩家不在准备区域内也不在游戏中，隐藏bossbar
-                runtime["bossbar"].remove_player(player)
+        # 只为准备区域和参与游戏的在线玩家显示bossbar，只有可见性发生变化的玩家才会调用服务器接口
+        wanted = {p.unique_id: p for p in self.members.members(session_id) if self.is_online(p)}
+        for uuid, player in self.wait_area_occupants.get(session_id, {}).items():
+            if uuid in self.online_players:
+                wanted[uuid] = player
+        bossbar.sync_viewers(wanted)
 
     def update_scoreboard(self, session_id):
         """更新侧边栏显示游戏信息"""
         runtime = self.game_sessions[session_id]
-        session_data = self.plugin_config.get("sessions", {}).get(session_id, {})
-        if not session_data: return
+        config = self.session_configs.get(session_id)
+        if config is None: return
 
         # 创建或获取侧边栏
-        if not runtime["scoreboard"]:
+        if not runtime.scoreboard:
             scoreboard = self.server.scoreboard
             objective_name = f"lucky_pillar_{session_id}"
 
-            # 检查 objective 是否已存在
+            # 检查 objective 是否已存在，遗留的旧 objective 中可能有渲染器不知道的行，重新创建
             existing_objective = scoreboard.get_objective(objective_name)
             if existing_objective:
-                objective = existing_objective
-            else:
-                objective = scoreboard.add_objective(
-                    name=objective_name,
-                    criteria=Criteria.DUMMY,
-                    display_name="§e§l幸运之柱"
-                )
+                existing_objective.unregister()
+            objective = scoreboard.add_objective(
+                name=objective_name,
+                criteria=Criteria.DUMMY,
+                display_name="§e§l幸运之柱"
+            )
 
             objective.set_display(DisplaySlot.SIDE_BAR)
-            runtime["scoreboard"] = objective
+            runtime.scoreboard = SidebarRenderer(objective, session_id)
 
-        objective = runtime["scoreboard"]
+        sidebar = runtime.scoreboard
+
+        # 获取游戏信息
+        max_players = config.max_players
+        min_players = config.min_players
 
-        # 清空旧的分数 - 使用更可靠的方式
         try:
-            for entry in list(objective.scoreboard.entries):
-                objective.scoreboard.reset_scores(entry)
-        except Exception as e:
-            plugin_print(f"[DEBUG] 清空分数时出错: {e}", "WARNING")
-
-        # 只为准备区域和参与游戏的玩家显示侧边栏
-        # 获取所有在线玩家
-        all_online_players = self.server.online_players
-        # 遍历所有在线玩家，检查是否应该显示侧边栏
-        for player in all_online_players:
-            # 如果玩家在准备区域内或参与游戏中，则显示侧边栏
-            if player.name in self.player_session and self.player_session[player.name] == session_id:
-                # 玩家在游戏中，确保显示侧边栏
-                continue
-            else:
-                # 玩家不在游戏中，检查是否在准备区域内
-                if self.is_player_in_wait_area(player, session_id):
-                    # 玩家在准备区域内，确保显示侧边栏
-                    continue
+            # 根据游戏状态显示不同信息，渲染器只会发送发生变化的行
+            if runtime.state == GameState.RUNNING:
+                # 游戏进行中
+                m, s = divmod(runtime.game_time, 60)
+
+                # 计算下一事件时间
+                event_period_seconds = config.tasks.event_interval / 20  # 事件间隔转换为秒
+                # 事件从游戏开始后event_interval秒开始触发
+                if runtime.game_time < event_period_seconds:
+                    time_until_event = event_period_seconds - runtime.game_time
                 else:
-                    # 玩家不在准备区域内也不在游戏中，隐藏侧边栏
-                    # 通过清空该玩家的分数来隐藏侧边栏
-                    try:
-                        # 重置该玩家在侧边栏中的所有分数
-                        for entry in list(objective.scoreboard.entries):
-                            if entry == player.name:
-                                objective.scoreboard.reset_scores(entry)
-                    except Exception as e:
-                        plugin_print(f"[DEBUG] 隐藏侧边栏时出错: {e}", "WARNING")
+                    # 计算当前周期内已经过去的时间
+                    time_in_current_period = runtime.game_time % event_period_seconds
+                    time_until_event = event_period_seconds - time_in_current_period
+
+                # 计算下一边界缩小时间
+                border_interval = runtime.border_shrink_interval  # 秒
+                time_since_last_shrink = runtime.game_time - runtime.last_shrink_time
+                time_until_shrink = border_interval - time_since_last_shrink
+
+                sidebar.render(
+                    SIDEBAR_RUNNING,
+                    m=m, s=s,
+                    alive_players=self.members.alive_count(session_id),
+                    max_players=max_players,
+                    border_radius=runtime.border_radius,
+                    next_event_name=self.get_next_event_name(runtime.game_time, session_id),
+                    event_minutes=int(time_until_event // 60),
+                    event_seconds=int(time_until_event % 60),
+                    shrink_minutes=int(time_until_shrink // 60),
+                    shrink_seconds=int(time_until_shrink % 60),
+                    next_radius=max(runtime.min_border_radius, runtime.border_radius - runtime.border_shrink_amount),
+                )
 
-        # 获取游戏信息
-        pillars = session_data.get("pillars", {})
-        max_players = len(pillars)
-        # 只计算在线玩家
-        current_players = len([p for p in runtime["players"] if p in self.server.online_players])
-        alive_players = len(runtime["alive_players"])
-
-        # 根据游戏状态显示不同信息
-        if runtime["state"] == GameState.RUNNING:
-            # 游戏进行中
-            m, s = divmod(runtime["game_time"], 60)
-
-            # 计算下一事件时间
-            tasks_config = session_data.get("tasks", {})
-            event_interval = tasks_config.get("event_interval", 1200)  # 获取事件间隔（tick）
-            event_period_seconds = event_interval / 20  # 转换为秒
-            # 事件从游戏开始后event_interval秒开始触发
-            if runtime["game_time"] < event_period_seconds:
-                time_until_event = event_period_seconds - runtime["game_time"]
-            else:
-                # 计算当前周期内已经过去的时间
-                time_in_current_period = runtime["game_time"] % event_period_seconds
-                time_until_event = event_period_seconds - time_in_current_period
-            # 转换为分秒
-            event_minutes = int(time_until_event // 60)
-            event_seconds = int(time_until_event % 60)
-
-            # 获取下一事件名称
-            next_event_name = self.get_next_event_name(runtime["game_time"], session_id)
-
-            # 计算下一边界缩小时间
-            border_interval = runtime["border_shrink_interval"]  # 秒
-            time_since_last_shrink = runtime["game_time"] - runtime["last_shrink_time"]
-            time_until_shrink = border_interval - time_since_last_shrink
-            # 转换为分秒
-            shrink_minutes = int(time_until_shrink // 60)
-            shrink_seconds = int(time_until_shrink % 60)
-
-            # 设置侧边栏内容
-            try:
-                # 获取或创建 objective
-                scoreboard = self.server.scoreboard
-                objective_name = f"lucky_pillar_{session_id}"
-
-                # 检查 objective 是否已存在
-                existing_objective = scoreboard.get_objective(objective_name)
-                if existing_objective:
-                    objective = existing_objective
+            elif runtime.state == GameState.COUNTDOWN:
+                # 倒计时状态，只计算在线玩家
+                current_players = len([p for p in self.members.members(session_id) if self.is_online(p)])
+                sidebar.render(
+                    SIDEBAR_COUNTDOWN,
+                    countdown=runtime.countdown,
+                    current_players=current_players,
+                    max_players=max_players,
+                    min_players=min_players,
+                )
+
+            elif runtime.state == GameState.WAITING or runtime.state == GameState.READY:
+                # 等待玩家状态，只计算在线玩家
+                current_players = len([p for p in self.members.members(session_id) if self.is_online(p)])
+                if current_players >= min_players:
+                    status = "§a可以开始游戏！"
                 else:
-                    objective = scoreboard.add_objective(
-                        objective_name,
-                        Criteria.DUMMY,
-                        "§e§l幸运之柱"
-                    )
-                    objective.set_display(DisplaySlot.SIDE_BAR)
-                    runtime["scoreboard"] = objective
-
-                # 清空旧的分数
-                for entry in list(objective.scoreboard.entries):
-                    objective.scoreboard.reset_scores(entry)
-
-                # 设置新的分数
-                objective.get_score("§a§l游戏信息").value = 10
-                objective.get_score(f"§e游戏时间: §f{m:02d}:{s:02d}").value = 9
-                objective.get_score(f"§e存活玩家: §f{alive_players}/{max_players}").value = 8
-                objective.get_score(f"§e当前半径: §f{runtime['border_radius']}").value = 7
-                objective.get_score("§r").value = 6
-                objective.get_score("§c§l下一事件").value = 5
-                objective.get_score(f"§f{next_event_name}").value = 4
-                objective.get_score(f"§e距离触发: §f{event_minutes:02d}:{event_seconds:02d}").value = 3
-                objective.get_score("§r ").value = 2
-                objective.get_score("§c§l边界缩小").value = 1
-                objective.get_score(f"§e距离缩小: §f{shrink_minutes:02d}:{shrink_seconds:02d}").value = 0
-                next_radius = max(runtime["min_border_radius"], runtime["border_radius"] - runtime["border_shrink_amount"])
-                objective.get_score(f"§e缩小到: §f{next_radius}").value = -1
-            except Exception as e:
-                plugin_print(f"设置分数时出错: {e}", "ERROR")
-
-        elif runtime["state"] == GameState.COUNTDOWN:
-            # 倒计时状态
-            countdown = runtime.get("countdown", 10)
-
-            # 设置倒计时状态的分数
-            objective.get_score("§a§l游戏即将开始").value = 10
-            objective.get_score("§e倒计时: §c" + f"{countdown}秒").value = 9
-            objective.get_score("").value = 8
-            objective.get_score("§e当前玩家: §f" + f"{current_players}/{max_players}").value = 7
-            objective.get_score("§e最少需要: §f" + str(session_data.get("min_players", 2)) + "人").value = 6
-            objective.get_score("").value = 5
-            objective.get_score("§e最大人数: §f" + f"{max_players}人").value = 4
-
-        elif runtime["state"] == GameState.WAITING or runtime["state"] == GameState.READY:
-            # 等待玩家状态
-            min_players = session_data.get("min_players", 2)
-
-            # 设置等待状态的分数
-            objective.get_score("§a§l等待玩家").value = 10
-            objective.get_score("§e当前玩家: §f" + f"{current_players}/{max_players}").value = 9
-            objective.get_score("§e最少需要: §f" + f"{min_players}人").value = 8
-            objective.get_score("§e最大人数: §f" + f"{max_players}人").value = 7
-            objective.get_score("").value = 6
-
-            if current_players >= min_players:
-                objective.get_score("§a可以开始游戏！").value = 5
+                    status = f"§c还需 {min_players - current_players} 人"
+                sidebar.render(
+                    SIDEBAR_WAITING,
+                    current_players=current_players,
+                    max_players=max_players,
+                    min_players=min_players,
+                    status=status,
+                )
+
             else:
-                objective.get_score("§c还需 " + str(min_players - current_players) + " 人").value = 5
+                sidebar.clear()
+        except Exception as e:
+            plugin_print(f"设置分数时出错: {e}", "ERROR")
 
     def start_game_process(self, sender: CommandSender, session_id: str):
         if session_id not in self.plugin_config.get("sessions", {}):
@@ -982,14 +1151,14 @@ class EasyLuckyPillarPlugin(Plugin):
             
         self.init_session_runtime(session_id)
         runtime = self.game_sessions[session_id]
-        session_data = self.plugin_config["sessions"][session_id]
-        min_players = session_data.get("min_players", 2)
+        min_players = self.session_configs[session_id].min_players
         
-        if len(runtime["players"]) < min_players:
-            sender.send_message(f"§c人数不足，无法开始游戏！(当前: {len(runtime['players'])}, 需要: {min_players})")
+        member_count = self.members.member_count(session_id)
+        if member_count < min_players:
+            sender.send_message(f"§c人数不足，无法开始游戏！(当前: {member_count}, 需要: {min_players})")
             return
             
-        if runtime["state"] not in [GameState.READY, GameState.WAITING]:
+        if runtime.state not in [GameState.READY, GameState.WAITING]:
             sender.send_message("§c该场次已在进行中！")
             return
 
@@ -997,184 +1166,178 @@ class EasyLuckyPillarPlugin(Plugin):
         self.server.dispatch_command(self.server.command_sender, "gamerule doimmediaterespawn true")
             
         # 先设置为等待状态，确保玩家不会被自动移出游戏
-        runtime["state"] = GameState.WAITING
-        runtime["countdown"] = 10
-        runtime["game_time"] = 0
-        runtime["alive_players"] = [p.name for p in runtime["players"]]
+        runtime.reset(self.session_configs[session_id].border)
+        runtime.begin_game()
+        self.members.revive_all(session_id)
         
         # 2. 传送玩家并立即清理背包
-        pillars = list(session_data.get("pillars", {}).values())
-        random.shuffle(pillars)
-        for i, player in enumerate(runtime["players"]):
-            if i < len(pillars):
-                pos = pillars[i]
-                player.teleport(Location(player.dimension, pos["x"] - 0.5, pos["y"] + 1, pos["z"] + 0.5))
-            
-            # 优化: 使用 /clear 清理背包
-            self.server.dispatch_command(self.server.command_sender, f"clear \"{player.name}\"")
-            
-            self.server.dispatch_command(self.server.command_sender, f"inputpermission set \"{player.name}\" movement disabled")
+        geometry = self.session_geometry[session_id]
+        order = list(range(len(geometry.pillar_targets)))
+        random.shuffle(order)
+        for i, player in enumerate(self.members.members(session_id)):
+            if i < len(order):
+                player.teleport(geometry.pillar_locations(player.dimension)[order[i]])
             player.game_mode = GameMode.SURVIVAL
+
+        # 优化: 清理背包并通过场次标签一次性禁止移动
+        tag = member_tag(session_id)
+        self.actions.clear_inventory(self.members.members(session_id), tag)
+        self.command_batch.for_tag(tag, "inputpermission set {target} movement disabled")
+        self.command_batch.flush()
             
-        task = self.server.scheduler.run_task(
-            self, lambda: self.countdown_tick(session_id), delay=0, period=20
+        task = self.driver.schedule(
+            lambda: self.countdown_tick(session_id), delay=0, period=20, session_id=session_id, name="countdown"
         )
-        runtime["tasks"].append(task)
+        runtime.add_task(task)
         sender.send_message(f"§a场次 {session_id} 已重置场地并开启传送。")
 
     def countdown_tick(self, session_id):
         runtime = self.game_sessions[session_id]
 
         # 如果当前状态是 WAITING，设置为 COUNTDOWN
-        if runtime["state"] == GameState.WAITING:
-            runtime["state"] = GameState.COUNTDOWN
+        runtime.begin_countdown()
 
         # 获取声音配置
-        session_data = self.plugin_config.get("sessions", {}).get(session_id, {})
-        sound_config = session_data.get("sounds", {})
+        sounds = self.session_configs[session_id].sounds
 
-        if runtime["countdown"] > 0:
+        if runtime.countdown > 0:
             self.update_scoreboard(session_id)
             self.update_bossbar(session_id)
-            msg = f"§e游戏将在 §c{runtime['countdown']} §e秒后开始！"
-            for p in runtime["players"]:
+            msg = f"§e游戏将在 §c{runtime.countdown} §e秒后开始！"
+            for p in self.members.members(session_id):
                 p.send_title("§l§e倒计时", msg, 0, 25, 5)
                 # 剩余 5 秒时播放经验粒子音效，音调由低到高
-                if runtime["countdown"] <= 5:
+                if runtime.countdown <= 5:
                     # 音调计算: 5秒->0.6, 4秒->0.8, 3秒->1.0, 2秒->1.2, 1秒->1.4
-                    pitch = 0.6 + (5 - runtime["countdown"]) * 0.2
+                    pitch = 0.6 + (5 - runtime.countdown) * 0.2
                     # 使用配置文件中的声音参数
-                    if sound_config.get("enabled", True):
-                        sound_name = sound_config.get("countdown_sound", "random.orb")
-                        volume = sound_config.get("countdown_volume", 10.0)
-                        p.play_sound(p.location, sound_name, volume=volume, pitch=pitch)
+                    if sounds.enabled:
+                        p.play_sound(p.location, sounds.countdown_sound, volume=sounds.countdown_volume, pitch=pitch)
 
-            runtime["countdown"] -= 1
+            runtime.countdown -= 1
         else:
             self.start_game_final(session_id)
 
     def start_game_final(self, session_id):
         runtime = self.game_sessions[session_id]
-        for task in runtime["tasks"]:
-            task.cancel()
-        runtime["tasks"] = []
+        runtime.cancel_tasks()
         
         # 获取场次配置
-        session_data = self.plugin_config.get("sessions", {}).get(session_id, {})
-        pillars = session_data.get("pillars", {})
-        max_players = len(pillars)
+        config = self.session_configs[session_id]
+        max_players = config.max_players
 
         # 获取任务间隔配置
-        tasks_config = session_data.get("tasks", {})
+        tasks_config = config.tasks
 
         # 检查玩家数量是否超过最大人数
-        if len(runtime["players"]) > max_players:
+        members = self.members.members(session_id)
+        if len(members) > max_players:
             # 随机移除多余的玩家
-            players_to_remove = len(runtime["players"]) - max_players
-            removed_players = random.sample(runtime["players"], players_to_remove)
+            players_to_remove = len(members) - max_players
+            removed_players = random.sample(members, players_to_remove)
 
             # 从玩家列表中移除
+            geometry = self.session_geometry[session_id]
             for p in removed_players:
-                runtime["players"].remove(p)
-                runtime["alive_players"].remove(p.name)
+                self.members.leave(p)
+                # 被移出的玩家在倒计时阶段被禁止了移动，需要单独恢复
+                self.command_batch.queue(f"inputpermission set \"{p.name}\" movement enabled")
                 # 传送回等待区域
-                wait_area = session_data.get("wait_area", {})
-                pos1 = wait_area.get("pos1", {"x": 0, "y": 100, "z": 0})
-                p.teleport(Location(p.dimension, pos1["x"] - 0.5, pos1["y"], pos1["z"] + 0.5))
+                wait_location = geometry.wait_location(p.dimension)
+                if wait_location is None:
+                    wait_location = Location(p.dimension, -0.5, 100, 0.5)
+                p.teleport(wait_location)
                 p.send_message("§c很遗憾，人数已满，您已被移出游戏！")
                 p.game_mode = GameMode.ADVENTURE
 
             # 通知所有玩家
-            for p in runtime["players"]:
+            for p in self.members.members(session_id):
                 p.send_message(f"§e由于人数超过最大人数（{max_players}人），已随机移除了 {players_to_remove} 名玩家！")
 
-        runtime["state"] = GameState.RUNNING
+        runtime.begin_running()
         
-        for p in runtime["players"]:
-            self.server.dispatch_command(self.server.command_sender, f"inputpermission set \"{p.name}\" movement enabled")
+        self.command_batch.for_tag(member_tag(session_id), "inputpermission set {target} movement enabled")
+        for p in self.members.members(session_id):
             p.send_title("§a游戏开始！", "§7祝你好运", 10, 40, 10)
 
-        time_task = self.server.scheduler.run_task(
-            self, lambda: self.game_timer_tick(session_id), delay=0, period=20
+        # 各定时动作交给统一调度器，仍按场次 tasks 配置的间隔执行
+        schedule = self.driver.schedule
+        time_task = schedule(
+            lambda: self.game_timer_tick(session_id), delay=0, period=20, session_id=session_id, name="timer"
         )
-        item_task = self.server.scheduler.run_task(
-            self, lambda: self.give_random_items(session_id), delay=tasks_config.get("item_interval", 100), period=tasks_config.get("item_interval", 100)
+        item_task = schedule(
+            lambda: self.give_random_items(session_id), delay=tasks_config.item_interval, period=tasks_config.item_interval,
+            session_id=session_id, name="items"
         )
-        event_task = self.server.scheduler.run_task(
-            self, lambda: self.trigger_random_event(session_id), delay=tasks_config.get("event_interval", 1200), period=tasks_config.get("event_interval", 1200)
+        event_task = schedule(
+            lambda: self.trigger_random_event(session_id), delay=tasks_config.event_interval, period=tasks_config.event_interval,
+            session_id=session_id, name="events"
         )
-        border_task = self.server.scheduler.run_task(
-            self, lambda: self.check_border_shrink(session_id), delay=tasks_config.get("border_check_interval", 20), period=tasks_config.get("border_check_interval", 20)
+        border_task = schedule(
+            lambda: self.check_border_shrink(session_id), delay=tasks_config.border_check_interval, period=tasks_config.border_check_interval,
+            session_id=session_id, name="border"
         )
         
         self.show_border_particles(session_id)
         
-        particle_task = self.server.scheduler.run_task(
-            self, lambda: self.show_border_particles(session_id), delay=100, period=tasks_config.get("particle_interval", 20)
+        particle_task = schedule(
+            lambda: self.show_border_particles(session_id), delay=100, period=tasks_config.particle_interval,
+            session_id=session_id, name="particles"
         )
         # 独立的侧边栏更新任务
-        scoreboard_task = self.server.scheduler.run_task(
-            self, lambda: self.scoreboard_update_tick(session_id), delay=0, period=tasks_config.get("scoreboard_update_interval", 20)
+        scoreboard_task = schedule(
+            lambda: self.scoreboard_update_tick(session_id), delay=0, period=tasks_config.scoreboard_update_interval,
+            session_id=session_id, name="scoreboard"
         )
 
-        runtime["tasks"].extend([time_task, item_task, event_task, border_task, scoreboard_task, particle_task])
+        runtime.tasks.extend([time_task, item_task, event_task, border_task, scoreboard_task, particle_task])
         self.update_bossbar(session_id)
         self.update_scoreboard(session_id)
 
     def game_timer_tick(self, session_id):
         runtime = self.game_sessions[session_id]
-        if runtime["state"] == GameState.RUNNING:
-            runtime["game_time"] += 1
+        if runtime.state == GameState.RUNNING:
+            runtime.game_time += 1
             self.update_bossbar(session_id)
 
     def scoreboard_update_tick(self, session_id):
         """独立的侧边栏更新函数"""
         runtime = self.game_sessions[session_id]
-        if runtime["state"] == GameState.RUNNING:
+        if runtime.state == GameState.RUNNING:
             self.update_scoreboard(session_id)
 
     def get_weighted_random_item(self):
-        items = list(self.weighted_item_pool.keys())
-        weights = list(self.weighted_item_pool.values())
-        return random.choices(items, weights=weights, k=1)[0]
+        # 别名表在加载配置时构建，抽样为 O(1)
+        return self.item_table.choice()
 
     def give_random_items(self, session_id):
         runtime = self.game_sessions[session_id]
-        if runtime["state"] != GameState.RUNNING: return
-        for p in runtime["players"]:
-            # 检查玩家是否在线
-            if p not in self.server.online_players:
-                continue
+        if runtime.state != GameState.RUNNING: return
+        players = [p for p in self.members.alive(session_id) if self.is_online(p)]
+        if not players:
+            return
 
-            if p.name in runtime["alive_players"]:
-                item_type = self.get_weighted_random_item()
-                # 优化: 使用 inventory API 发放物品
-                try:
-                    item_stack = ItemStack(item_type, 1)
-                    p.inventory.add_item(item_stack)
-                    p.send_tip(f"§a获得随机物品: §f{item_type}")
-                except Exception as e:
-                    plugin_print(f"无法发放物品 {item_type}: {e}", "ERROR")
+        # 一次性为全部玩家抽好物品，在本次发放间隔内分摊写入背包
+        items = self.item_table.sample(len(players))
+        interval = self.session_configs[session_id].tasks.item_interval
+        self.item_distributor.enqueue(session_id, zip(players, items), interval)
+
+    def can_receive_item(self, player: Player, session_id: str) -> bool:
+        """排队中的物品真正发放时，玩家仍需在线并在该场次的游戏中存活"""
+        runtime = self.game_sessions.get(session_id)
+        return (
+            runtime is not None and runtime.state == GameState.RUNNING
+            and self.is_online(player) and self.members.is_alive(player)
+            and self.members.session_of(player) == session_id
+        )
 
     def get_next_event_name(self, game_time, session_id=None):
         """根据游戏时间获取下一事件的名称"""
-        events = ["darkness", "tnt", "ghast", "lightning", "blindness", "slowness", "levitation"]
-        event_names = {
-            "darkness": "黑暗降临",
-            "tnt": "TNT雨",
-            "ghast": "恶魂袭击",
-            "lightning": "雷击警告",
-            "blindness": "视野受阻",
-            "slowness": "行动迟缓",
-            "levitation": "漂浮之力"
-        }
-
         # 获取事件间隔
         event_interval = 1200  # 默认1200 tick（60秒）
-        if session_id and session_id in self.game_sessions:
-            session_data = self.plugin_config.get("sessions", {}).get(session_id, {})
-            tasks_config = session_data.get("tasks", {})
-            event_interval = tasks_config.get("event_interval", 1200)
+        config = self.session_configs.get(session_id)
+        if config is not None:
+            event_interval = config.tasks.event_interval
 
         event_period_seconds = event_interval / 20  # 转换为秒
 
@@ -1193,206 +1356,180 @@ class EasyLuckyPillarPlugin(Plugin):
             current_event_cycle = event_cycle + 1
 
         # 使用哈希函数生成确定性的随机选择
-        # 为了增加随机性，使用多个哈希值组合
-        hash_value = hash((current_event_cycle, 123456789))
-        event_index = abs(hash_value) % len(events)
-        event = events[event_index]
+        event = self.events.pick(current_event_cycle)
+        return event.display_name or event.name or "未知事件"
 
-        return event_names.get(event, "未知事件")
+    def start_tnt_rain(self, session_id):
+        """开始一场 TNT 雨：整个场次只使用一个发射任务，按配置的频率生成 TNT"""
+        runtime = self.game_sessions[session_id]
+        events_config = self.session_configs[session_id].events
+        spawn_interval = events_config.tnt_spawn_interval  # 生成间隔（tick）
+        max_entities = events_config.tnt_max_entities  # 场上最多同时存在的 TNT 数
+
+        # 上一场 TNT 雨尚未结束时直接替换
+        if runtime.tnt_emitter:
+            runtime.remove_task(runtime.tnt_emitter)
+
+        # 随机持续时间 3-5 秒
+        remaining = random.randint(3, 5) * 20 // spawn_interval
+
+        def emit():
+            nonlocal remaining
+            if remaining <= 0 or runtime.state != GameState.RUNNING:
+                # 结束后从任务列表中移除，避免列表在整局游戏中不断增长
+                runtime.remove_task(emitter)
+                if runtime.tnt_emitter is emitter:
+                    runtime.tnt_emitter = None
+                return
+            remaining -= 1
+            self.spawn_tnt_in_border(session_id, max_entities)
+
+        emitter = self.driver.schedule(emit, delay=0, period=spawn_interval, session_id=session_id, name="tnt")
+        runtime.tnt_emitter = emitter
+        runtime.add_task(emitter)
 
-    def spawn_tnt_in_border(self, session_id, center_pos, border_radius):
+    def spawn_tnt_in_border(self, session_id, max_entities):
         """在边界内随机位置生成TNT"""
         runtime = self.game_sessions[session_id]
-        if runtime["state"] != GameState.RUNNING: return
+        if runtime.state != GameState.RUNNING: return
+
+        # 场上 TNT 数量达到上限时跳过本次生成
+        spawn_ticks = runtime.tnt_spawn_ticks
+        while spawn_ticks and spawn_ticks[0] <= self.driver.tick - TNT_FUSE_TICKS:
+            spawn_ticks.popleft()
+        if len(spawn_ticks) >= max_entities:
+            return
 
         # 随机选择一个玩家作为基准
-        alive_players = [p for p in runtime["players"] if p in self.server.online_players and p.name in runtime["alive_players"]]
+        alive_players = [p for p in self.members.alive(session_id) if self.is_online(p)]
         if not alive_players:
             return
 
         target_player = random.choice(alive_players)
 
         # 在边界内随机位置生成TNT
-        x_min = center_pos["x"] - border_radius
-        x_max = center_pos["x"] + border_radius
-        z_min = center_pos["z"] - border_radius
-        z_max = center_pos["z"] + border_radius
+        geometry = self.session_geometry[session_id]
+        border_radius = runtime.border_radius
+        x_min = geometry.center_x - border_radius
+        x_max = geometry.center_x + border_radius
+        z_min = geometry.center_z - border_radius
+        z_max = geometry.center_z + border_radius
 
         # 随机生成TNT位置
         tnt_x = random.uniform(x_min, x_max)
-        tnt_y = target_player.location.y + random.randint(10, 20)  # 玩家上方10-20格
+        tnt_y = self.positions.get(target_player)[1] + random.randint(10, 20)  # 玩家上方10-20格
         tnt_z = random.uniform(z_min, z_max)
 
         # 生成TNT
         self.server.dispatch_command(self.server.command_sender, f"summon tnt {tnt_x} {tnt_y} {tnt_z}")
+        spawn_ticks.append(self.driver.tick)
 
     def trigger_random_event(self, session_id):
         runtime = self.game_sessions[session_id]
-        if runtime["state"] != GameState.RUNNING: return
-        events = ["darkness", "tnt", "ghast", "lightning", "blindness", "slowness", "levitation"]
-        
+        if runtime.state != GameState.RUNNING: return
+
         # 获取事件间隔
-        session_data = self.plugin_config.get("sessions", {}).get(session_id, {})
-        tasks_config = session_data.get("tasks", {})
-        event_interval = tasks_config.get("event_interval", 1200)
-        event_period_seconds = event_interval / 20  # 转换为秒
+        event_period_seconds = self.session_configs[session_id].tasks.event_interval / 20  # 转换为秒
 
         # 使用游戏时间作为随机种子，确保触发的事件与显示的事件名称一致
-        event_cycle = int(runtime["game_time"] / event_period_seconds)
-        # 为了增加随机性，使用多个哈希值组合
-        hash_value = hash((event_cycle, 123456789))
-        event_index = abs(hash_value) % len(events)
-        event = events[event_index]
-        for p in runtime["players"]:
-            # 检查玩家是否在线
-            if p not in self.server.online_players:
-                continue
+        event_cycle = int(runtime.game_time / event_period_seconds)
+        event = self.events.pick(event_cycle)
 
-            if p.name in runtime["alive_players"]:
-                if event == "darkness":
-                    self.server.dispatch_command(self.server.command_sender, f"effect \"{p.name}\" darkness 10 1 true")
-                    p.send_message("§8[事件] §7黑暗降临...")
-                elif event == "tnt":
-                    # 获取边界和中心点信息
-                    session_data = self.plugin_config.get("sessions", {}).get(session_id, {})
-                    center_pos = session_data.get("center_pos", {"x": 0, "y": 100, "z": 0})
-                    border_radius = runtime["border_radius"]
-
-                    # 随机持续时间 3-5 秒
-                    duration = random.randint(3, 5)
-
-                    # 发送消息
-                    p.send_message("§4[事件] §cTNT雨来袭！")
-
-                    # 在边界内平面随机生成TNT，持续几秒
-                    # 使用调度器延迟执行，避免阻塞主线程
-                    for i in range(duration * 4):  # 每0.25秒生成一次
-                        self.server.scheduler.run_task(
-                            self, 
-                            lambda: self.spawn_tnt_in_border(session_id, center_pos, border_radius),
-                            delay=i * 5  # 5 tick = 0.25秒
-                        )
-                elif event == "ghast":
-                    # 获取所有存活的玩家
-                    alive_players = [p for p in runtime["players"] if p in self.server.online_players and p.name in runtime["alive_players"]]
-
-                    if alive_players:
-                        # 计算所有存活玩家的中心点
-                        center_x = sum(p.location.x for p in alive_players) / len(alive_players)
-                        center_y = sum(p.location.y for p in alive_players) / len(alive_players)
-                        center_z = sum(p.location.z for p in alive_players) / len(alive_players)
-
-                        # 在玩家中心点上方生成恶魂
-                        ghast_count = min(len(alive_players), 5)  # 最多生成5只恶魂
-                        for i in range(ghast_count):
-                            # 在中心点周围随机偏移
-                            offset_x = random.uniform(-5, 5)
-                            offset_z = random.uniform(-5, 5)
-                            spawn_x = center_x + offset_x
-                            spawn_y = center_y + 10 + i * 3  # 每只恶魂高度相差3格
-                            spawn_z = center_z + offset_z
-                            self.server.dispatch_command(self.server.command_sender, f"summon ghast {spawn_x} {spawn_y} {spawn_z}")
-                    p.send_message("§d[事件] §5恶魂来袭！")
-                elif event == "lightning":
-                    loc = p.location
-                    self.server.dispatch_command(self.server.command_sender, f"summon lightning_bolt {loc.x} {loc.y} {loc.z}")
-                    p.send_message("§e[事件] §6雷击警告！")
-                elif event == "blindness":
-                    self.server.dispatch_command(self.server.command_sender, f"effect \"{p.name}\" blindness 10 1 true")
-                    p.send_message("§8[事件] §7视野受阻...")
-                elif event == "slowness":
-                    self.server.dispatch_command(self.server.command_sender, f"effect \"{p.name}\" slowness 10 2 true")
-                    p.send_message("§7[事件] §8行动迟缓...")
-                elif event == "levitation":
-                    self.server.dispatch_command(self.server.command_sender, f"effect \"{p.name}\" levitation 5 1 true")
-                    p.send_message("§b[事件] §3漂浮之力！")
+        # 场次级效果只执行一次，玩家级效果对所有存活在线玩家批量执行
+        players = [p for p in self.members.alive(session_id) if self.is_online(p)]
+        self.events.trigger(event, EventContext(self, session_id, runtime, players))
 
     def check_winner(self, session_id):
         runtime = self.game_sessions[session_id]
-        if runtime["state"] != GameState.RUNNING: return
+        if runtime.state != GameState.RUNNING: return
 
         # 添加额外检查，防止在游戏已经结束后再次调用
-        if session_id not in self.game_sessions or self.game_sessions[session_id]["state"] != GameState.RUNNING:
+        if session_id not in self.game_sessions or not self.game_sessions[session_id].running:
             return
 
-        alive_count = len(runtime["alive_players"])
+        alive_count = self.members.alive_count(session_id)
         if alive_count == 0:
             self.stop_game(session_id, "§c无人生还")
         elif alive_count == 1:
-            winner_name = runtime["alive_players"][0]
+            winner_name = self.members.alive(session_id)[0].name
             self.stop_game(session_id, f"§6游戏结束！胜利者是: §l{winner_name}")
 
     def stop_game(self, session_id, message):
         if session_id not in self.game_sessions: return
         runtime = self.game_sessions[session_id]
-        session_data = self.plugin_config.get("sessions", {}).get(session_id, {})
-        if not session_data: return
-        
-        center = session_data.get("center_pos", {"x": 0, "y": 100, "z": 0})
-        
-        for p in runtime["players"]:
-            # 检查玩家是否在线
-            if p not in self.server.online_players:
-                continue
+        geometry = self.session_geometry.get(session_id)
+        if geometry is None: return
 
+        players = [p for p in self.members.members(session_id) if self.is_online(p)]
+        for p in players:
             p.send_title("§6游戏结束", message, 10, 60, 10)
             p.game_mode = GameMode.ADVENTURE
-            self.server.dispatch_command(self.server.command_sender, f"inputpermission set \"{p.name}\" movement enabled")
-            
-            # 优化: 使用 /clear 结束后清理背包
-            self.server.dispatch_command(self.server.command_sender, f"clear \"{p.name}\"")
-            
-            p.teleport(Location(p.dimension, center["x"] - 0.5, center["y"] + 1, center["z"] + 0.5))
-            # 优化: 在玩家位置播放胜利音效，并增加音量
-            loc = p.location
-            self.server.dispatch_command(self.server.command_sender, f"playsound mob.wither.death \"{p.name}\" {loc.x} {loc.y} {loc.z} 10")
-            if p.name in self.player_session:
-                del self.player_session[p.name]
-                
+            p.teleport(geometry.center_location(p.dimension))
+
+        # 优化: 恢复移动、清理背包，并在中心点（玩家刚传送到的位置）播放胜利音效
+        tag = member_tag(session_id)
+        x, y, z = geometry.center_target
+        self.command_batch.for_tag(tag, "inputpermission set {target} movement enabled")
+        self.actions.clear_inventory(players, tag)
+        sounds = self.session_configs[session_id].sounds
+        if sounds.enabled:
+            self.actions.play_sound(players, sounds.game_end_sound, x, y, z,
+                                    volume=sounds.game_end_volume, pitch=sounds.game_end_pitch, tag=tag)
+        # 标签在清空场次成员时会被移除，因此必须先执行
+        self.command_batch.flush()
+        self.members.clear_session(session_id)
+
         # 清理恶魂
         self.server.dispatch_command(self.server.command_sender, f"kill @e[type=ghast]")
 
-        if runtime["bossbar"]:
-            runtime["bossbar"].remove_all()
-            runtime["bossbar"] = None
-        for task in runtime["tasks"]:
-            task.cancel()
-        runtime["players"] = []
-        runtime["alive_players"] = []
-        runtime["state"] = GameState.IDLE
-        runtime["tasks"] = []
-        runtime["game_time"] = 0
+        if runtime.bossbar:
+            runtime.bossbar.remove_all()
+            runtime.bossbar = None
+        self.driver.cancel_session(session_id)
+        self.item_distributor.cancel_session(session_id)
+        # 计时、TNT 与边界半径一并恢复，下一局从初始边界开始
+        runtime.reset(self.session_configs[session_id].border)
         plugin_print(f"场次 {session_id} 游戏已停止: {message}")
+        self.apply_pending_config(session_id)
 
     # --- 事件监听 ---
     @event_handler
     def on_player_death(self, event: PlayerDeathEvent):
         player = event.player
-        if player.name in self.player_session:
-            session_id = self.player_session[player.name]
+        session_id = self.members.session_of(player)
+        if session_id is not None:
             runtime = self.game_sessions[session_id]
-            if runtime["state"] == GameState.RUNNING:
-                if player.name in runtime["alive_players"]:
-                    runtime["alive_players"].remove(player.name)
-                self.server.scheduler.run_task(self, lambda: self.handle_death_post(player, session_id), delay=1)
+            if runtime.state == GameState.RUNNING:
+                self.members.eliminate(player)
+                self.driver.schedule(lambda: self.handle_death_post(player, session_id), delay=1, session_id=session_id, name="death")
 
     def handle_death_post(self, player: Player, session_id: str):
         # 检查玩家是否在线
-        if player not in self.server.online_players:
+        if not self.is_online(player):
             return
 
         runtime = self.game_sessions[session_id]
-        if runtime["state"] != GameState.RUNNING: return
-        if len(runtime["alive_players"]) <= 1:
+        if runtime.state != GameState.RUNNING: return
+        if self.members.alive_count(session_id) <= 1:
             self.check_winner(session_id)
         else:
             player.game_mode = GameMode.SPECTATOR
             player.send_message("§c你已被淘汰，进入旁观模式。")
             self.update_scoreboard(session_id)
 
+    @event_handler
+    def on_player_join(self, event: PlayerJoinEvent):
+        self.online_players[event.player.unique_id] = event.player
+        self.strip_session_tags(event.player)
+
     @event_handler
     def on_player_quit(self, event: PlayerQuitEvent):
+        self.online_players.pop(event.player.unique_id, None)
+        for runtime in self.game_sessions.values():
+            if runtime.bossbar:
+                runtime.bossbar.forget(event.player)
         self.leave_game(event.player)
+        self.positions.discard(event.player)
 
     # --- 管理功能 ---
     def add_session(self, sender: Player, name: str):
@@ -1408,6 +1545,7 @@ class EasyLuckyPillarPlugin(Plugin):
             "min_players": 2
         }
         self.save_config()
+        self.compile_sessions(sid)
         self.init_session_runtime(sid)
         sender.send_message(f"§a场次 {name} (ID: {sid}) 已创建。")
 
@@ -1417,6 +1555,7 @@ class EasyLuckyPillarPlugin(Plugin):
                 "x": int(sender.location.x), "y": int(sender.location.y), "z": int(sender.location.z)
             }
             self.save_config()
+            self.compile_sessions(sid)
             sender.send_message(f"§a场次 {sid} 中心位置已更新。")
         else:
             sender.send_message(f"§c场次 {sid} 不存在！")
@@ -1427,6 +1566,7 @@ class EasyLuckyPillarPlugin(Plugin):
             pid = str(len(pillars) + 1)
             pillars[pid] = {"x": int(sender.location.x), "y": int(sender.location.y), "z": int(sender.location.z)}
             self.save_config()
+            self.compile_sessions(sid)
             sender.send_message(f"§a场次 {sid} 已添加柱子 {pid}。")
         else:
             sender.send_message(f"§c场次 {sid} 不存在！")
@@ -1452,9 +1592,12 @@ class EasyLuckyPillarPlugin(Plugin):
             self._temp_wait_area[sid]["pos2"] = {
                 "x": int(sender.location.x), "y": int(sender.location.y), "z": int(sender.location.z)
             }
+            # 记录准备区域所在维度
+            self._temp_wait_area[sid]["dimension"] = sender.dimension.name
             # 保存到配置
             self.plugin_config["sessions"][sid]["wait_area"] = self._temp_wait_area[sid]
             self.save_config()
+            self.compile_sessions(sid)
             sender.send_message(f"§a场次 {sid} 准备区域已设置完成！")
             # 清除临时数据
             del self._temp_wait_area[sid]
@@ -1465,141 +1608,114 @@ class EasyLuckyPillarPlugin(Plugin):
             sender.send_message(f"§c场次 {sid} 不存在！")
             return
 
-        # 如果游戏正在运行，先停止游戏
-        if sid in self.game_sessions and self.game_sessions[sid]["state"] != GameState.IDLE:
+        # 如果游戏正在运行，先停止游戏（丢弃尚未应用的配置修改）
+        self.pending_session_configs.pop(sid, None)
+        if sid in self.game_sessions and self.game_sessions[sid].state != GameState.IDLE:
             self.stop_game(sid, "游戏已被管理员删除")
 
         # 从配置中删除场次
         del self.plugin_config["sessions"][sid]
 
         # 从运行时数据中删除场次
+        self.members.clear_session(sid)
         if sid in self.game_sessions:
             del self.game_sessions[sid]
 
         # 保存配置
         self.save_config()
+        self.compile_sessions(sid)
 
         sender.send_message(f"§a场次 {sid} 已成功删除！")
 
     def check_border_shrink(self, session_id):
         """检查并缩小边界"""
         runtime = self.game_sessions[session_id]
-        if runtime["state"] != GameState.RUNNING:
+        if runtime.state != GameState.RUNNING:
             return
 
-        # 检查是否需要缩小边界
-        if runtime["game_time"] - runtime["last_shrink_time"] >= runtime["border_shrink_interval"]:
-            # 检查是否已经达到最小边界
-            if runtime["border_radius"] > runtime["min_border_radius"]:
-                # 缩小边界
-                old_radius = runtime["border_radius"]
-                new_radius = max(runtime["min_border_radius"], old_radius - runtime["border_shrink_amount"])
-                runtime["border_radius"] = new_radius
-                runtime["last_shrink_time"] = runtime["game_time"]
-
-                # 获取声音配置
-                session_data = self.plugin_config.get("sessions", {}).get(session_id, {})
-                sound_config = session_data.get("sounds", {})
-
-                # 通知所有玩家
-                for p in runtime["players"]:
-                    if p in self.server.online_players and p.name in runtime["alive_players"]:
-                        p.send_message(f"§c边界正在缩小！当前半径: {new_radius} 格")
-                        p.send_title("§c警告", "§e边界正在缩小！", 0, 20, 5)
-                        # 播放警告音效
-                        if sound_config.get("enabled", True):
-                            sound_name = sound_config.get("border_shrink_sound", "mob.wither.ambient")
-                            volume = sound_config.get("border_shrink_volume", 10.0)
-                            pitch = sound_config.get("border_shrink_pitch", 1.0)
-                            p.play_sound(p.location, sound_name, volume=volume, pitch=pitch)
-
-                # 更新侧边栏显示
-                self.update_scoreboard(session_id)
+        # 到达缩小间隔且尚未达到最小边界时缩小边界
+        if runtime.shrink_border():
+            new_radius = runtime.border_radius
+
+            # 获取声音配置
+            sounds = self.session_configs[session_id].sounds
+
+            # 通知所有玩家
+            for p in self.members.alive(session_id):
+                if self.is_online(p):
+                    p.send_message(f"§c边界正在缩小！当前半径: {new_radius} 格")
+                    p.send_title("§c警告", "§e边界正在缩小！", 0, 20, 5)
+                    # 播放警告音效
+                    if sounds.enabled:
+                        p.play_sound(p.location, sounds.border_shrink_sound,
+                                     volume=sounds.border_shrink_volume, pitch=sounds.border_shrink_pitch)
+
+            # 更新侧边栏显示
+            self.update_scoreboard(session_id)
 
 
         # 检查玩家是否在边界外
-        session_data = self.plugin_config.get("sessions", {}).get(session_id, {})
-        if not session_data:
+        geometry = self.session_geometry.get(session_id)
+        if geometry is None:
             return
 
-        center_pos = session_data.get("center_pos", {"x": 0, "y": 100, "z": 0})
-        border_radius = runtime["border_radius"]
-        damage_per_second = runtime["border_damage_per_second"]
+        border_radius_sq = runtime.border_radius_sq
+        damage_per_second = runtime.border_damage_per_second
 
-        for p in runtime["players"]:
-            if p in self.server.online_players and p.name in runtime["alive_players"]:
-                # 计算玩家到中心的距离
-                dx = p.location.x - center_pos["x"]
-                dz = p.location.z - center_pos["z"]
-                distance = math.sqrt(dx * dx + dz * dz)
+        # 对全部在线存活玩家批量计算到中心的距离（比较平方，免去开方）
+        alive = [p for p in self.members.alive(session_id) if self.is_online(p)]
+        if not alive:
+            return
+        xs, _, zs = self.positions.gather(alive)
+        outside = [alive[i] for i in outside_radius(xs, zs, geometry.center_x, geometry.center_z, border_radius_sq)]
 
-                # 如果玩家在边界外，扣血
-                if distance > border_radius:
-                    # 扣血（每次扣damage_per_second点血，每秒扣1次）
-                    self.server.dispatch_command(self.server.command_sender, f"damage {p.name} {damage_per_second} magic")
-                    if p.health <= 0:
-                        p.send_message("§c你因在边界外而死亡！")
+        # 在边界外的玩家扣血（每次扣damage_per_second点血，每秒扣1次）
+        for p in outside:
+            if p.health <= damage_per_second:
+                p.send_message("§c你因在边界外而死亡！")
+        # 全部存活玩家都在边界外时回退命令可以合并为一条选择器命令
+        tag = alive_tag(session_id) if outside and len(outside) == len(alive) else None
+        self.actions.damage(outside, damage_per_second, tag)
 
     def show_border_particles(self, session_id):
         """显示边界粒子效果"""
         runtime = self.game_sessions[session_id]
-        if runtime["state"] != GameState.RUNNING:
+        if runtime.state != GameState.RUNNING:
             return
 
-        session_data = self.plugin_config.get("sessions", {}).get(session_id, {})
-        if not session_data:
+        config = self.session_configs.get(session_id)
+        if config is None:
             return
 
         # 获取粒子配置
-        particle_config = session_data.get("particles", {})
-        if not particle_config.get("enabled", True):
+        particle_config = config.particles
+        if not particle_config.enabled:
             return
 
-        center_pos = session_data.get("center_pos", {"x": 0, "y": 100, "z": 0})
-        border_radius = runtime["border_radius"]
-
-        # 从配置文件读取粒子参数
-        particle_type = particle_config.get("particle_type", "minecraft:falling_border_dust_particle")
-        particle_height = particle_config.get("particle_height", 10)
-        particle_y_offset = particle_config.get("particle_y_offset", -48)
-        horizontal_step = particle_config.get("horizontal_step", 2)
-        vertical_step = particle_config.get("vertical_step", 1)
-        view_distance = particle_config.get("view_distance", 4)
-
-        # 计算边界的四个角
-        x_min = center_pos["x"] - border_radius
-        x_max = center_pos["x"] + border_radius
-        z_min = center_pos["z"] - border_radius
-        z_max = center_pos["z"] + border_radius
-
-        # 计算Y轴范围
-        y_start = center_pos['y'] + particle_height
-        y_end = center_pos['y'] + particle_y_offset
-
-        # 获取在线玩家
-        players = [p for p in runtime["players"] if p in self.server.online_players]
-        if not players:
-            return
+        geometry = self.session_geometry[session_id]
+
+        # 边界墙上的粒子点只在半径变化后重新计算
+        wall = runtime.border_wall
+        if wall is None:
+            wall = runtime.border_wall = BorderWallGeometry(
+                geometry.center_x, geometry.center_z, runtime.border_radius,
+                geometry.center_y + particle_config.particle_height,
+                geometry.center_y + particle_config.particle_y_offset,
+                particle_config.horizontal_step,
+                particle_config.vertical_step,
+            )
+
+        # 在插件级预算内为每个在线玩家发送其视野范围内的粒子
+        viewers = []
+        for player in self.members.members(session_id):
+            if self.is_online(player):
+                player_x, _, player_z, _ = self.positions.get(player)
+                viewers.append((player, player_x, player_z))
+        running = sum(1 for r in self.game_sessions.values() if r.running)
+        self.particle_budget.emit_session(
+            wall, viewers, particle_config.particle_type, particle_config.view_distance, self.driver.tick, running
+        )
+
 
-        # 为每个玩家生成粒子
-        for player in players:
-            player_x = player.location.x
-            player_z = player.location.z
-
-            # 计算玩家视野范围内的边界范围
-            x_range_start = max(int(x_min), int(player_x - view_distance))
-            x_range_end = min(int(x_max), int(player_x + view_distance))
-            z_range_start = max(int(z_min), int(player_z - view_distance))
-            z_range_end = min(int(z_max), int(player_z + view_distance))
-
-            # 生成上边和下边的粒子（在玩家视野范围内）
-            for x in range(x_range_start, x_range_end + 1, horizontal_step):
-                for y in range(y_start, y_end, -vertical_step):
-                    player.spawn_particle(particle_type, x, y, z_max)
-                    player.spawn_particle(particle_type, x, y, z_min)
-
-            # 生成左边和右边的粒子（在玩家视野范围内）
-            for z in range(z_range_start, z_range_end + 1, horizontal_step):
-                for y in range(y_start, y_end, -vertical_step):
-                    player.spawn_particle(particle_type, x_min, y, z)
-                    player.spawn_particle(particle_type, x_max, y, z)
+# 插件模块的导入耗时（毫秒），在启用时输出
+import_time_ms = (time.perf_counter() - _import_started) * 1000
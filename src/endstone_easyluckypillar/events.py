@@ -0,0 +1,203 @@
+"""
+幸运之柱的随机事件引擎
+
+每种事件是一个注册到 EventRegistry 的 RandomEvent，分为两个阶段：
+- run_session: 场次级效果，每次触发只执行一次（如召唤恶魂、开始 TNT 雨）
+- run_players: 玩家级效果，一次性拿到全部存活在线玩家批量处理
+
+第三方插件可以通过 "endstone_easyluckypillar.events" 入口点提供事件，
+入口点指向 RandomEvent 子类或实例，在第一次需要事件列表时才会加载。
+"""
+import random
+from typing import Callable, Dict, List, Optional
+
+from .geometry import centroid
+from .membership import alive_tag
+
+ENTRY_POINT_GROUP = "endstone_easyluckypillar.events"
+
+
+class EventContext:
+    """事件执行上下文"""
+
+    __slots__ = ("plugin", "session_id", "runtime", "players")
+
+    def __init__(self, plugin, session_id: str, runtime, players: list):
+        self.plugin = plugin
+        self.session_id = session_id
+        self.runtime = runtime
+        self.players = players  # 存活且在线的玩家
+
+    def dispatch(self, command: str):
+        """以控制台身份执行命令"""
+        server = self.plugin.server
+        server.dispatch_command(server.command_sender, command)
+
+    def dispatch_alive(self, template: str):
+        """对场次全部存活玩家排队一条选择器命令，模板中的 {target} 会被替换为目标选择器"""
+        self.plugin.command_batch.for_tag(alive_tag(self.session_id), template)
+
+
+class RandomEvent:
+    """随机事件基类"""
+
+    name = ""  # 事件ID
+    display_name = ""  # 侧边栏显示的事件名
+    message = ""  # 触发时发送给玩家的消息
+
+    def run_session(self, ctx: EventContext):
+        """场次级效果，每次触发只执行一次"""
+
+    def run_players(self, ctx: EventContext, players: list):
+        """玩家级效果，默认只发送事件消息"""
+        if self.message:
+            for p in players:
+                p.send_message(self.message)
+
+
+class EffectEvent(RandomEvent):
+    """给所有存活玩家施加药水效果的事件"""
+
+    def __init__(self, name: str, display_name: str, message: str, effect: str, seconds: int, amplifier: int):
+        self.name = name
+        self.display_name = display_name
+        self.message = message
+        self.effect = effect
+        self.seconds = seconds
+        self.amplifier = amplifier
+
+    def run_players(self, ctx: EventContext, players: list):
+        ctx.dispatch_alive(f"effect {{target}} {self.effect} {self.seconds} {self.amplifier} true")
+        super().run_players(ctx, players)
+
+
+class TntRainEvent(RandomEvent):
+    """TNT 雨：整个场次只启动一个发射任务"""
+
+    name = "tnt"
+    display_name = "TNT雨"
+    message = "§4[事件] §cTNT雨来袭！"
+
+    def run_session(self, ctx: EventContext):
+        ctx.plugin.start_tnt_rain(ctx.session_id)
+
+
+class GhastEvent(RandomEvent):
+    """恶魂袭击：在所有存活玩家的中心点上方召唤恶魂"""
+
+    name = "ghast"
+    display_name = "恶魂袭击"
+    message = "§d[事件] §5恶魂来袭！"
+    max_ghasts = 5  # 最多生成的恶魂数
+
+    def run_session(self, ctx: EventContext):
+        if not ctx.players:
+            return
+
+        # 计算所有存活玩家的中心点
+        center_x, center_y, center_z = centroid(*ctx.plugin.positions.gather(ctx.players))
+
+        # 在玩家中心点上方生成恶魂
+        for i in range(min(len(ctx.players), self.max_ghasts)):
+            # 在中心点周围随机偏移，每只恶魂高度相差3格
+            spawn_x = center_x + random.uniform(-5, 5)
+            spawn_y = center_y + 10 + i * 3
+            spawn_z = center_z + random.uniform(-5, 5)
+            ctx.dispatch(f"summon ghast {spawn_x} {spawn_y} {spawn_z}")
+
+
+class LightningEvent(RandomEvent):
+    """雷击警告：在每个存活玩家的位置召唤闪电"""
+
+    name = "lightning"
+    display_name = "雷击警告"
+    message = "§e[事件] §6雷击警告！"
+
+    def run_players(self, ctx: EventContext, players: list):
+        for p in players:
+            x, y, z, _ = ctx.plugin.positions.get(p)
+            ctx.dispatch(f"summon lightning_bolt {x} {y} {z}")
+        super().run_players(ctx, players)
+
+
+def builtin_events() -> List[RandomEvent]:
+    """内置事件，顺序决定事件的确定性选择结果"""
+    return [
+        EffectEvent("darkness", "黑暗降临", "§8[事件] §7黑暗降临...", "darkness", 10, 1),
+        TntRainEvent(),
+        GhastEvent(),
+        LightningEvent(),
+        EffectEvent("blindness", "视野受阻", "§8[事件] §7视野受阻...", "blindness", 10, 1),
+        EffectEvent("slowness", "行动迟缓", "§7[事件] §8行动迟缓...", "slowness", 10, 2),
+        EffectEvent("levitation", "漂浮之力", "§b[事件] §3漂浮之力！", "levitation", 5, 1),
+    ]
+
+
+class EventRegistry:
+    """随机事件注册表"""
+
+    def __init__(self, on_error: Optional[Callable[[str, Exception], None]] = None):
+        self._events: Dict[str, RandomEvent] = {}
+        self._names: List[str] = []
+        self._entry_points_loaded = False
+        self._on_error = on_error
+        for event in builtin_events():
+            self.register(event)
+
+    def register(self, event: RandomEvent):
+        """注册事件，同名事件会被替换"""
+        if event.name not in self._events:
+            self._names.append(event.name)
+        self._events[event.name] = event
+
+    def _load_entry_points(self):
+        """加载第三方入口点提供的事件（只加载一次）"""
+        self._entry_points_loaded = True
+        try:
+            from importlib.metadata import entry_points
+            eps = entry_points()
+            if hasattr(eps, "select"):
+                group = eps.select(group=ENTRY_POINT_GROUP)
+            else:
+                group = eps.get(ENTRY_POINT_GROUP, [])
+        except Exception as e:
+            if self._on_error:
+                self._on_error(ENTRY_POINT_GROUP, e)
+            return
+
+        for ep in group:
+            try:
+                event = ep.load()
+                if isinstance(event, type):
+                    event = event()
+                if not event.name:
+                    event.name = ep.name
+                self.register(event)
+            except Exception as e:
+                if self._on_error:
+                    self._on_error(ep.name, e)
+
+    def names(self) -> List[str]:
+        """全部事件ID，第一次调用时加载第三方事件"""
+        if not self._entry_points_loaded:
+            self._load_entry_points()
+        return self._names
+
+    def get(self, name: str) -> Optional[RandomEvent]:
+        """按ID获取事件"""
+        if name not in self._events and not self._entry_points_loaded:
+            self._load_entry_points()
+        return self._events.get(name)
+
+    def pick(self, event_cycle: int) -> RandomEvent:
+        """根据事件周期确定性地选出事件，保证侧边栏预告与实际触发一致"""
+        names = self.names()
+        # 为了增加随机性，使用多个哈希值组合
+        hash_value = hash((event_cycle, 123456789))
+        return self._events[names[abs(hash_value) % len(names)]]
+
+    def trigger(self, event: RandomEvent, ctx: EventContext):
+        """触发事件：先执行一次场次级效果，再批量执行玩家级效果"""
+        event.run_session(ctx)
+        if ctx.players:
+            event.run_players(ctx, ctx.players)
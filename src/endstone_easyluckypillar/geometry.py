@@ -0,0 +1,204 @@
+"""
+幸运之柱的空间索引与几何计算模块
+"""
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from endstone.level import Location
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖
+    np = None
+
+# 轴对齐包围盒: (min_x, min_y, min_z, max_x, max_y, max_z)
+AABB = Tuple[float, float, float, float, float, float]
+
+
+def normalize_aabb(pos1: dict, pos2: dict) -> AABB:
+    """将两个角点坐标规范化为 (min_x, min_y, min_z, max_x, max_y, max_z)"""
+    return (
+        min(pos1["x"], pos2["x"]), min(pos1["y"], pos2["y"]), min(pos1["z"], pos2["z"]),
+        max(pos1["x"], pos2["x"]), max(pos1["y"], pos2["y"]), max(pos1["z"], pos2["z"]),
+    )
+
+
+def outside_radius(xs, zs, center_x: float, center_z: float, radius_sq: float) -> List[int]:
+    """
+    批量检查一组点是否在圆形边界外（比较距离平方，免去开方）
+
+    Args:
+        xs, zs: 各点的 x/z 坐标（ndarray 或序列）
+        center_x, center_z: 边界中心
+        radius_sq: 边界半径的平方
+
+    Returns:
+        在边界外的点的下标
+    """
+    if np is not None:
+        dx = np.asarray(xs, dtype=np.float64) - center_x
+        dz = np.asarray(zs, dtype=np.float64) - center_z
+        return np.flatnonzero(dx * dx + dz * dz > radius_sq).tolist()
+    return [
+        i for i, (x, z) in enumerate(zip(xs, zs))
+        if (x - center_x) * (x - center_x) + (z - center_z) * (z - center_z) > radius_sq
+    ]
+
+
+def centroid(xs, ys, zs) -> Tuple[float, float, float]:
+    """计算一组点的中心点，点集不能为空"""
+    if np is not None:
+        return (float(np.mean(xs)), float(np.mean(ys)), float(np.mean(zs)))
+    n = len(xs)
+    return sum(xs) / n, sum(ys) / n, sum(zs) / n
+
+
+class WaitAreaIndex:
+    """准备区域的空间索引（按维度划分的均匀网格）
+
+    每个维度一张以 CELL_SIZE 为边长的 XZ 网格，格子里保存覆盖它的准备区域。
+    查询时只需检查玩家所在格子里的少数几个区域，与场次总数无关。
+    未指定维度的准备区域放在通配桶（None）中，对所有维度生效。
+    """
+
+    CELL_SIZE = 16  # 网格边长（格）
+    MAX_CELLS_PER_AREA = 4096  # 覆盖格子数超过该值的超大区域不进入网格，改为直接检查
+
+    def __init__(self):
+        # 维度名 -> {(cell_x, cell_z): [条目]}
+        self._grids: Dict[Optional[str], Dict[Tuple[int, int], list]] = {}
+        # 维度名 -> [条目]
+        self._oversized: Dict[Optional[str], list] = {}
+
+    def rebuild(self, areas: Iterable[Tuple[str, Optional[str], AABB]]):
+        """
+        重建索引
+
+        Args:
+            areas: (场次ID, 维度名或None, 包围盒) 的可迭代对象，顺序即配置中的场次顺序
+        """
+        self._grids = {}
+        self._oversized = {}
+        size = self.CELL_SIZE
+        for order, (session_id, dimension, aabb) in enumerate(areas):
+            entry = (order, session_id) + tuple(aabb)
+            min_x, _, min_z, max_x, _, max_z = aabb
+            cx0, cx1 = math.floor(min_x / size), math.floor(max_x / size)
+            cz0, cz1 = math.floor(min_z / size), math.floor(max_z / size)
+            if (cx1 - cx0 + 1) * (cz1 - cz0 + 1) > self.MAX_CELLS_PER_AREA:
+                self._oversized.setdefault(dimension, []).append(entry)
+                continue
+            grid = self._grids.setdefault(dimension, {})
+            for cx in range(cx0, cx1 + 1):
+                for cz in range(cz0, cz1 + 1):
+                    grid.setdefault((cx, cz), []).append(entry)
+
+    def _collect(self, dimension: Optional[str], cell: Tuple[int, int], x, y, z, hits: list):
+        grid = self._grids.get(dimension)
+        candidates = grid.get(cell, ()) if grid else ()
+        for entries in (candidates, self._oversized.get(dimension, ())):
+            for order, session_id, min_x, min_y, min_z, max_x, max_y, max_z in entries:
+                if min_x <= x <= max_x and min_y <= y <= max_y and min_z <= z <= max_z:
+                    hits.append((order, session_id))
+
+    def query(self, dimension: Optional[str], x: float, y: float, z: float) -> List[str]:
+        """
+        查询包含该坐标的所有准备区域
+
+        Returns:
+            场次ID列表，按配置中的场次顺序排列
+        """
+        size = self.CELL_SIZE
+        cell = (math.floor(x / size), math.floor(z / size))
+        hits = []
+        self._collect(dimension, cell, x, y, z, hits)
+        if dimension is not None:
+            self._collect(None, cell, x, y, z, hits)
+        if len(hits) > 1:
+            hits.sort()
+        return [session_id for _, session_id in hits]
+
+
+class SessionGeometry:
+    """场次的预编译几何数据
+
+    由配置编译而来，只在管理命令或重载修改场次时重建，热路径直接读取属性。
+    传送目标 Location 按维度惰性创建并缓存。
+    """
+
+    __slots__ = (
+        "session_id", "wait_area", "wait_dimension",
+        "center_x", "center_y", "center_z",
+        "center_target", "pillar_targets", "wait_target",
+        "_location_cache",
+    )
+
+    def __init__(self, session_id: str, session_data: dict):
+        self.session_id = session_id
+        # 格式错误的配置段由 SessionConfig 报告，这里按未设置处理
+        if not isinstance(session_data, dict):
+            session_data = {}
+
+        # 准备区域包围盒
+        wait_area = session_data.get("wait_area", None)
+        if isinstance(wait_area, dict) and wait_area:
+            pos1 = wait_area.get("pos1", {"x": 0, "y": 100, "z": 0})
+            pos2 = wait_area.get("pos2", {"x": 0, "y": 100, "z": 0})
+            self.wait_area = normalize_aabb(pos1, pos2)
+            self.wait_dimension = wait_area.get("dimension")
+            # 人数超出时被移出的玩家传送回准备区域第一个点
+            self.wait_target = (pos1["x"] - 0.5, pos1["y"], pos1["z"] + 0.5)
+        else:
+            self.wait_area = None
+            self.wait_dimension = None
+            self.wait_target = None
+
+        # 中心点（边界半径由场次的边界配置提供）
+        center = session_data.get("center_pos")
+        if not isinstance(center, dict):
+            center = {"x": 0, "y": 100, "z": 0}
+        self.center_x = center["x"]
+        self.center_y = center["y"]
+        self.center_z = center["z"]
+
+        # 传送目标坐标（方块中心，站在方块上方）
+        self.center_target = (self.center_x - 0.5, self.center_y + 1, self.center_z + 0.5)
+        pillars = session_data.get("pillars")
+        self.pillar_targets = [
+            (pos["x"] - 0.5, pos["y"] + 1, pos["z"] + 0.5)
+            for pos in (pillars.values() if isinstance(pillars, dict) else ())
+        ]
+
+        self._location_cache = {}
+
+    def contains_wait_area(self, dimension_name: str, x: float, y: float, z: float) -> bool:
+        """检查坐标是否在准备区域内"""
+        aabb = self.wait_area
+        if aabb is None:
+            return False
+        if self.wait_dimension and dimension_name != self.wait_dimension:
+            return False
+        return aabb[0] <= x <= aabb[3] and aabb[1] <= y <= aabb[4] and aabb[2] <= z <= aabb[5]
+
+    def _locations(self, dimension) -> dict:
+        cached = self._location_cache.get(dimension.name)
+        if cached is None:
+            cached = {
+                "center": Location(dimension, *self.center_target),
+                "pillars": [Location(dimension, *target) for target in self.pillar_targets],
+                "wait": Location(dimension, *self.wait_target) if self.wait_target else None,
+            }
+            self._location_cache[dimension.name] = cached
+        return cached
+
+    def center_location(self, dimension):
+        """获取指定维度下的中心点传送目标"""
+        return self._locations(dimension)["center"]
+
+    def pillar_locations(self, dimension) -> list:
+        """获取指定维度下的所有柱子传送目标"""
+        return self._locations(dimension)["pillars"]
+
+    def wait_location(self, dimension):
+        """获取指定维度下的准备区域传送目标，未设置准备区域时返回 None"""
+        return self._locations(dimension)["wait"]
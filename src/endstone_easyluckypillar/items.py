@@ -0,0 +1,215 @@
+"""
+幸运之柱的物品池模块
+"""
+import random
+from array import array
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 旧版物品ID -> 当前物品ID
+LEGACY_ITEM_IDS = {
+    "planks": "oak_planks",
+    "log": "oak_log",
+    "wool": "white_wool",
+}
+
+
+def compile_item_pool(pool: Dict[str, float], make_stack: Callable[[str], object]
+                      ) -> Tuple[Dict[str, float], Dict[str, object], List[Tuple[str, str]], List[str]]:
+    """
+    校验物品池并编译 ItemStack 原型
+
+    逐个尝试构造 ItemStack，无法构造的旧版物品ID会换成当前ID（权重并入同名条目），
+    仍然无法构造的条目以及权重不是正数的条目被剔除。
+
+    Args:
+        pool: 物品ID -> 权重
+        make_stack: 由物品ID构造 ItemStack 的函数
+
+    Returns:
+        (有效的 物品ID -> 权重, 物品ID -> ItemStack 原型, [(旧ID, 新ID), ...], [被剔除的条目说明, ...])
+    """
+    weights: Dict[str, float] = {}
+    prototypes: Dict[str, object] = {}
+    remapped: List[Tuple[str, str]] = []
+    rejected: List[str] = []
+
+    def try_make(item_type: str) -> bool:
+        if item_type in prototypes:
+            return True
+        try:
+            prototypes[item_type] = make_stack(item_type)
+        except Exception:
+            return False
+        return True
+
+    for item_type, weight in pool.items():
+        # 与配置读取一致：权重必须是数字（不能是 true/false）且大于 0
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not weight > 0:
+            rejected.append(f"{item_type} (权重 {weight!r})")
+            continue
+        if try_make(item_type):
+            target = item_type
+        elif item_type in LEGACY_ITEM_IDS and try_make(LEGACY_ITEM_IDS[item_type]):
+            target = LEGACY_ITEM_IDS[item_type]
+            remapped.append((item_type, target))
+        else:
+            rejected.append(item_type)
+            continue
+        weights[target] = weights.get(target, 0) + weight
+    return weights, prototypes, remapped, rejected
+
+
+class AliasTable:
+    """加权随机抽样的别名表（Vose 算法）
+
+    建表 O(n)，之后每次抽样只需一次均匀随机下标和一次比较，与物品数量无关。
+    权重不大于 0 的条目会被忽略。
+    """
+
+    def __init__(self, weights: Dict[str, float], rng: Optional[random.Random] = None):
+        entries = [(key, float(weight)) for key, weight in weights.items() if weight > 0]
+        self.keys: List[str] = [key for key, _ in entries]
+        n = len(entries)
+        self._prob = array("d", [0.0]) * n
+        self._alias = array("l", [0]) * n
+        self._random = (rng or random).random
+        if not n:
+            return
+
+        total = sum(weight for _, weight in entries)
+        scaled = [weight * n / total for _, weight in entries]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = g
+            scaled[g] = scaled[g] + scaled[s] - 1.0
+            (small if scaled[g] < 1.0 else large).append(g)
+        # 剩余的条目受浮点误差影响，概率视为 1
+        for i in large + small:
+            self._prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def choice(self) -> Optional[str]:
+        """抽取一个物品，物品池为空时返回 None"""
+        n = len(self.keys)
+        if not n:
+            return None
+        r = self._random() * n
+        i = min(int(r), n - 1)
+        # 同一个随机数的小数部分用作第二次均匀随机
+        return self.keys[i] if r - i < self._prob[i] else self.keys[self._alias[i]]
+
+    def sample(self, k: int) -> List[str]:
+        """有放回地批量抽取 k 个物品"""
+        keys = self.keys
+        n = len(keys)
+        if not n:
+            return []
+        prob, alias, rand = self._prob, self._alias, self._random
+        result = []
+        for _ in range(k):
+            r = rand() * n
+            i = min(int(r), n - 1)
+            result.append(keys[i] if r - i < prob[i] else keys[alias[i]])
+        return result
+
+
+class _DeliveryBatch:
+    """一个场次一次发放的全部物品"""
+
+    __slots__ = ("session_id", "pending", "rate")
+
+    def __init__(self, session_id: str, pending: deque, rate: int):
+        self.session_id = session_id
+        self.pending = pending  # (玩家, 物品ID)
+        self.rate = rate  # 每 tick 发放的数量
+
+
+class ItemDistributor:
+    """物品发放流水线
+
+    每次发放时一次性为场次的全部玩家抽好物品，再把写入背包的操作
+    平均分摊到发放间隔内的各个 tick，并受插件级每 tick 发放上限约束。
+    同一种物品复用同一个 ItemStack 原型，不会每次重新创建。
+    """
+
+    DEFAULT_PER_TICK = 16
+
+    def __init__(self, make_stack: Callable[[str], object],
+                 can_receive: Callable[[object, str], bool],
+                 on_error: Optional[Callable[[str, Exception], None]] = None):
+        self._make_stack = make_stack
+        self._can_receive = can_receive
+        self._on_error = on_error
+        self.prototypes: Dict[str, object] = {}  # 物品ID -> ItemStack 原型
+        self.per_tick = self.DEFAULT_PER_TICK
+        self._batches: List[_DeliveryBatch] = []
+        self.delivered = 0
+
+    def configure(self, config: dict):
+        """
+        从配置加载发放参数
+
+        Args:
+            config: {"per_tick": 每tick最多发放的物品数}
+        """
+        self.per_tick = max(1, int(config.get("per_tick", self.DEFAULT_PER_TICK)))
+
+    def load_prototypes(self, prototypes: Dict[str, object]):
+        """使用加载配置时编译好的 ItemStack 原型表"""
+        self.prototypes = dict(prototypes)
+
+    def prototype(self, item_type: str):
+        """获取物品的 ItemStack 原型"""
+        stack = self.prototypes.get(item_type)
+        if stack is None:
+            stack = self.prototypes[item_type] = self._make_stack(item_type)
+        return stack
+
+    def enqueue(self, session_id: str, deliveries: Iterable[tuple], interval: int):
+        """
+        排队一批物品
+
+        Args:
+            session_id: 场次ID
+            deliveries: [(玩家, 物品ID), ...]
+            interval: 发放间隔（tick），这批物品会在该时间内发完
+        """
+        pending = deque(deliveries)
+        if pending:
+            rate = -(-len(pending) // max(1, interval))
+            self._batches.append(_DeliveryBatch(session_id, pending, rate))
+
+    def cancel_session(self, session_id: str):
+        """丢弃场次尚未发放的物品"""
+        self._batches = [batch for batch in self._batches if batch.session_id != session_id]
+
+    def run_tick(self):
+        """每 tick 调用一次，在上限内按批次轮流发放物品"""
+        budget = self.per_tick
+        for batch in self._batches:
+            pending = batch.pending
+            for _ in range(min(batch.rate, budget, len(pending))):
+                player, item_type = pending.popleft()
+                budget -= 1
+                if self._can_receive(player, batch.session_id):
+                    self._deliver(player, item_type)
+            if not budget:
+                break
+        self._batches = [batch for batch in self._batches if batch.pending]
+
+    def _deliver(self, player, item_type: str):
+        # 优化: 使用 inventory API 发放物品
+        try:
+            player.inventory.add_item(self.prototype(item_type))
+            player.send_tip(f"§a获得随机物品: §f{item_type}")
+            self.delivered += 1
+        except Exception as e:
+            if self._on_error:
+                self._on_error(item_type, e)
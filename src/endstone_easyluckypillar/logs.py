@@ -0,0 +1,371 @@
+"""
+幸运之柱的日志输出模块
+
+控制台与文件输出都在 QueueListener 的后台线程中完成，调用方只把日志记录放入队列；
+低于配置级别的日志在调用方检查级别后直接返回，不会创建日志记录。
+"""
+import gzip
+import logging
+import os
+import queue
+import random
+import re
+import shutil
+import threading
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+SUCCESS = 25  # 介于 INFO 与 WARNING 之间
+logging.addLevelName(SUCCESS, "SUCCESS")
+
+LEVELS = {
+    "DEBUG": logging.DEBUG, "INFO": logging.INFO, "SUCCESS": SUCCESS,
+    "WARNING": logging.WARNING, "ERROR": logging.ERROR
+}
+
+LEVEL_COLORS = {
+    "DEBUG": "\x1b[36m", "INFO": "\x1b[37m", "WARNING": "\x1b[33m",
+    "ERROR": "\x1b[31m", "SUCCESS": "\x1b[32m"
+}
+
+RESET = "\x1b[0m"
+
+
+# --- 随机颜色系统 ---
+def randomVividColor():
+    """生成一个鲜艳的随机颜色"""
+    rand = random.random() * 260
+    if rand < 90:
+        h = rand
+    elif rand < 200:
+        h = rand + 60
+    else:
+        h = rand + 100
+    s = 0.90 + random.random() * 0.10
+    l = 0.65 + random.random() * 0.15
+    a = s * min(l, 1 - l)
+    def f(n):
+        k = (n + h / 30) % 12
+        return round((l - a * max(-1, min(k - 3, 9 - k, 1))) * 255)
+    return (f(0), f(8), f(4))
+
+
+def generateColorPair():
+    """生成一对颜色"""
+    c1 = randomVividColor()
+    c2, attempts = 0, 0
+    while True:
+        c2 = randomVividColor()
+        diff = abs(c1[0] - c2[0]) + abs(c1[1] - c2[1]) + abs(c1[2] - c2[2])
+        if diff > 150 or attempts > 20:
+            break
+        attempts += 1
+    return c1, c2
+
+
+@lru_cache(maxsize=256)
+def gradient_codes(length: int, c1: Tuple[int, int, int], c2: Tuple[int, int, int]) -> Tuple[str, ...]:
+    """长度为 length 的文本从 c1 渐变到 c2 时每个字符前的颜色代码"""
+    codes = []
+    for i in range(length):
+        t = 0 if length <= 1 else i / (length - 1)
+        r = round(c1[0] + (c2[0] - c1[0]) * t)
+        g = round(c1[1] + (c2[1] - c1[1]) * t)
+        b = round(c1[2] + (c2[2] - c1[2]) * t)
+        codes.append(f"\x1b[38;2;{r};{g};{b}m")
+    return tuple(codes)
+
+
+class GradientRenderer:
+    """渐变色文本渲染器
+
+    同一长度的文本在同一颜色对下的颜色代码只计算一次。
+    """
+
+    def __init__(self, c1=None, c2=None):
+        # 未指定颜色对时在第一次渲染时随机生成
+        self.colors = (tuple(c1), tuple(c2)) if c1 is not None and c2 is not None else None
+
+    def render(self, text: str) -> str:
+        colors = self.colors
+        if colors is None:
+            colors = self.colors = generateColorPair()
+        codes = gradient_codes(len(text), *colors)
+        return "".join(map(str.__add__, codes, text)) + RESET
+
+
+class ConsoleFormatter(logging.Formatter):
+    """控制台日志格式：插件名 + 彩色级别 + 渐变色正文"""
+
+    def __init__(self, name: str, renderer: GradientRenderer):
+        super().__init__()
+        self.head = f"[\x1b[96m{name}{RESET}] "
+        self.renderer = renderer
+
+    def format(self, record: logging.LogRecord) -> str:
+        level = record.levelname
+        level_color = LEVEL_COLORS.get(level, "\x1b[37m")
+        return f"{self.head}[{level_color}{level}{RESET}] " + self.renderer.render(record.getMessage())
+
+
+class _RecordQueueHandler(QueueHandler):
+    """原样放入队列，格式化全部留给后台线程"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class LogPipeline:
+    """异步日志管线
+
+    Args:
+        name: logger 名称
+        level: 初始日志级别
+    """
+
+    def __init__(self, name: str, level: int = logging.INFO):
+        self.logger = logging.getLogger(name)
+        self.logger.propagate = False
+        self.logger.setLevel(level)
+        self._queue = queue.SimpleQueue()
+        for handler in list(self.logger.handlers):
+            if isinstance(handler, _RecordQueueHandler):
+                self.logger.removeHandler(handler)
+        self.logger.addHandler(_RecordQueueHandler(self._queue))
+        self.handlers = []
+        self._listener: Optional[QueueListener] = None
+
+    def add_handler(self, handler: logging.Handler):
+        """添加一个在后台线程中执行的输出处理器"""
+        self.handlers.append(handler)
+        if self._listener is not None:
+            self.stop()
+            self.start()
+
+    def set_level(self, level: Union[str, int]) -> bool:
+        """
+        设置日志级别
+
+        Returns:
+            级别名称是否有效
+        """
+        if isinstance(level, str):
+            if level.upper() not in LEVELS:
+                return False
+            level = LEVELS[level.upper()]
+        self.logger.setLevel(level)
+        return True
+
+    def start(self):
+        """启动后台线程（已启动时忽略）"""
+        if self._listener is None:
+            self._listener = QueueListener(self._queue, *self.handlers, respect_handler_level=True)
+            self._listener.start()
+
+    def stop(self):
+        """输出队列中剩余的日志并停止后台线程"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        for handler in self.handlers:
+            handler.flush()
+
+    def log(self, text, level: str = "INFO") -> bool:
+        """
+        记录一条日志
+
+        Returns:
+            是否达到当前日志级别
+        """
+        levelno = LEVELS.get(level, logging.INFO)
+        if not self.logger.isEnabledFor(levelno):
+            return False
+        # 直接构造日志记录，省去 logger.log 查找调用位置的栈遍历
+        self.logger.handle(self.logger.makeRecord(self.logger.name, levelno, "", 0, str(text), None, None))
+        return True
+
+
+_STOP = object()  # 压缩线程的退出标记
+
+
+class RotatingLogHandler(logging.Handler):
+    """按天和大小轮转的日志文件处理器
+
+    当天的日志写入 {prefix}_YYYYMMDD.log，日期变化或文件超过 max_bytes 时轮转，
+    同一天超出大小的旧分段依次命名为 {prefix}_YYYYMMDD.1.log、.2.log……
+    轮转出去的分段在后台线程中压缩为 .gz，超过保留天数的日志文件会被删除。
+    写入经过缓冲区，由定时器每隔 flush_interval 秒刷新一次，ERROR 及以上级别立即刷新。
+    日志目录和文件在写入第一条日志时才创建。
+
+    Args:
+        directory: 日志目录
+        prefix: 日志文件名前缀
+    """
+
+    DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+    DEFAULT_RETENTION_DAYS = 14  # 0 表示永久保留
+    DEFAULT_FLUSH_INTERVAL = 2.0
+    BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, directory: Path, prefix: str):
+        super().__init__()
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.max_bytes = self.DEFAULT_MAX_BYTES
+        self.retention_days = self.DEFAULT_RETENTION_DAYS
+        self.flush_interval = self.DEFAULT_FLUSH_INTERVAL
+        self._name_pattern = re.compile(rf"^{re.escape(prefix)}_(\d{{8}})(?:\.(\d+))?\.log(?:\.gz)?$")
+        self._stream = None
+        self._day: Optional[date] = None
+        self._rollover_at = 0.0  # 下一个午夜的时间戳
+        self._size = 0
+        self._compress_queue = queue.SimpleQueue()
+        self._compressor: Optional[threading.Thread] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flush = threading.Event()
+
+    def configure(self, config: dict):
+        """
+        从配置加载轮转参数
+
+        Args:
+            config: {"max_size_mb": 单个文件大小上限, "retention_days": 保留天数, "flush_interval": 刷新间隔（秒）}
+        """
+        self.max_bytes = max(1, int(float(config.get("max_size_mb", self.DEFAULT_MAX_BYTES / 1024 / 1024)) * 1024 * 1024))
+        self.retention_days = max(0, int(config.get("retention_days", self.DEFAULT_RETENTION_DAYS)))
+        self.flush_interval = max(0.1, float(config.get("flush_interval", self.DEFAULT_FLUSH_INTERVAL)))
+
+    def _path(self, day: date, index: int = 0) -> Path:
+        suffix = f".{index}" if index else ""
+        return self.directory / f"{self.prefix}_{day:%Y%m%d}{suffix}.log"
+
+    def _open(self, day: date):
+        """打开指定日期的日志文件，第一次打开时顺带整理之前遗留的日志"""
+        first = self._day is None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(day)
+        self._stream = open(path, "a", encoding="utf-8", buffering=self.BUFFER_SIZE)
+        self._size = self._stream.tell()
+        self._day = day
+        midnight = datetime.combine(day + timedelta(days=1), datetime.min.time())
+        self._rollover_at = midnight.timestamp()
+        self._start_threads()
+        if first:
+            # 之前运行留下的未压缩的旧日志
+            for entry in self.directory.iterdir():
+                match = self._name_pattern.match(entry.name)
+                if match and entry.suffix == ".log" and entry != path:
+                    self._compress_queue.put(entry)
+            self._compress_queue.put(None)  # 只清理过期日志
+
+    def _rotate(self, day: date):
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.close()
+            old = self._path(self._day)
+            if self._day == day:
+                # 同一天超过大小上限：当前文件改名为下一个分段
+                index = 1
+                while self._path(day, index).exists() or self._path(day, index).with_suffix(".log.gz").exists():
+                    index += 1
+                target = self._path(day, index)
+                os.replace(old, target)
+                old = target
+            self._compress_queue.put(old)
+        self._open(day)
+
+    def _start_threads(self):
+        if self._compressor is None:
+            self._compressor = threading.Thread(target=self._compress_loop, name="EasyLuckyPillar-LogCompressor", daemon=True)
+            self._compressor.start()
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="EasyLuckyPillar-LogFlusher", daemon=True)
+            self._flusher.start()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            text = self.format(record) + "\n"
+            size = len(text.encode("utf-8"))
+            if self._stream is None or record.created >= self._rollover_at:
+                self._rotate(date.fromtimestamp(record.created))
+            elif self._size and self._size + size > self.max_bytes:
+                self._rotate(self._day)
+            self._stream.write(text)
+            self._size += size
+            if record.levelno >= logging.ERROR:
+                self._stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._stream is not None:
+                self._stream.flush()
+        finally:
+            self.release()
+
+    def _flush_loop(self):
+        while not self._stop_flush.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+    def _compress_loop(self):
+        while True:
+            path = self._compress_queue.get()
+            if path is _STOP:
+                return
+            try:
+                if path is not None:
+                    self._compress(path)
+                self._prune()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _compress(path: Path):
+        """把日志分段压缩为 .gz，先写临时文件再替换，中途中断只会留下未压缩的原文件"""
+        target = path.with_suffix(".log.gz")
+        tmp = target.with_name(target.name + ".tmp")
+        with open(path, "rb") as src, gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp, target)
+        path.unlink()
+
+    def _prune(self):
+        """删除超过保留天数的日志"""
+        if not self.retention_days:
+            return
+        oldest = date.today() - timedelta(days=self.retention_days)
+        for entry in self.directory.iterdir():
+            match = self._name_pattern.match(entry.name)
+            if match and datetime.strptime(match.group(1), "%Y%m%d").date() < oldest:
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+
+    def close(self):
+        """刷新并关闭当前文件，等待后台压缩完成"""
+        self._stop_flush.set()
+        self.acquire()
+        try:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+            self._day = None
+        finally:
+            self.release()
+        if self._compressor is not None:
+            self._compress_queue.put(_STOP)
+            self._compressor.join(timeout=10)
+            self._compressor = None
+        if self._flusher is not None:
+            self._flusher.join(timeout=1)
+            self._flusher = None
+        super().close()
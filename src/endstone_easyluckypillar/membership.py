@@ -0,0 +1,128 @@
+"""
+幸运之柱的场次成员登记模块
+"""
+from typing import Callable, Dict, List, Optional
+
+TAG_PREFIX = "lp_"
+
+
+def member_tag(session_id: str) -> str:
+    """场次成员的实体标签"""
+    return f"{TAG_PREFIX}{session_id}_member"
+
+
+def alive_tag(session_id: str) -> str:
+    """场次存活成员的实体标签"""
+    return f"{TAG_PREFIX}{session_id}_alive"
+
+
+class SessionMembership:
+    """场次成员登记表
+
+    以玩家 UUID 为键，统一维护三种视图：
+    玩家 -> 所在场次、场次 -> 全部成员、场次 -> 存活成员。
+    加入、离开、淘汰与计数均为 O(1)，成员按加入顺序保存。
+    同时通过 on_tag 回调让玩家身上的 lp_<场次>_member / lp_<场次>_alive 标签与登记表保持一致，
+    以便用目标选择器一次性对整个场次执行命令。
+    """
+
+    def __init__(self, on_tag: Optional[Callable[[object, str, bool], None]] = None):
+        self._session_of: Dict[object, str] = {}  # 玩家UUID -> 场次ID
+        self._members: Dict[str, dict] = {}  # 场次ID -> {玩家UUID: Player}
+        self._alive: Dict[str, dict] = {}  # 场次ID -> {玩家UUID: Player}
+        self._on_tag = on_tag  # (玩家, 标签, 添加/移除)
+
+    def _tag(self, player, tag: str, add: bool):
+        if self._on_tag:
+            self._on_tag(player, tag, add)
+
+    def join(self, player, session_id: str):
+        """将玩家登记到场次（玩家已在其他场次时会先离开）"""
+        uuid = player.unique_id
+        current = self._session_of.get(uuid)
+        if current is not None and current != session_id:
+            self.leave(player)
+        if current != session_id:
+            self._tag(player, member_tag(session_id), True)
+        self._session_of[uuid] = session_id
+        self._members.setdefault(session_id, {})[uuid] = player
+
+    def leave(self, player) -> Optional[str]:
+        """
+        将玩家移出其所在场次
+
+        Returns:
+            玩家原先所在的场次ID，不在任何场次中时返回 None
+        """
+        uuid = player.unique_id
+        session_id = self._session_of.pop(uuid, None)
+        if session_id is not None:
+            self._members.get(session_id, {}).pop(uuid, None)
+            self._tag(player, member_tag(session_id), False)
+            if self._alive.get(session_id, {}).pop(uuid, None) is not None:
+                self._tag(player, alive_tag(session_id), False)
+        return session_id
+
+    def eliminate(self, player) -> bool:
+        """
+        淘汰玩家（仍是场次成员，但不再存活）
+
+        Returns:
+            玩家此前是否存活
+        """
+        uuid = player.unique_id
+        session_id = self._session_of.get(uuid)
+        if session_id is None:
+            return False
+        if self._alive.get(session_id, {}).pop(uuid, None) is None:
+            return False
+        self._tag(player, alive_tag(session_id), False)
+        return True
+
+    def revive_all(self, session_id: str):
+        """游戏开始时将场次全部成员标记为存活"""
+        self._alive[session_id] = dict(self._members.get(session_id, {}))
+        tag = alive_tag(session_id)
+        for player in self._alive[session_id].values():
+            self._tag(player, tag, True)
+
+    def clear_session(self, session_id: str) -> List[object]:
+        """
+        清空场次的全部成员
+
+        Returns:
+            被移出的玩家列表
+        """
+        members = self._members.pop(session_id, {})
+        alive = self._alive.pop(session_id, {})
+        for uuid, player in members.items():
+            self._session_of.pop(uuid, None)
+            self._tag(player, member_tag(session_id), False)
+            if uuid in alive:
+                self._tag(player, alive_tag(session_id), False)
+        return list(members.values())
+
+    def session_of(self, player) -> Optional[str]:
+        """获取玩家所在的场次ID"""
+        return self._session_of.get(player.unique_id)
+
+    def members(self, session_id: str) -> list:
+        """获取场次全部成员（副本，遍历时可安全修改登记表）"""
+        return list(self._members.get(session_id, {}).values())
+
+    def member_count(self, session_id: str) -> int:
+        """获取场次成员数"""
+        return len(self._members.get(session_id, ()))
+
+    def is_alive(self, player) -> bool:
+        """检查玩家是否存活"""
+        session_id = self._session_of.get(player.unique_id)
+        return session_id is not None and player.unique_id in self._alive.get(session_id, ())
+
+    def alive(self, session_id: str) -> list:
+        """获取场次存活成员（副本）"""
+        return list(self._alive.get(session_id, {}).values())
+
+    def alive_count(self, session_id: str) -> int:
+        """获取场次存活人数"""
+        return len(self._alive.get(session_id, ()))
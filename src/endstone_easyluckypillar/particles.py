@@ -0,0 +1,261 @@
+"""
+幸运之柱的边界粒子几何模块
+
+边界四面墙上的粒子点只在边界半径变化时计算一次，
+每个玩家可见的部分通过对排好序的坐标做二分查找得到一段连续切片。
+安装了 NumPy 时使用 NumPy 数组，否则回退为标准库 array + bisect。
+所有场次发送的粒子共享一个插件级的每 tick 预算，并按玩家到边界的距离降低密度。
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖
+    np = None
+
+
+class _Wall:
+    """一面墙的粒子点
+
+    点按沿墙方向的坐标（keys）排序、每个坐标下按高度展开，
+    因此 keys 上的一段区间对应 xs/ys/zs 上的一段连续切片。
+    """
+
+    __slots__ = ("keys", "xs", "ys", "zs", "column")
+
+    def __init__(self, keys, xs, ys, zs, column: int):
+        self.keys = keys  # 沿墙方向的坐标（升序）
+        self.xs = xs
+        self.ys = ys
+        self.zs = zs
+        self.column = column  # 每个坐标下的粒子数（高度方向）
+
+    def window(self, lo: float, hi: float):
+        """获取沿墙坐标落在 [lo, hi] 内的坐标下标范围"""
+        if np is not None:
+            return int(np.searchsorted(self.keys, lo, "left")), int(np.searchsorted(self.keys, hi, "right"))
+        return bisect_left(self.keys, lo), bisect_right(self.keys, hi)
+
+    def count(self, start: int, end: int, stride: int) -> int:
+        """下标范围内按 stride 抽稀后的粒子数"""
+        if start >= end:
+            return 0
+        return -(-(end - start) // stride) * -(-self.column // stride)
+
+    def points(self, start: int, end: int, stride: int):
+        """下标范围内按 stride 抽稀后的粒子坐标 (xs, ys, zs)"""
+        column = self.column
+        lo, hi = start * column, end * column
+        if stride == 1:
+            xs, ys, zs = self.xs[lo:hi], self.ys[lo:hi], self.zs[lo:hi]
+            if np is not None:
+                return xs.tolist(), ys.tolist(), zs.tolist()
+            return xs, ys, zs
+        if np is not None:
+            shape = (end - start, column)
+            return tuple(
+                values[lo:hi].reshape(shape)[::stride, ::stride].ravel().tolist()
+                for values in (self.xs, self.ys, self.zs)
+            )
+        index = [k * column + j for k in range(start, end, stride) for j in range(0, column, stride)]
+        return [self.xs[i] for i in index], [self.ys[i] for i in index], [self.zs[i] for i in index]
+
+
+class BorderWallGeometry:
+    """边界墙粒子点集
+
+    Args:
+        center_x, center_z: 边界中心
+        radius: 边界半径
+        y_start, y_end: 粒子从 y_start 向下生成到 y_end（不含）
+        horizontal_step: 水平方向的粒子间隔
+        vertical_step: 垂直方向的粒子间隔
+    """
+
+    def __init__(self, center_x: float, center_z: float, radius: float,
+                 y_start: int, y_end: int, horizontal_step: int, vertical_step: int):
+        self.center_x = center_x
+        self.center_z = center_z
+        self.radius = radius
+        x_min = center_x - radius
+        x_max = center_x + radius
+        z_min = center_z - radius
+        z_max = center_z + radius
+
+        heights = list(range(int(y_start), int(y_end), -vertical_step))
+        along_x = list(range(int(x_min), int(x_max) + 1, horizontal_step))
+        along_z = list(range(int(z_min), int(z_max) + 1, horizontal_step))
+
+        self.walls = (
+            self._build(along_x, heights, fixed=z_max, along_is_x=True),
+            self._build(along_x, heights, fixed=z_min, along_is_x=True),
+            self._build(along_z, heights, fixed=x_min, along_is_x=False),
+            self._build(along_z, heights, fixed=x_max, along_is_x=False),
+        )
+        self.point_count = sum(len(wall.keys) * wall.column for wall in self.walls)
+
+    @staticmethod
+    def _build(along: list, heights: list, fixed: float, along_is_x: bool) -> _Wall:
+        column = len(heights)
+        if np is not None:
+            keys = np.asarray(along, dtype=np.float64)
+            moving = np.repeat(keys, column)
+            ys = np.tile(np.asarray(heights, dtype=np.float64), len(along))
+            constant = np.full(moving.shape, fixed, dtype=np.float64)
+        else:
+            keys = array("d", along)
+            moving = array("d", [a for a in along for _ in heights])
+            ys = array("d", heights * len(along))
+            constant = array("d", [fixed]) * len(moving)
+        if along_is_x:
+            return _Wall(keys, moving, ys, constant, column)
+        return _Wall(keys, constant, ys, moving, column)
+
+    def distance(self, player_x: float, player_z: float) -> float:
+        """玩家到最近一面墙的水平距离"""
+        return abs(self.radius - max(abs(player_x - self.center_x), abs(player_z - self.center_z)))
+
+    def _windows(self, player_x: float, player_z: float, view_distance: float):
+        """每面墙在玩家视野范围内的坐标下标范围，沿 x 方向的墙按玩家的 x 截取、沿 z 方向的墙按玩家的 z 截取"""
+        x_lo, x_hi = int(player_x - view_distance), int(player_x + view_distance)
+        z_lo, z_hi = int(player_z - view_distance), int(player_z + view_distance)
+        return [
+            (wall,) + wall.window(*((x_lo, x_hi) if i < 2 else (z_lo, z_hi)))
+            for i, wall in enumerate(self.walls)
+        ]
+
+    def count(self, player_x: float, player_z: float, view_distance: float, stride: int = 1) -> int:
+        """玩家视野范围内按 stride 抽稀后的粒子数"""
+        return sum(wall.count(start, end, stride) for wall, start, end in self._windows(player_x, player_z, view_distance))
+
+    def visible_points(self, player_x: float, player_z: float, view_distance: float, stride: int = 1):
+        """
+        获取玩家视野范围内的粒子点
+
+        Args:
+            stride: 抽稀倍数，水平与垂直方向每 stride 个点保留一个
+
+        Returns:
+            [(xs, ys, zs), ...] 每面墙一组等长的坐标序列
+        """
+        return [
+            wall.points(start, end, stride)
+            for wall, start, end in self._windows(player_x, player_z, view_distance)
+            if start < end
+        ]
+
+    def emit(self, player, particle_type: str, player_x: float, player_z: float, view_distance: float,
+             stride: int = 1, limit: int = -1) -> int:
+        """
+        向玩家发送其视野范围内的边界粒子
+
+        Args:
+            stride: 抽稀倍数
+            limit: 最多发送的粒子数，负数表示不限
+
+        Returns:
+            发送的粒子数
+        """
+        spawn = player.spawn_particle
+        count = 0
+        for xs, ys, zs in self.visible_points(player_x, player_z, view_distance, stride):
+            if 0 <= limit - count < len(xs):
+                n = limit - count
+                xs, ys, zs = xs[:n], ys[:n], zs[:n]
+            for x, y, z in zip(xs, ys, zs):
+                spawn(particle_type, x, y, z)
+            count += len(xs)
+            if count == limit:
+                break
+        return count
+
+
+class ParticleBudget:
+    """插件级每 tick 粒子预算
+
+    每 tick 的预算平均分给正在运行的场次，场次内再按需求由少到多依次平分给玩家，
+    用不完的份额留给后面的玩家。玩家离边界越远粒子越稀疏，超出最远一级距离则不发送；
+    份额不足时先继续抽稀，抽稀掉的粒子计入 thinned；仍然不够才截断，截掉的粒子计入 dropped。
+    """
+
+    DEFAULT_PER_TICK = 1500
+    DEFAULT_LOD = ((6, 1), (12, 2), (20, 4))  # (到边界的最大距离, 抽稀倍数)
+    MAX_STRIDE = 8
+
+    def __init__(self):
+        self.per_tick = self.DEFAULT_PER_TICK
+        self.lod: Sequence[Tuple[float, int]] = self.DEFAULT_LOD
+        self.emitted = 0  # 累计发送的粒子数
+        self.thinned = 0  # 累计因预算不足而额外抽稀掉的粒子数（不含按距离抽稀）
+        self.dropped = 0  # 累计抽稀到最大倍数后仍超出预算而被截断的粒子数
+        self._tick = -1
+        self._used = 0  # 当前 tick 已使用的预算
+
+    def configure(self, config: dict):
+        """
+        从配置加载预算参数
+
+        Args:
+            config: {"per_tick": 每tick预算, "lod": [[距离, 抽稀倍数], ...]}
+        """
+        self.per_tick = max(0, int(config.get("per_tick", self.DEFAULT_PER_TICK)))
+        lod = config.get("lod")
+        if lod:
+            self.lod = tuple(sorted((float(distance), max(1, int(stride))) for distance, stride in lod))
+        else:
+            self.lod = self.DEFAULT_LOD
+
+    def stride_for(self, distance: float) -> int:
+        """按到边界的距离获取抽稀倍数，0 表示不发送"""
+        for max_distance, stride in self.lod:
+            if distance <= max_distance:
+                return stride
+        return 0
+
+    def reset_counters(self):
+        """清零统计"""
+        self.emitted = 0
+        self.thinned = 0
+        self.dropped = 0
+
+    def emit_session(self, wall: BorderWallGeometry, viewers: List[tuple], particle_type: str,
+                     view_distance: float, tick: int, sessions: int):
+        """
+        在预算内向一个场次的玩家发送边界粒子
+
+        Args:
+            wall: 场次的边界墙粒子点集
+            viewers: [(玩家, x, z), ...]
+            particle_type: 粒子类型
+            view_distance: 玩家视野范围
+            tick: 当前 tick
+            sessions: 正在运行的场次数
+        """
+        if tick != self._tick:
+            self._tick = tick
+            self._used = 0
+        allowance = min(self.per_tick - self._used, self.per_tick // max(1, sessions))
+
+        requests = []
+        for player, x, z in viewers:
+            stride = self.stride_for(wall.distance(x, z))
+            if stride:
+                demand = wall.count(x, z, view_distance, stride)
+                if demand:
+                    requests.append((demand, stride, player, x, z))
+        requests.sort(key=lambda request: request[0])
+
+        for i, (demand, stride, player, x, z) in enumerate(requests):
+            share = max(0, allowance) // (len(requests) - i)
+            count = demand
+            while count > share and stride < self.MAX_STRIDE:
+                stride *= 2
+                count = wall.count(x, z, view_distance, stride)
+            sent = wall.emit(player, particle_type, x, z, view_distance, stride, share) if share else 0
+            allowance -= sent
+            self._used += sent
+            self.emitted += sent
+            self.thinned += demand - count
+            self.dropped += count - sent
@@ -0,0 +1,163 @@
+"""
+幸运之柱的场次运行时状态模块
+"""
+from collections import deque
+from enum import Enum
+
+
+# 游戏状态枚举
+class GameState(Enum):
+    IDLE = "idle"  # 空闲状态
+    WAITING = "waiting"  # 等待玩家加入
+    READY = "ready"  # 人数已满，等待管理员开始
+    COUNTDOWN = "countdown"  # 传送后倒计时中
+    RUNNING = "running"  # 游戏进行中
+    ENDED = "ended"  # 游戏已结束
+
+
+# 允许玩家加入、离开的大厅状态
+LOBBY_STATES = frozenset({GameState.IDLE, GameState.WAITING, GameState.READY})
+
+COUNTDOWN_SECONDS = 10  # 传送后的倒计时秒数
+
+
+class SessionRuntime:
+    """单个场次的运行时状态
+
+    状态只通过下面的转换方法修改；一局游戏结束或重新开始前调用 reset()，
+    把计时、任务、TNT 与边界恢复到开局前的样子。
+    """
+
+    __slots__ = ("session_id", "state", "bossbar", "scoreboard", "tasks",
+                 "countdown", "game_time", "last_shrink_time",
+                 "border_radius", "border_radius_sq", "min_border_radius",
+                 "border_shrink_interval", "border_shrink_amount", "border_damage_per_second",
+                 "tnt_emitter", "tnt_spawn_ticks", "border_wall", "victory_sound_played")
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.state = GameState.IDLE
+        self.bossbar = None  # BossBarView
+        self.scoreboard = None  # SidebarRenderer
+        self.tasks = []  # 本局的定时任务
+        self.countdown = 0
+        self.game_time = 0  # 游戏已进行的秒数
+        self.last_shrink_time = 0  # 上次缩小边界的时间
+        self.border_radius = 0  # 当前边界半径
+        self.border_radius_sq = 0  # 边界半径的平方
+        self.min_border_radius = 0  # 最小边界半径
+        self.border_shrink_interval = 0  # 边界缩小间隔（秒）
+        self.border_shrink_amount = 0  # 每次缩小的格数
+        self.border_damage_per_second = 0  # 每秒扣血量
+        self.tnt_emitter = None  # 当前的 TNT 雨发射任务
+        self.tnt_spawn_ticks = deque()  # 最近生成的 TNT 的生成 tick，用于限制场上 TNT 数量
+        self.border_wall = None  # 当前半径下预计算的边界粒子点，半径变化时失效
+        self.victory_sound_played = False  # 所有玩家回到准备区域的音效是否已播放
+
+    # --- 状态查询 ---
+    @property
+    def running(self) -> bool:
+        return self.state == GameState.RUNNING
+
+    @property
+    def in_lobby(self) -> bool:
+        """场次是否处于可以加入、离开的大厅状态"""
+        return self.state in LOBBY_STATES
+
+    @property
+    def active(self) -> bool:
+        """场次是否处于倒计时或游戏中"""
+        return self.state in (GameState.COUNTDOWN, GameState.RUNNING) or bool(self.tasks)
+
+    # --- 状态转换 ---
+    def update_lobby(self, enough_players: bool):
+        """大厅中按人数在等待与准备就绪之间切换"""
+        if not enough_players:
+            self.state = GameState.WAITING
+        elif self.state == GameState.WAITING:
+            self.state = GameState.READY
+
+    def begin_game(self):
+        """管理员开始游戏：进入传送后的等待阶段"""
+        self.state = GameState.WAITING
+        self.countdown = COUNTDOWN_SECONDS
+        self.game_time = 0
+
+    def begin_countdown(self):
+        """开始倒计时（只在等待阶段生效）"""
+        if self.state == GameState.WAITING:
+            self.state = GameState.COUNTDOWN
+
+    def begin_running(self):
+        """倒计时结束，进入游戏"""
+        self.state = GameState.RUNNING
+
+    def add_task(self, task):
+        self.tasks.append(task)
+
+    def remove_task(self, task):
+        """取消并移除一个已结束或被替换的任务"""
+        task.cancel()
+        if task in self.tasks:
+            self.tasks.remove(task)
+
+    def cancel_tasks(self):
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+
+    # --- 边界 ---
+    def apply_border(self, border):
+        """
+        使用边界配置并把边界恢复为初始半径
+
+        Args:
+            border: BorderConfig
+        """
+        self.min_border_radius = border.min_radius
+        self.border_shrink_interval = border.shrink_interval
+        self.border_shrink_amount = border.shrink_amount
+        self.border_damage_per_second = border.damage_per_second
+        self.set_border_radius(border.initial_radius)
+
+    def set_border_radius(self, radius: int):
+        self.border_radius = radius
+        self.border_radius_sq = radius * radius
+        self.border_wall = None
+
+    def shrink_border(self) -> bool:
+        """
+        到达缩小间隔时缩小边界
+
+        Returns:
+            边界是否缩小
+        """
+        if self.game_time - self.last_shrink_time < self.border_shrink_interval:
+            return False
+        if self.border_radius <= self.min_border_radius:
+            return False
+        self.set_border_radius(max(self.min_border_radius, self.border_radius - self.border_shrink_amount))
+        self.last_shrink_time = self.game_time
+        return True
+
+    # --- 重置 ---
+    def reset(self, border=None):
+        """
+        取消本局任务并把场次恢复为空闲状态
+
+        Boss 栏与侧边栏由调用方决定是否保留。
+
+        Args:
+            border: BorderConfig，提供时边界恢复为初始半径
+        """
+        self.cancel_tasks()
+        self.state = GameState.IDLE
+        self.countdown = 0
+        self.game_time = 0
+        self.last_shrink_time = 0
+        self.tnt_emitter = None
+        self.tnt_spawn_ticks.clear()
+        self.border_wall = None
+        self.victory_sound_played = False
+        if border is not None:
+            self.apply_border(border)
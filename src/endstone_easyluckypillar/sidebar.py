@@ -0,0 +1,92 @@
+"""
+幸运之柱的侧边栏差量渲染模块
+"""
+from typing import Dict, Sequence, Tuple
+
+# 侧边栏布局: ((行模板, 分数), ...)，含 {字段} 的行在渲染时格式化
+SidebarLayout = Sequence[Tuple[str, int]]
+
+SIDEBAR_RUNNING: SidebarLayout = (
+    ("§a§l游戏信息", 10),
+    ("§e游戏时间: §f{m:02d}:{s:02d}", 9),
+    ("§e存活玩家: §f{alive_players}/{max_players}", 8),
+    ("§e当前半径: §f{border_radius}", 7),
+    ("§r", 6),
+    ("§c§l下一事件", 5),
+    ("§f{next_event_name}", 4),
+    ("§e距离触发: §f{event_minutes:02d}:{event_seconds:02d}", 3),
+    ("§r ", 2),
+    ("§c§l边界缩小", 1),
+    ("§e距离缩小: §f{shrink_minutes:02d}:{shrink_seconds:02d}", 0),
+    ("§e缩小到: §f{next_radius}", -1),
+)
+
+SIDEBAR_COUNTDOWN: SidebarLayout = (
+    ("§a§l游戏即将开始", 10),
+    ("§e倒计时: §c{countdown}秒", 9),
+    ("§r", 8),
+    ("§e当前玩家: §f{current_players}/{max_players}", 7),
+    ("§e最少需要: §f{min_players}人", 6),
+    ("§r ", 5),
+    ("§e最大人数: §f{max_players}人", 4),
+)
+
+SIDEBAR_WAITING: SidebarLayout = (
+    ("§a§l等待玩家", 10),
+    ("§e当前玩家: §f{current_players}/{max_players}", 9),
+    ("§e最少需要: §f{min_players}人", 8),
+    ("§e最大人数: §f{max_players}人", 7),
+    ("§r", 6),
+    ("{status}", 5),
+)
+
+
+class SidebarRenderer:
+    """侧边栏差量渲染器
+
+    记住上一次写入 objective 的行，只重置消失的行、只写入文本或分数变化的行。
+    每行末尾追加由场次ID生成的不可见格式码，使不同场次的行互不冲突，
+    重置本场次的行不会影响其他场次的侧边栏。
+    """
+
+    def __init__(self, objective, session_id: str):
+        self.objective = objective
+        self._suffix = "".join(f"§{ch}" for ch in session_id)
+        self._lines: Dict[str, int] = {}  # 当前显示的 行文本 -> 分数
+        self._compiled: Dict[int, list] = {}  # 布局 -> 预编译的行
+
+    def _compile(self, layout: SidebarLayout) -> list:
+        compiled = self._compiled.get(id(layout))
+        if compiled is None:
+            compiled = []
+            for template, score in layout:
+                text = template + self._suffix
+                if "{" in template:
+                    compiled.append((text.format, None, score))
+                else:
+                    compiled.append((None, text, score))
+            self._compiled[id(layout)] = compiled
+        return compiled
+
+    def render(self, layout: SidebarLayout, **values):
+        """按布局渲染侧边栏，只向服务器发送发生变化的行"""
+        wanted = {}
+        for formatter, text, score in self._compile(layout):
+            wanted[formatter(**values) if formatter else text] = score
+
+        scoreboard = self.objective.scoreboard
+        for text in self._lines:
+            if text not in wanted:
+                scoreboard.reset_scores(text)
+        previous = self._lines
+        for text, score in wanted.items():
+            if previous.get(text) != score:
+                self.objective.get_score(text).value = score
+        self._lines = wanted
+
+    def clear(self):
+        """清空本场次写入的所有行"""
+        scoreboard = self.objective.scoreboard
+        for text in self._lines:
+            scoreboard.reset_scores(text)
+        self._lines = {}
@@ -0,0 +1,89 @@
+"""
+幸运之柱的玩家位置快照模块
+"""
+from array import array
+from typing import Dict, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖
+    np = None
+
+
+class PositionSnapshot:
+    """每 tick 一次的玩家位置快照
+
+    玩家的 x/y/z 保存在紧凑的 array 中，每个玩家占用一个槽位。
+    同一 tick 内第一次读取某个玩家时才访问 player.location，之后直接读表，
+    调用 advance() 进入下一 tick 后旧数据自动失效。
+    """
+
+    def __init__(self):
+        self._xs = array("d")
+        self._ys = array("d")
+        self._zs = array("d")
+        self._stamps = array("q")  # 各槽位数据采集时的 tick 编号
+        self._dimensions = []
+        self._slots: Dict[object, int] = {}  # 玩家UUID -> 槽位
+        self._free = []
+        self.tick = 0
+
+    def advance(self):
+        """进入下一 tick，使所有快照失效"""
+        self.tick += 1
+
+    def _slot(self, key) -> int:
+        slot = self._slots.get(key)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                slot = len(self._stamps)
+                self._xs.append(0.0)
+                self._ys.append(0.0)
+                self._zs.append(0.0)
+                self._stamps.append(-1)
+                self._dimensions.append(None)
+            self._slots[key] = slot
+        return slot
+
+    def get(self, player) -> Tuple[float, float, float, str]:
+        """
+        获取玩家本 tick 的位置
+
+        Returns:
+            (x, y, z, 维度名)
+        """
+        slot = self._slot(player.unique_id)
+        if self._stamps[slot] != self.tick:
+            loc = player.location
+            self._xs[slot] = loc.x
+            self._ys[slot] = loc.y
+            self._zs[slot] = loc.z
+            self._dimensions[slot] = loc.dimension.name
+            self._stamps[slot] = self.tick
+        return self._xs[slot], self._ys[slot], self._zs[slot], self._dimensions[slot]
+
+    def gather(self, players: list):
+        """
+        批量获取一组玩家本 tick 的坐标
+
+        Returns:
+            (xs, ys, zs)，与 players 一一对应；安装了 NumPy 时为 ndarray，否则为列表
+        """
+        slots = []
+        for player in players:
+            self.get(player)
+            slots.append(self._slots[player.unique_id])
+        if np is not None:
+            index = np.fromiter(slots, dtype=np.intp, count=len(slots))
+            return tuple(np.frombuffer(values, dtype=np.float64)[index] for values in (self._xs, self._ys, self._zs))
+        return [self._xs[i] for i in slots], [self._ys[i] for i in slots], [self._zs[i] for i in slots]
+
+    def discard(self, player):
+        """释放玩家的槽位（玩家退出时调用）"""
+        slot = self._slots.pop(player.unique_id, None)
+        if slot is not None:
+            self._stamps[slot] = -1
+            self._dimensions[slot] = None
+            self._free.append(slot)
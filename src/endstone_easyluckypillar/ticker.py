@@ -0,0 +1,138 @@
+"""
+幸运之柱的统一调度模块
+"""
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class ScheduledAction:
+    """调度队列中的一项动作，接口与 endstone 的 Task 一致（可 cancel）"""
+
+    __slots__ = ("session_id", "name", "callback", "period", "due", "cancelled")
+
+    def __init__(self, session_id: Optional[str], name: str, callback: Callable[[], None], period: int, due: int):
+        self.session_id = session_id
+        self.name = name
+        self.callback = callback
+        self.period = period
+        self.due = due
+        self.cancelled = False
+
+    def cancel(self):
+        """取消动作，队列中的条目会在到期时被丢弃"""
+        self.cancelled = True
+
+
+class ActionTiming:
+    """单类动作的耗时统计"""
+
+    __slots__ = ("count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, elapsed_ns: int):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+
+class TickDriver:
+    """插件级统一调度器
+
+    只向服务器注册一个每 tick 执行的任务，内部用按到期 tick 排序的优先队列
+    保存 (tick, 场次, 动作)，每 tick 在一次回调内执行所有到期的动作，并按动作名统计耗时。
+    """
+
+    def __init__(self, on_error: Optional[Callable[[ScheduledAction, Exception], None]] = None):
+        self.tick = 0
+        self._queue: List[tuple] = []  # (到期tick, 序号, 动作)
+        self._seq = itertools.count()
+        self._tick_hooks: List[Callable[[], None]] = []
+        self._after_tick_hooks: List[Callable[[], None]] = []
+        self._on_error = on_error
+        self.timings: Dict[str, ActionTiming] = {}
+
+    def add_tick_hook(self, hook: Callable[[], None], after: bool = False):
+        """注册每 tick 调用的钩子，默认在执行到期动作之前调用，after 为 True 时在之后调用"""
+        (self._after_tick_hooks if after else self._tick_hooks).append(hook)
+
+    def schedule(self, callback: Callable[[], None], delay: int = 0, period: int = 0,
+                 session_id: Optional[str] = None, name: str = "task") -> ScheduledAction:
+        """
+        调度一个动作
+
+        Args:
+            callback: 要执行的回调
+            delay: 首次执行前等待的 tick 数，0 表示下一 tick 执行
+            period: 重复周期（tick），0 表示只执行一次
+            session_id: 所属场次ID，用于按场次取消
+            name: 动作名，用于耗时统计
+
+        Returns:
+            可取消的动作句柄
+        """
+        action = ScheduledAction(session_id, name, callback, max(0, int(period)), self.tick + max(1, int(delay)))
+        heapq.heappush(self._queue, (action.due, next(self._seq), action))
+        return action
+
+    def cancel_session(self, session_id: str):
+        """取消某个场次的全部动作"""
+        for _, _, action in self._queue:
+            if action.session_id == session_id:
+                action.cancelled = True
+
+    def run_tick(self):
+        """由服务器每 tick 调用一次，执行所有到期的动作"""
+        self.tick += 1
+        tick = self.tick
+        for hook in self._tick_hooks:
+            hook()
+
+        queue = self._queue
+        while queue and queue[0][0] <= tick:
+            _, _, action = heapq.heappop(queue)
+            if action.cancelled:
+                continue
+
+            start = time.perf_counter_ns()
+            try:
+                action.callback()
+            except Exception as e:
+                if self._on_error:
+                    self._on_error(action, e)
+            elapsed = time.perf_counter_ns() - start
+
+            timing = self.timings.get(action.name)
+            if timing is None:
+                timing = self.timings[action.name] = ActionTiming()
+            timing.record(elapsed)
+
+            if action.period and not action.cancelled:
+                action.due = tick + action.period
+                heapq.heappush(queue, (action.due, next(self._seq), action))
+
+        for hook in self._after_tick_hooks:
+            hook()
+
+    def pending(self) -> int:
+        """队列中未取消的动作数"""
+        return sum(1 for _, _, action in self._queue if not action.cancelled)
+
+    def timing_report(self) -> List[tuple]:
+        """
+        获取耗时统计
+
+        Returns:
+            [(动作名, 执行次数, 平均耗时ms, 最大耗时ms), ...]，按总耗时降序
+        """
+        rows = sorted(self.timings.items(), key=lambda item: item[1].total_ns, reverse=True)
+        return [
+            (name, t.count, t.total_ns / t.count / 1e6 if t.count else 0.0, t.max_ns / 1e6)
+            for name, t in rows
+        ]
@@ -0,0 +1,203 @@
+"""
+BStats 提交器测试：在本机 http.server 上模拟 bStats 服务器
+
+运行: python -m unittest discover -s tests
+需要安装 requests；未安装时跳过提交相关的测试。
+"""
+import gzip
+import importlib.util
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn
+
+# 直接按文件加载，避免导入插件包时依赖 endstone
+_spec = importlib.util.spec_from_file_location(
+    "bstats", Path(__file__).resolve().parents[1] / "src" / "endstone_easyluckypillar" / "bstats.py"
+)
+bstats = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bstats)
+bstats.bstats_logger.disabled = True
+
+HAS_REQUESTS = importlib.util.find_spec("requests") is not None
+
+
+class _StandInServer(ThreadingMixIn, HTTPServer):
+    """按预设状态码依次响应的 bStats 替身服务器"""
+
+    daemon_threads = True
+
+    def __init__(self, statuses):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.statuses = list(statuses)  # 用完后一直返回 200
+        self.received = []  # (状态码, Content-Encoding, 解压后的数据, 客户端端口)
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/submitData"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            status = self.server.statuses.pop(0) if self.server.statuses else 200
+            self.server.received.append((
+                status, self.headers.get("Content-Encoding"),
+                json.loads(gzip.decompress(body)), self.client_address[1],
+            ))
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class _Plugin:
+    name = "test"
+    version = "1.0"
+
+    def __init__(self, data_folder):
+        self.data_folder = data_folder
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+class TelemetrySpoolTest(unittest.TestCase):
+
+    def test_push_peek_pop_in_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            spool = bstats.TelemetrySpool(Path(tmp) / "spool")
+            spool.push(b"first")
+            spool.push(b"second")
+            self.assertEqual(spool.peek(), b"first")
+            spool.pop()
+            self.assertEqual(spool.peek(), b"second")
+            spool.pop()
+            self.assertIsNone(spool.peek())
+
+    def test_survives_reload_and_trims_oldest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            spool = bstats.TelemetrySpool(Path(tmp) / "spool", max_items=2)
+            for body in (b"a", b"b", b"c"):
+                spool.push(body)
+            reloaded = bstats.TelemetrySpool(Path(tmp) / "spool", max_items=2)
+            reloaded.load()
+            self.assertEqual(len(reloaded), 2)
+            self.assertEqual(reloaded.peek(), b"b")
+
+
+@unittest.skipUnless(HAS_REQUESTS, "requests 未安装")
+class BStatsSubmitterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        self.tmp.cleanup()
+
+    def _server(self, statuses=()):
+        server = _StandInServer(statuses)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.servers.append(server)
+        return server
+
+    def _metrics(self, server):
+        metrics = bstats.BStats(_Plugin(self.tmp.name), 42, base_url=server.url,
+                                initial_delay=0.05, interval=60, timeout=2)
+        metrics.BACKOFF_BASE = 0.05
+        return metrics
+
+    def test_retries_with_backoff_then_delivers_compressed_payload(self):
+        server = self._server([503, 503])
+        metrics = self._metrics(server)
+        metrics.start()
+        try:
+            self.assertTrue(_wait_until(lambda: len(server.received) >= 3))
+            self.assertTrue(_wait_until(lambda: len(metrics.spool) == 0))
+        finally:
+            metrics.shutdown()
+        statuses = [status for status, _, _, _ in server.received]
+        self.assertEqual(statuses[:3], [503, 503, 200])
+        for _, encoding, payload, _ in server.received:
+            self.assertEqual(encoding, "gzip")
+            self.assertEqual(payload["service"]["id"], 42)
+        # 重试复用同一个连接
+        self.assertEqual(len({port for _, _, _, port in server.received}), 1)
+
+    def test_client_error_drops_payload(self):
+        server = self._server([400])
+        metrics = self._metrics(server)
+        metrics.start()
+        try:
+            self.assertTrue(_wait_until(lambda: len(server.received) == 1))
+            self.assertTrue(_wait_until(lambda: len(metrics.spool) == 0))
+            time.sleep(0.3)
+            self.assertEqual(len(server.received), 1)
+        finally:
+            metrics.shutdown()
+
+    def test_unreachable_server_keeps_payload_in_spool(self):
+        server = self._server()
+        url = server.url
+        server.shutdown()
+        server.server_close()
+        self.servers.remove(server)
+        metrics = bstats.BStats(_Plugin(self.tmp.name), 42, base_url=url, initial_delay=0.05, interval=60, timeout=1)
+        metrics.start()
+        try:
+            self.assertTrue(_wait_until(lambda: len(metrics.spool) == 1 and metrics._failures >= 1))
+        finally:
+            metrics.shutdown()
+
+        # 服务器恢复后，新的提交器会补发磁盘上的数据
+        server = self._server()
+        metrics = self._metrics(server)
+        metrics.start()
+        try:
+            self.assertTrue(_wait_until(lambda: len(server.received) >= 2))
+        finally:
+            metrics.shutdown()
+
+    def test_shutdown_is_immediate_and_restart_waits_for_old_thread(self):
+        server = self._server()
+        metrics = self._metrics(server)
+        metrics.start()
+        self.assertTrue(_wait_until(lambda: len(server.received) == 1))
+        first = metrics._submit_thread
+
+        started = time.perf_counter()
+        metrics.shutdown()
+        self.assertLess(time.perf_counter() - started, 0.05)
+
+        metrics.start()
+        try:
+            self.assertIsNot(metrics._submit_thread, first)
+            self.assertTrue(_wait_until(lambda: not first.is_alive()))
+            alive = [t for t in threading.enumerate() if t.name == "EasyLuckyPillar-BStats"]
+            self.assertLessEqual(len(alive), 1)
+        finally:
+            metrics.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+配置编译与差异比较测试：diff_config、split_live_sections 与 SessionConfig 的错误收集
+
+运行: python -m unittest discover -s tests
+"""
+import importlib.util
+import unittest
+from pathlib import Path
+
+# 直接按文件加载，避免导入插件包时依赖 endstone
+_spec = importlib.util.spec_from_file_location(
+    "config", Path(__file__).resolve().parents[1] / "src" / "endstone_easyluckypillar" / "config.py"
+)
+config = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(config)
+
+
+def _session(**overrides):
+    data = {
+        "name": "场次1",
+        "pillars": {"1": {"x": 0, "y": 100, "z": 0}},
+        "border": {"initial_radius": 20},
+        "particles": {"enabled": True},
+    }
+    data.update(overrides)
+    return data
+
+
+class DiffConfigTest(unittest.TestCase):
+
+    def test_identical_configs_have_no_diff(self):
+        old = {"sessions": {"1": _session()}, "log_level": "INFO"}
+        new = {"sessions": {"1": _session()}, "log_level": "INFO"}
+        self.assertFalse(config.diff_config(old, new))
+
+    def test_reports_added_removed_and_changed_sections(self):
+        old = {"sessions": {"1": _session(), "2": _session()}}
+        new = {"sessions": {"1": _session(border={"initial_radius": 30}, name="新名字"), "3": _session()}}
+        diff = config.diff_config(old, new)
+        self.assertEqual(diff.added, ["3"])
+        self.assertEqual(diff.removed, ["2"])
+        self.assertEqual(diff.changed, {"1": {"border", "name"}})
+        self.assertEqual(diff.top_level, set())
+
+    def test_reports_top_level_keys_except_sessions(self):
+        old = {"sessions": {}, "item_pool": {"dirt": 1}, "log_level": "INFO"}
+        new = {"sessions": {}, "item_pool": {"dirt": 2}}
+        diff = config.diff_config(old, new)
+        self.assertEqual(diff.top_level, {"item_pool", "log_level"})
+
+    def test_non_object_session_is_changed_as_a_whole(self):
+        diff = config.diff_config({"sessions": {"1": _session()}}, {"sessions": {"1": "bad"}})
+        self.assertEqual(diff.changed, {"1": {"*"}})
+
+    def test_missing_sessions_key(self):
+        diff = config.diff_config({}, {"sessions": {"1": _session()}})
+        self.assertEqual(diff.added, ["1"])
+
+
+class SplitLiveSectionsTest(unittest.TestCase):
+
+    def test_only_live_sections_are_merged(self):
+        before = _session()
+        after = _session(name="新名字", border={"initial_radius": 30}, particles={"enabled": False})
+        merged = config.split_live_sections(before, after, {"name", "border", "particles"})
+        self.assertEqual(merged["name"], "新名字")
+        self.assertEqual(merged["particles"], {"enabled": False})
+        self.assertEqual(merged["border"], {"initial_radius": 20})
+        self.assertEqual(before["name"], "场次1")  # 不修改旧配置
+
+    def test_removed_live_section_is_dropped(self):
+        after = _session()
+        del after["particles"]
+        merged = config.split_live_sections(_session(), after, {"particles"})
+        self.assertNotIn("particles", merged)
+
+
+class SessionConfigTest(unittest.TestCase):
+
+    def test_invalid_values_fall_back_to_defaults_with_errors(self):
+        errors = []
+        session = config.SessionConfig("1", _session(min_players="2", border={"initial_radius": 10, "min_radius": 15}), errors)
+        self.assertEqual(session.min_players, 2)
+        self.assertEqual(session.border.min_radius, 10)
+        self.assertEqual(session.max_players, 1)
+        self.assertEqual(len(errors), 2)
+
+    def test_non_object_session_uses_defaults(self):
+        errors = []
+        session = config.SessionConfig("3", "bad", errors)
+        self.assertEqual(session.name, "场次3")
+        self.assertEqual(session.max_players, 0)
+        self.assertEqual(errors, ["sessions.3: 应为对象，实际为 str"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+配置文件读写测试：ConfigWriter 的防抖、原子替换与关闭时写入，ConfigWatcher 的自身写入过滤
+
+运行: python -m unittest discover -s tests
+"""
+import importlib.util
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# 直接按文件加载，避免导入插件包时依赖 endstone
+_spec = importlib.util.spec_from_file_location(
+    "configstore", Path(__file__).resolve().parents[1] / "src" / "endstone_easyluckypillar" / "configstore.py"
+)
+configstore = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(configstore)
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ConfigWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "config.json"
+        self.errors = []
+        self.writer = configstore.ConfigWriter(self.path, debounce=0.1, on_error=self.errors.append)
+
+    def tearDown(self):
+        self.writer.close()
+        self.tmp.cleanup()
+
+    def test_save_defers_serialization_until_window_expires(self):
+        data = {"value": 1}
+        self.writer.save(data)
+        data["value"] = 2  # 防抖窗口内继续修改同一个字典
+        self.writer.save(data)
+        self.writer.poll()
+        self.assertIsNone(self.writer._queued)
+        self.assertFalse(self.path.exists())
+        self.assertTrue(self.writer.pending)
+
+        time.sleep(0.15)
+        self.writer.poll()
+        self.assertTrue(_wait_until(lambda: not self.writer.pending))
+        self.assertEqual(_read(self.path), {"value": 2})
+        self.assertEqual(self.writer.writes, 1)
+
+    def test_burst_of_saves_serializes_once(self):
+        dumps = []
+        original = configstore.json.dumps
+
+        def counting_dumps(*args, **kwargs):
+            dumps.append(1)
+            return original(*args, **kwargs)
+
+        configstore.json.dumps = counting_dumps
+        try:
+            data = {}
+            for i in range(50):
+                data[str(i)] = i
+                self.writer.save(data)
+                self.writer.poll()
+            time.sleep(0.15)
+            self.writer.poll()
+            self.writer.poll()
+        finally:
+            configstore.json.dumps = original
+        self.assertEqual(len(dumps), 1)
+        self.assertTrue(_wait_until(lambda: not self.writer.pending))
+        self.assertEqual(len(_read(self.path)), 50)
+
+    def test_atomic_replace_leaves_no_temp_file(self):
+        self.path.write_text("{\"old\": true}", encoding="utf-8")
+        self.writer.save({"new": True})
+        self.writer.flush()
+        self.assertEqual(_read(self.path), {"new": True})
+        self.assertEqual(os.listdir(self.tmp.name), ["config.json"])
+        self.assertEqual(self.writer.last_mtime_ns, os.stat(self.path).st_mtime_ns)
+
+    def test_close_flushes_and_reopen_accepts_new_saves(self):
+        self.writer.save({"step": 1})
+        self.writer.close()
+        self.assertEqual(_read(self.path), {"step": 1})
+        self.assertFalse(self.writer.pending)
+
+        # 关闭后的保存立即同步写入
+        self.writer.save({"step": 2})
+        self.assertEqual(_read(self.path), {"step": 2})
+
+        self.writer.open()
+        self.writer.save({"step": 3})
+        time.sleep(0.15)
+        self.writer.poll()
+        self.assertTrue(_wait_until(lambda: _read(self.path) == {"step": 3}))
+
+    def test_write_error_is_reported(self):
+        self.path.mkdir()  # 目标是目录，替换会失败
+        self.writer.save({"a": 1})
+        self.writer.flush()
+        self.assertEqual(len(self.errors), 1)
+        self.assertTrue(self.writer.pending)
+        self.path.rmdir()
+
+
+class ConfigWatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "config.json"
+        self.path.write_text("{}", encoding="utf-8")
+        self.writer = configstore.ConfigWriter(self.path, debounce=0.05)
+        self.watcher = configstore.ConfigWatcher(self.path, self.writer, interval=0.05)
+        self.watcher.start()
+
+    def tearDown(self):
+        self.watcher.stop()
+        self.writer.close()
+        self.tmp.cleanup()
+
+    def _touch_later(self, text):
+        # 保证修改时间与上一次不同
+        time.sleep(0.02)
+        self.path.write_text(text, encoding="utf-8")
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def test_ignores_own_writes(self):
+        self.writer.save({"own": True})
+        time.sleep(0.1)
+        self.writer.poll()
+        self.assertTrue(_wait_until(lambda: not self.writer.pending))
+        time.sleep(0.2)
+        self.assertIsNone(self.watcher.poll())
+
+    def test_reports_external_change(self):
+        self._touch_later("{\"external\": 1}")
+        self.assertTrue(_wait_until(lambda: self.watcher._latest is not None))
+        self.assertEqual(self.watcher.poll(), {"external": 1})
+        self.assertIsNone(self.watcher.poll())
+
+    def test_reports_parse_error(self):
+        self._touch_later("{broken")
+        self.assertTrue(_wait_until(lambda: self.watcher._latest is not None))
+        self.assertIsInstance(self.watcher.poll(), Exception)
+
+    def test_in_memory_changes_win_over_external_change(self):
+        self._touch_later("{\"external\": 1}")
+        self.assertTrue(_wait_until(lambda: self.watcher._latest is not None))
+        self.writer.save({"memory": True})
+        self.assertIsNone(self.watcher.poll())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+物品池测试：compile_item_pool 的校验与旧版ID替换、AliasTable 抽样
+
+运行: python -m unittest discover -s tests
+"""
+import importlib.util
+import random
+import unittest
+from collections import Counter
+from pathlib import Path
+
+# 直接按文件加载，避免导入插件包时依赖 endstone
+_spec = importlib.util.spec_from_file_location(
+    "items", Path(__file__).resolve().parents[1] / "src" / "endstone_easyluckypillar" / "items.py"
+)
+items = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(items)
+
+# 模拟服务器不再认识的旧版物品ID
+_UNKNOWN = {"planks", "log", "wool", "not_an_item"}
+
+
+def _make_stack(item_type):
+    if item_type in _UNKNOWN:
+        raise ValueError(item_type)
+    return ("stack", item_type)
+
+
+class CompileItemPoolTest(unittest.TestCase):
+
+    def test_remaps_legacy_ids_and_merges_weights(self):
+        weights, prototypes, remapped, rejected = items.compile_item_pool(
+            {"planks": 100, "log": 80, "wool": 60, "white_wool": 60}, _make_stack
+        )
+        self.assertEqual(weights, {"oak_planks": 100, "oak_log": 80, "white_wool": 120})
+        self.assertEqual(prototypes["white_wool"], ("stack", "white_wool"))
+        self.assertIn(("wool", "white_wool"), remapped)
+        self.assertEqual(rejected, [])
+
+    def test_rejects_bad_weights_and_keeps_going(self):
+        weights, _, _, rejected = items.compile_item_pool(
+            {"dirt": "x", "stone": -1, "sand": 0, "tnt": True, "not_an_item": 5, "glass": 2.5, "apple": 3},
+            _make_stack,
+        )
+        self.assertEqual(weights, {"glass": 2.5, "apple": 3})
+        self.assertEqual(len(rejected), 5)
+        self.assertTrue(rejected[0].startswith("dirt"))
+
+
+class AliasTableTest(unittest.TestCase):
+
+    def test_sample_follows_weights(self):
+        table = items.AliasTable({"a": 1, "b": 3, "zero": 0}, rng=random.Random(1))
+        self.assertEqual(sorted(table.keys), ["a", "b"])
+        counts = Counter(table.sample(20000))
+        self.assertAlmostEqual(counts["b"] / 20000, 0.75, delta=0.02)
+
+    def test_empty_table(self):
+        table = items.AliasTable({})
+        self.assertIsNone(table.choice())
+        self.assertEqual(table.sample(3), [])
+
+
+if __name__ == "__main__":
+    unittest.main()